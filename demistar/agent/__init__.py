@@ -25,9 +25,13 @@ from .dag import From
 from .component import (
     attempt,
     Component,
+    OverflowPolicy,
+    priority_by_type,
+    default_priority,
     Sensor,
     Actuator,
     IOSensor,
+    DeltaSensor,
 )
 
 __all__ = (
@@ -40,8 +44,12 @@ __all__ = (
     "attempt",
     "observe",
     "Component",
+    "OverflowPolicy",
+    "priority_by_type",
+    "default_priority",
     "Sensor",
     "IOSensor",
+    "DeltaSensor",
     "Actuator",
     "From",
 )
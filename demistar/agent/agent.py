@@ -199,6 +199,8 @@ class Agent(ABC):
             args (tuple[Any], optional): optional additional arguments.
             kwargs (dict[str, Any], optional): optional additional keyword arguments.
         """
+        for component in (*self.sensors, *self.actuators):
+            component.on_step()
         _ = [sensor.__query__(state) for sensor in self.sensors]
 
     @abstractmethod
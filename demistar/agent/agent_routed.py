@@ -1,9 +1,11 @@
 """Module defines the `AgentRouted` class and the `observe` and `decide` decorators. See class documentation for details."""
 
 from typing import Any
+from collections import defaultdict
 from collections.abc import Callable
 from functools import wraps
 import inspect
+import typing
 
 from .component import Component
 from .component import Sensor, Actuator
@@ -48,6 +50,29 @@ def _component_arg(func: Callable) -> Callable:
         return _wrapped
 
 
+def _batch_arg_types(func: Callable) -> list[type] | None:
+    """Internal method that resolves the observation types of a method decorated with `@observe` whose first argument is a list (e.g. `observations: list[MyObservation]`). Such methods receive all type-compatible observations from a component as a single batch.
+
+    Args:
+        func (Callable): the method
+
+    Returns:
+        list[type] | None: the types of the list elements, or None if the first argument is not a list.
+    """
+    parameters = [
+        p
+        for name, p in inspect.signature(func).parameters.items()
+        if name not in ("self", "cls")
+    ]
+    if len(parameters) == 0:
+        return None
+    annotation = parameters[0].annotation
+    if typing.get_origin(annotation) is not list:
+        return None
+    args = typing.get_args(annotation)
+    return TypeRouter.resolve_route_types(list(args) if args else [typing.Any])
+
+
 def decide(*fun: Callable):
     """A decorator that may be added to methods in a `RoutedAgent` that are intended to produce actions for execution (i.e. the decision of the agent). These actions will be automatically routed to components that define type-compatible attempt methods.
 
@@ -99,18 +124,32 @@ def observe(*event_types: tuple[type]):
 
     The `component` argument in an observe method is optional a valid signature would also be: `revise_beliefs(self, observation : MyObservation)`
 
+    If the first argument is annotated as a list, the method will receive all type-compatible observations from a component (in a cycle) as a single batch, see `Component.iter_observation_batches`.
+    ```
+    class MyAgent(RoutedAgent):
+        @observe
+        def revise_beliefs(self, observations: list[MyObservation]):
+            pass  # revise agents beliefs
+    ```
+
     Raises:
         ValueError: if `event_types` is not specified correctly or multiple positional arguments are provided.
     """
 
     def _observe(func, route_types=None):
+        batch_types = _batch_arg_types(func)
         if route_types is None:
-            route_types = TypeRouter.resolve_first_argument_types(
-                func, allow_no_arguments=False
-            )
+            if batch_types is None:
+                route_types = TypeRouter.resolve_first_argument_types(
+                    func, allow_no_arguments=False
+                )
+            else:
+                route_types = batch_types
 
         # used to identify whether a given method has been decorated with this decorator.
         func.is_observe = True
+        # used to identify whether a given method should receive observations in batches.
+        func.is_batch = batch_types is not None
         # this is used to automatically route events to a given component.
         if route_types:
             route_types = TypeRouter.validate_types(route_types)
@@ -209,6 +248,10 @@ class AgentRouted(Agent):
         self._observe_router = TypeRouter(
             cache_size=AgentRouted._TYPE_ROUTER_CACHE_SIZE
         )
+        # router for observations to type-compatible observe methods that receive batches
+        self._observe_batch_router = TypeRouter(
+            cache_size=AgentRouted._TYPE_ROUTER_CACHE_SIZE
+        )
         # these methods are those that have been decorated with @observe
         # they will recieve observations of the relevant type from the sensors.
         self._observe_methods = list(
@@ -218,7 +261,10 @@ class AgentRouted(Agent):
             )
         )
         for method in self._observe_methods:
-            self._observe_router.add(_component_arg(method))
+            if getattr(method, "is_batch", False):
+                self._observe_batch_router.add(_component_arg(method))
+            else:
+                self._observe_router.add(_component_arg(method))
 
         # these methods are those that have been decorated with @decide, they are to be called in `__cycle__`.
         self._decide_methods = _get_decide_methods(self)
@@ -226,13 +272,19 @@ class AgentRouted(Agent):
     def add_observe(self, func: Callable, event_types: list[type[Event]] | None = None):
         """Adds a new observe function. The function need not be decorated with `@observe`.
 
+        If the first argument of `func` is annotated as a list, it will receive observations in batches (see `observe`).
+
         Args:
             func (Callable): function to add.
             event_types (list[type], optional): `event_types` to route to the function. Defaults to None. If not specified the types will be resolved from the type hints of the first argument of `func` argument (unless the @observe decorator was used).
         """
+        batch_types = _batch_arg_types(func)
         func = _component_arg(func)  # handle optional "component" argument
         self._observe_methods.append(func)
-        self._observe_router.add(func, event_types)
+        if batch_types is None:
+            self._observe_router.add(func, event_types)
+        else:
+            self._observe_batch_router.add(func, event_types or batch_types)
 
     def add_decide(self, func: Callable):
         """Adds a new decide function. The function need not be decorated with `@decide`.
@@ -309,11 +361,36 @@ class AgentRouted(Agent):
 
     def __observe__(self):
         """Method that routes observations from components to type-compatible observe methods. Called once per cycle."""
-        for actuator in self.get_actuators():
-            for observation in actuator.iter_observations():
-                assert isinstance(observation, Event)
-                self._observe_router(observation, component=actuator)
-        for sensor in self.get_sensors():
-            for observation in sensor.iter_observations():
-                assert isinstance(observation, Event)
-                self._observe_router(observation, component=sensor)
+        for component in [*self.get_actuators(), *self.get_sensors()]:
+            for observations in _iter_batches(component):
+                self.__observe_batch__(observations, component)
+
+    def __observe_batch__(
+        self, observations: list[Event], component: Component
+    ) -> None:
+        """Method that routes a batch of observations from a component to type-compatible observe methods. Methods that accept a single observation are called once per observation, methods that accept a list are called once with all of the observations that are compatible with them.
+
+        Args:
+            observations (list[Event]): the observations (see `Component.iter_observation_batches`).
+            component (Component): the component that the observations came from.
+        """
+        batches: dict[Callable, list[Event]] = defaultdict(list)
+        for observation in observations:
+            assert isinstance(observation, Event)
+            self._observe_router(observation, component=component)
+            for method in self._observe_batch_router.routes(type(observation)):
+                batches[method].append(observation)
+        for method, batch in batches.items():
+            method(batch, component=component)
+
+
+def _iter_batches(component: Component):
+    # components that override `iter_observations` (but not `iter_observation_batches`) may do work as observations are consumed, they are consumed in a single batch via `iter_observations`
+    cls = type(component)
+    if (
+        cls.iter_observations is not Component.iter_observations
+        and cls.iter_observation_batches is Component.iter_observation_batches
+    ):
+        observations = list(component.iter_observations())
+        return [observations] if observations else []
+    return component.iter_observation_batches()
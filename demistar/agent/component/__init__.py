@@ -17,18 +17,24 @@ See associated documentation for further details.
 """
 
 from .component import Component
+from ._observations import OverflowPolicy, priority_by_type, default_priority
 from .actuator import Actuator
 from .attempt import attempt
 from .on_awake import OnAwake
 from .sensor import Sensor
 from .sensor_io import IOSensor
+from .sensor_delta import DeltaSensor
 
 __all__ = (
     "OnAwake",
     "attempt",
     "observe",
     "Component",
+    "OverflowPolicy",
+    "priority_by_type",
+    "default_priority",
     "Sensor",
     "Actuator",
     "IOSensor",
+    "DeltaSensor",
 )
@@ -1,19 +1,381 @@
 import ray
 import asyncio
+import bisect
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from concurrent.futures import Future
+from enum import Enum
+from itertools import islice
+from typing import Any
 
-from ...event import Event
+from ...event import Event, ErrorObservation
+from ...event.event_kill import KillEvent
+from ...event.lazy_event import value_ref
+
+
+def _resolve(item: Event | ray.ObjectRef | Future | asyncio.Future) -> Event | None:
+    """Resolve an item in an `_Observations` queue to an event, this is a blocking call for object refs (futures must be done, see `_pending`)."""
+    if isinstance(item, ray.ObjectRef):
+        # refs may be nested (e.g. a shared ref returned by a remote call)
+        while isinstance(item, ray.ObjectRef):
+            item = ray.get(item)
+        return item
+    elif isinstance(item, (Future, asyncio.Future)):
+        return item.result()
+    return item
+
+
+def _pending(item: Event | ray.ObjectRef | Future | asyncio.Future) -> bool:
+    """Is the item a future that is not yet done? These cannot be resolved by blocking, asyncio futures are completed by the running event loop and futures of staged actions by `Ambient.__commit__` (which may be waiting on the same event loop)."""
+    return isinstance(item, (Future, asyncio.Future)) and not item.done()
+
+
+class OverflowPolicy(Enum):
+    """Policy that determines what happens when an observation is pushed to a component whose observation buffer is at capacity.
+
+    - `DROP_OLDEST`: the oldest buffered observation is dropped.
+    - `DROP_NEWEST`: the new observation is dropped.
+    - `BLOCK`: the push waits until there is space, this requires an async producer (see `_Observations.apush`). A synchronous push cannot wait, it fails with `asyncio.QueueFull` and nothing is pushed (see `_Observations.push_all`). Components push observations synchronously, so they do not support this policy.
+    - `CONFLATE`: the oldest buffered observation of the same type is dropped (the new observation supersedes it), if there is none the oldest observation is dropped.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    BLOCK = "block"
+    CONFLATE = "conflate"
+
+
+class _LatestByKey:
+    """Container that keeps only the latest item for each key, items are ordered by the time of their latest update. It implements the subset of `deque` that is used by `_ObservationQueue`."""
+
+    def __init__(self, key: Callable[[Event], Hashable]):
+        self._key = key
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self.conflated = 0
+
+    def _key_of(self, item: Any) -> Hashable:
+        # remote observations (refs and futures) cannot be keyed until they are resolved
+        if isinstance(item, Event):
+            key = self._key(item)
+            if key is not None:
+                return key
+        # items without a key are never conflated
+        return (_LatestByKey, id(item))
+
+    def supersedes(self, item: Any) -> bool:
+        """Will appending the item replace an existing item?"""
+        return self._key_of(item) in self._items
+
+    def append(self, item: Any) -> None:
+        key = self._key_of(item)
+        if self._items.pop(key, None) is not None:
+            self.conflated += 1
+        self._items[key] = item
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.append(item)
+
+    def popleft(self) -> Any:
+        return self._items.popitem(last=False)[1]
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items.values())
+
+    def __getitem__(self, index: int) -> Any:
+        return next(islice(self._items.values(), index, None))
+
+    def __delitem__(self, index: int) -> None:
+        del self._items[next(islice(self._items.keys(), index, None))]
+
+
+def priority_by_type(
+    priorities: dict[type, int], default: int = 1
+) -> Callable[[Event], int]:
+    """Create a priority function (see `Component`) that assigns priorities to observations by type. The priority of a type is resolved via its method resolution order (the closest parent type with a given priority is used).
+
+    Args:
+        priorities (dict[type, int]): type -> priority, lower values are delivered first.
+        default (int, optional): priority of types that have no given priority. Defaults to 1.
+
+    Returns:
+        Callable[[Event], int]: the priority function.
+    """
+    cache: dict[type, int] = dict()
+
+    def _priority(event: Event) -> int:
+        t = type(event)
+        try:
+            return cache[t]
+        except KeyError:
+            priority = next(
+                (priorities[m] for m in t.mro() if m in priorities), default
+            )
+            cache[t] = priority
+            return priority
+
+    return _priority
+
+
+# errors and control events are delivered before all other observations
+default_priority = priority_by_type({ErrorObservation: 0, KillEvent: 0}, default=1)
+
+
+class _PriorityBuckets:
+    """Container that orders items by priority class, with one FIFO bucket per class. Pushing is O(1) (there is no sort), popping is proportional to the number of classes. It implements the subset of `deque` that is used by `_ObservationQueue`.
+
+    The priority function is only given events. Internal items have a fixed priority: the end of async iteration (see `_ObservationsAsyncIter.cancel`) is delivered first, and unresolved remote observations (object refs and futures) are delivered after all events (they are re-prioritised once they are resolved, see `_ObservationQueue.resolve_refs`).
+    """
+
+    # priority classes of internal items
+    SENTINEL_PRIORITY = -math.inf
+    UNRESOLVED_PRIORITY = math.inf
+
+    def __init__(self, priority: Callable[[Event], int]):
+        self._priority = priority
+        self._buckets: dict[int | float, deque] = dict()
+        self._order: list[int | float] = []  # priority classes in ascending order
+        self._len = 0
+
+    def _bucket(self, priority: int | float) -> deque:
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = deque()
+            bisect.insort(self._order, priority)
+        return bucket
+
+    def _priority_of(self, item: Any) -> int | float:
+        if isinstance(item, Event):
+            return self._priority(item)
+        elif item is _ObservationsAsyncIter.SENTINEL:
+            return _PriorityBuckets.SENTINEL_PRIORITY
+        return _PriorityBuckets.UNRESOLVED_PRIORITY
+
+    def append(self, item: Any) -> None:
+        self._bucket(self._priority_of(item)).append(item)
+        self._len += 1
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.append(item)
+
+    def popleft(self) -> Any:
+        for priority in self._order:
+            bucket = self._buckets[priority]
+            if bucket:
+                self._len -= 1
+                return bucket.popleft()
+        raise IndexError("pop from an empty container")
+
+    def drop(self) -> Any:
+        """Remove the oldest item of the lowest priority class (see `OverflowPolicy.DROP_OLDEST`)."""
+        for priority in reversed(self._order):
+            bucket = self._buckets[priority]
+            if bucket:
+                self._len -= 1
+                return bucket.popleft()
+        raise IndexError("pop from an empty container")
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._order.clear()
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        for priority in self._order:
+            yield from self._buckets[priority]
+
+    def __getitem__(self, index: int) -> Any:
+        return next(islice(iter(self), index, None))
+
+    def __delitem__(self, index: int) -> None:
+        for priority in self._order:
+            bucket = self._buckets[priority]
+            if index < len(bucket):
+                del bucket[index]
+                self._len -= 1
+                return
+            index -= len(bucket)
+        raise IndexError(index)
+
+
+class _ObservationQueue(asyncio.Queue):
+    def __init__(
+        self,
+        capacity: int | None = None,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        conflate: Callable[[Event], Hashable] | None = None,
+        priority: Callable[[Event], int] | None = None,
+    ):
+        if conflate is not None and priority is not None:
+            raise ValueError("`conflate` and `priority` cannot be used together.")
+        # these are used in `_init`
+        self._conflate_key = conflate
+        self._priority = priority
+        # only the blocking policy makes use of the queues own maxsize, otherwise capacity is managed in `_put`
+        blocking = capacity is not None and overflow == OverflowPolicy.BLOCK
+        super().__init__(maxsize=capacity if blocking else 0)
+        self.capacity = capacity
+        self.overflow = overflow
+        self.dropped = 0
+        self._putting_sentinel = False
+
+    def _init(self, maxsize):
+        if self._conflate_key is not None:
+            self._queue = _LatestByKey(self._conflate_key)
+        elif self._priority is not None:
+            self._queue = _PriorityBuckets(self._priority)
+        else:
+            super()._init(maxsize)
+
+    @property
+    def conflated(self) -> int:
+        """The number of items that were superseded by a later item with the same key."""
+        return getattr(self._queue, "conflated", 0)
+
+    def _put(self, item):
+        if (
+            self.capacity is None
+            or len(self._queue) < self.capacity
+            or (self._conflate_key is not None and self._queue.supersedes(item))
+        ):
+            self._queue.append(item)
+        elif item is _ObservationsAsyncIter.SENTINEL:
+            self._queue.append(item)  # never dropped
+        elif self.overflow == OverflowPolicy.DROP_NEWEST:
+            self.dropped += 1
+        elif self.overflow == OverflowPolicy.CONFLATE:
+            self._conflate(item)
+        else:  # DROP_OLDEST
+            getattr(self._queue, "drop", self._queue.popleft)()
+            self._queue.append(item)
+            self.dropped += 1
+
+    def _conflate(self, item):
+        # remote observations (refs and futures) have no type until they are resolved
+        t = type(item) if isinstance(item, Event) else None
+        for i, other in enumerate(self._queue):
+            if t is not None and type(other) is t:
+                del self._queue[i]
+                break
+        else:
+            self._queue.popleft()
+        self._queue.append(item)
+        self.dropped += 1
+
+    def full(self) -> bool:  # noqa: D102
+        # the sentinel is never blocked by capacity (see `put_sentinel`)
+        return not self._putting_sentinel and super().full()
+
+    def free(self) -> int | None:
+        """The number of items that can be put before the queue is full (None if unbounded)."""
+        if self.maxsize <= 0:
+            return None
+        return max(0, self.maxsize - self.qsize())
+
+    def put_sentinel(self):
+        """Put the sentinel (see `_ObservationsAsyncIter.cancel`), this ignores capacity."""
+        self._putting_sentinel = True
+        try:
+            self.put_nowait(_ObservationsAsyncIter.SENTINEL)
+        finally:
+            self._putting_sentinel = False
+
+    def peek(self):
+        """Get the item at the head of the queue without removing it."""
+        return self._queue[0]
+
+    def resolve_refs(self) -> int:
+        """Resolve all object refs in the queue in place, this is a single call to `ray.get` rather than one call per ref.
+
+        Returns:
+            int: the number of refs that were resolved.
+        """
+        items = list(self._queue)
+        indices = [i for i, item in enumerate(items) if isinstance(item, ray.ObjectRef)]
+        if not indices:
+            return 0
+        count = 0
+        while indices:
+            values = ray.get([items[i] for i in indices])
+            for i, value in zip(indices, values):
+                items[i] = value
+            count += len(indices)
+            # refs may be nested (e.g. a shared ref returned by a remote call)
+            indices = [i for i in indices if isinstance(items[i], ray.ObjectRef)]
+        # resolved observations may now be conflated (see `_LatestByKey`)
+        self._queue.clear()
+        self._queue.extend(items)
+        # conflated items were removed without being got, keep the queue's bookkeeping consistent
+        for _ in range(len(items) - len(self._queue)):
+            self.task_done()
+            self._wakeup_next(self._putters)
+        return count
 
 
 class _Observations:
     """Unified class for managing collections of observations, both local and remote."""
 
-    def __init__(self, objects: list[Event | ray.ObjectRef] = ()):
+    def __init__(
+        self,
+        objects: list[Event | ray.ObjectRef | Future] = (),
+        capacity: int | None = None,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        conflate: Callable[[Event], Hashable] | None = None,
+        priority: Callable[[Event], int] | None = None,
+        max_age: float | None = None,
+        max_age_steps: int | None = None,
+    ):
         """Constructor.
 
+        Observations may be pushed as events, as object refs (remote observations), as futures (observations that are the result of staged actions, see `ActionCommit`) or as asyncio futures (observations that are the result of actions taken by an async `Ambient`). Object refs and futures are resolved when the observation is consumed, observations that resolve to None are skipped. Object refs that are pending when synchronous iteration starts are resolved together in a single call to `ray.get`. Synchronous iteration stops at a future that is not yet done (e.g. a staged action that has not been committed), the remaining observations will be available on a later cycle.
+
+        The number of buffered observations may be bounded by `capacity`, in which case `overflow` determines what happens when an observation is pushed while at capacity (see `OverflowPolicy`). The number of observations that were dropped is available via `dropped`.
+
+        If `conflate` is given, only the latest observation for each key (as computed by `conflate`) is kept, an observation supersedes any buffered observation with the same key. Consuming the buffered observations is then proportional to the number of keys rather than the number of observations that were pushed. Remote observations (object refs and futures) are keyed once they are resolved.
+
+        If `priority` is given, observations are delivered in order of their priority class (lower values first) and in the order that they were pushed within each class (see `default_priority` and `priority_by_type`). The priority function is only given events, unresolved remote observations (object refs and futures) are delivered after all events and are re-prioritised once they are resolved (see `resolve_refs`).
+
+        If `max_age` or `max_age_steps` is given, observations that are older than this when they are consumed are dropped, the age of an observation is determined by its `timestamp`. An age in steps is relative to the steps marked via `step`, an observation that was created before the start of the `max_age_steps`-th previous step has expired (with `max_age_steps=0` only observations created since the start of the current step are kept). Expiry is checked at dequeue, no work is done for observations that are not consumed. The number of observations that expired is available via `expired`.
+
         Args:
-            objects (list[Event  |  ray.ObjectRef], optional): list of events or object refs to push into this `_Observations`. Defaults to [].
+            objects (list[Event | ray.ObjectRef | Future | asyncio.Future], optional): list of events, object refs or futures to push into this `_Observations`. Defaults to [].
+            capacity (int, optional): maximum number of buffered observations. Defaults to None (unbounded).
+            overflow (OverflowPolicy, optional): the policy to use when at capacity. Defaults to `OverflowPolicy.DROP_OLDEST`.
+            conflate (Callable[[Event], Hashable], optional): function that computes the key of an observation, e.g. `lambda event: (type(event), event.source)`, observations whose key is None are never conflated. Defaults to None (observations are not conflated).
+            priority (Callable[[Event], int], optional): function that computes the priority class of an observation. Defaults to None (observations are delivered in the order that they were pushed).
+            max_age (float, optional): maximum age (in seconds) of a consumed observation. Defaults to None (no limit).
+            max_age_steps (int, optional): maximum age (in steps) of a consumed observation. Defaults to None (no limit).
+
+        Raises:
+            ValueError: if both `conflate` and `priority` are given, or if `capacity`, `max_age` or `max_age_steps` is invalid.
         """
-        self._queue = asyncio.Queue()
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, received: {capacity}")
+        if max_age is not None and max_age <= 0:
+            raise ValueError(f"Max age must be positive, received: {max_age}")
+        if max_age_steps is not None and max_age_steps < 0:
+            raise ValueError(
+                f"Max age steps must be non-negative, received: {max_age_steps}"
+            )
+        self._max_age = max_age
+        # start times of the most recent steps, the first is the oldest step that has not expired
+        self._steps = None if max_age_steps is None else deque(maxlen=max_age_steps + 1)
+        self.expired = 0
+        self._queue = _ObservationQueue(
+            capacity=capacity, overflow=overflow, conflate=conflate, priority=priority
+        )
         self.push_all(objects)
 
         self._queue_aiter = None
@@ -21,6 +383,57 @@ class _Observations:
     def __len__(self):
         return self._queue.qsize()
 
+    @property
+    def capacity(self) -> int | None:
+        """The maximum number of buffered observations (None if unbounded)."""
+        return self._queue.capacity
+
+    @property
+    def overflow(self) -> OverflowPolicy:
+        """The policy to use when an observation is pushed while at capacity."""
+        return self._queue.overflow
+
+    @property
+    def dropped(self) -> int:
+        """The number of observations that have been dropped because of overflow."""
+        return self._queue.dropped
+
+    @property
+    def conflated(self) -> int:
+        """The number of observations that were superseded by a later observation with the same key (see `conflate`)."""
+        return self._queue.conflated
+
+    @property
+    def max_age(self) -> float | None:
+        """The maximum age (in seconds) of a consumed observation (None if there is no limit)."""
+        return self._max_age
+
+    @property
+    def max_age_steps(self) -> int | None:
+        """The maximum age (in steps) of a consumed observation (None if there is no limit)."""
+        return None if self._steps is None else self._steps.maxlen - 1
+
+    def step(self) -> None:
+        """Mark the start of a step, this is used to determine the age of observations in steps (see `max_age_steps`)."""
+        if self._steps is not None:
+            self._steps.append(time.time())
+
+    def _cutoff(self) -> float | None:
+        # observations with a timestamp before the cutoff have expired
+        cutoff = None
+        if self._max_age is not None:
+            cutoff = time.time() - self._max_age
+        if self._steps is not None and len(self._steps) == self._steps.maxlen:
+            cutoff = self._steps[0] if cutoff is None else max(cutoff, self._steps[0])
+        return cutoff
+
+    def _fresh(self, item: Event | None, cutoff: float | None) -> Event | None:
+        # the item if it has not expired, otherwise None (the item is counted as expired)
+        if cutoff is not None and isinstance(item, Event) and item.timestamp < cutoff:
+            self.expired += 1
+            return None
+        return item
+
     def is_active(self):
         """Checks if this `_Observations` is being consumed asynchronously.
 
@@ -37,23 +450,65 @@ class _Observations:
         """
         return self._queue.empty()
 
+    def prefetch(self, timeout: float | None = 0) -> int:
+        """Prefetch the values of all remote observations in this `_Observations` (object refs and lazy observations, see `lazy`) into the local object store, this is a single call to `ray.wait` rather than one call per observation. Values are not deserialized until the observations are consumed.
+
+        Args:
+            timeout (float | None, optional): maximum time (in seconds) to wait for the values to be fetched. Defaults to 0 (start fetching and return immediately), None will wait for all values.
+
+        Returns:
+            int: the number of values that are ready.
+        """
+        refs = [
+            item if isinstance(item, ray.ObjectRef) else value_ref(item)
+            for item in self._queue._queue
+        ]
+        refs = [ref for ref in refs if ref is not None]
+        if not refs:
+            return 0
+        ready, _ = ray.wait(
+            refs, num_returns=len(refs), timeout=timeout, fetch_local=True
+        )
+        return len(ready)
+
     def push_all(self, events: list[Event | ray.ObjectRef]) -> None:
-        """Pushes a list of events into this `_Observations`.
+        """Pushes a list of events into this `_Observations`. With the overflow policy `OverflowPolicy.BLOCK` either all of the events are pushed or none of them are, a synchronous push cannot wait for space (see `apush`).
 
         Args:
             events (list[Event  |  ray.ObjectRef]): list of events to push into this `_Observations`.
+
+        Raises:
+            asyncio.QueueFull: if there is not space for all of the events and the overflow policy is `OverflowPolicy.BLOCK`.
         """
-        for event in filter(None, events):
+        events = [event for event in events if event]
+        free = self._queue.free()
+        if free is not None and len(events) > free:
+            raise asyncio.QueueFull(
+                f"Cannot push {len(events)} observation(s), only {free} of {self.capacity} buffered observations are free. "
+                "The `OverflowPolicy.BLOCK` policy requires an async producer (see `apush`)."
+            )
+        for event in events:
             self._queue.put_nowait(event)
 
     def push(self, event: Event | ray.ObjectRef) -> None:
         """Pushes a single event into this `_Observations`.
 
+        Args:
+            event (Event | ray.ObjectRef): event to push into this `_Observations`.
+
+        Raises:
+            asyncio.QueueFull: if at capacity and the overflow policy is `OverflowPolicy.BLOCK`.
+        """
+        self.push_all([event])
+
+    async def apush(self, event: Event | ray.ObjectRef) -> None:
+        """Pushes a single event into this `_Observations`, if at capacity and the overflow policy is `OverflowPolicy.BLOCK` this will wait until there is space.
+
         Args:
             event (Event | ray.ObjectRef): event to push into this `_Observations`.
         """
         if event:
-            self._queue.put_nowait(event)
+            await self._queue.put(event)
 
     def pop(self) -> Event:
         """Pops the most recent event from this `_Observations`.
@@ -63,20 +518,54 @@ class _Observations:
         """
         if self._queue_aiter:
             raise ValueError("Observations are already being consumed asynchronously.")
-        item = self._queue.get_nowait()  # raises an error if the queue is empty
-        return ray.get(item) if isinstance(item, ray.ObjectRef) else item
+        cutoff = self._cutoff()
+        item = None
+        while item is None:
+            if not self._queue.empty() and _pending(self._queue.peek()):
+                raise asyncio.QueueEmpty()
+            # raises an error if the queue is empty
+            item = self._fresh(_resolve(self._queue.get_nowait()), cutoff)
+        return item
 
     def __iter__(self):
+        # resolve all pending refs up front, one round trip rather than one per ref
+        self._queue.resolve_refs()
         return self
 
     def __next__(self) -> Event:
         """Get the next event from this observation, this is a blocking call."""
         if self._queue_aiter:
             raise ValueError("Observations are already being consumed asynchronously.")
-        if self._queue.empty():
-            raise StopIteration
-        item = self._queue.get_nowait()
-        return ray.get(item) if isinstance(item, ray.ObjectRef) else item
+        cutoff = self._cutoff()
+        item = None
+        while item is None:
+            if self._queue.empty() or _pending(self._queue.peek()):
+                raise StopIteration
+            item = self._fresh(_resolve(self._queue.get_nowait()), cutoff)
+        return item
+
+    def drain(self, max_size: int | None = None) -> list[Event]:
+        """Consume the observations that are currently available (see `__next__`) as a list, this is a blocking call. Pending object refs are resolved in a single call to `ray.get`.
+
+        Args:
+            max_size (int, optional): maximum number of observations to consume. Defaults to None (no limit).
+
+        Returns:
+            list[Event]: the observations.
+        """
+        if self._queue_aiter:
+            raise ValueError("Observations are already being consumed asynchronously.")
+        self._queue.resolve_refs()
+        queue = self._queue
+        cutoff = self._cutoff()
+        result = []
+        while max_size is None or len(result) < max_size:
+            if queue.empty() or _pending(queue.peek()):
+                break
+            item = self._fresh(_resolve(queue.get_nowait()), cutoff)
+            if item is not None:
+                result.append(item)
+        return result
 
     def __aiter__(self):
         if self._queue_aiter:
@@ -92,22 +581,68 @@ class _Observations:
 
 class _ObservationsAsyncIter:
     SENTINEL = object()
+    # maximum number of object refs that are fetched concurrently ahead of consumption
+    PREFETCH = 8
 
-    def __init__(self, observations: _Observations):
+    def __init__(self, observations: _Observations, prefetch: int = PREFETCH):
         """Constructor.
 
         Args:
             observations (Observations): observations to consume asynchronously.
+            prefetch (int, optional): maximum number of object refs that are fetched concurrently ahead of consumption. Defaults to 8.
         """
         self._observations = observations
+        self._prefetch = prefetch
+        self._fetching: dict[ray.ObjectRef, asyncio.Future] = dict()
 
     async def __anext__(self) -> Event:
-        """Asynchronously get the next event."""
-        item = await self._observations._queue.get()
-        if item is _ObservationsAsyncIter.SENTINEL:
-            raise StopAsyncIteration
-        return await ray.get(item) if isinstance(item, ray.ObjectRef) else item
+        """Asynchronously get the next event, object refs are awaited (without blocking the event loop)."""
+        item = None
+        while item is None:
+            item = await self._observations._queue.get()
+            if item is _ObservationsAsyncIter.SENTINEL:
+                self._cancel_fetching()
+                raise StopAsyncIteration
+            item = await self._resolve(item)
+            item = self._observations._fresh(item, self._observations._cutoff())
+        return item
+
+    async def _resolve(self, item: Event | ray.ObjectRef | Future | asyncio.Future):
+        # futures and refs may be nested (e.g. a shared ref returned by a remote call)
+        while True:
+            if isinstance(item, asyncio.Future):
+                item = await item
+            elif isinstance(item, Future):
+                item = await asyncio.wrap_future(item)
+            elif isinstance(item, ray.ObjectRef):
+                future = self._fetching.pop(item, None)
+                self._fetch_ahead()
+                item = await (item if future is None else future)
+            else:
+                return item
+
+    def _fetch_ahead(self):
+        queue = self._observations._queue._queue
+        if len(self._fetching) >= self._prefetch:
+            self._prune_fetching(queue)
+        # start fetching the refs that are next in the queue (up to the prefetch limit)
+        for item in islice(queue, self._prefetch):
+            if len(self._fetching) >= self._prefetch:
+                break
+            if isinstance(item, ray.ObjectRef) and item not in self._fetching:
+                self._fetching[item] = item.as_future()
+
+    def _prune_fetching(self, queue):
+        # refs that were dropped (overflow) or superseded (conflation) are never consumed
+        queued = {item for item in queue if isinstance(item, ray.ObjectRef)}
+        for item in [item for item in self._fetching if item not in queued]:
+            self._fetching.pop(item).cancel()
+
+    def _cancel_fetching(self):
+        for future in self._fetching.values():
+            future.cancel()
+        self._fetching.clear()
 
     def cancel(self):
         """Cancel the async iteration."""
-        self._observations._queue.put_nowait(_ObservationsAsyncIter.SENTINEL)
+        self._observations._queue.put_sentinel()
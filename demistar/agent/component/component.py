@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
+from collections.abc import Callable, Hashable
 
 from ...event import Observation, Action, Event
-from ._observations import _Observations
+from ._observations import _Observations, OverflowPolicy
 from ...utils import int64_uuid
 
 if TYPE_CHECKING:
@@ -21,8 +22,36 @@ class Component(ABC):
     Components include: `Sensor` and `Actuator`, which are used by the agent for sensing the environment and performing actions to change its state.
     """
 
-    def __init__(self, *args, **kwargs):
-        """Constructor."""
+    def __init__(
+        self,
+        *args,
+        capacity: int | None = None,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        conflate: Callable[[Event], Hashable] | None = None,
+        priority: Callable[[Event], int] | None = None,
+        max_age: float | None = None,
+        max_age_steps: int | None = None,
+        **kwargs,
+    ):
+        """Constructor.
+
+        Args:
+            args (list[Any]): optional additional arguments.
+            capacity (int, optional): maximum number of observations that will be buffered by this component, this keeps memory use predictable if observations arrive faster than the agent consumes them (e.g. a high rate subscription). Defaults to None (unbounded).
+            overflow (OverflowPolicy, optional): what to do with observations that arrive while at `capacity`, see `OverflowPolicy`. `OverflowPolicy.BLOCK` is not supported, observations are pushed to a component synchronously (e.g. by a publisher) and cannot wait for space. Defaults to `OverflowPolicy.DROP_OLDEST`.
+            conflate (Callable[[Event], Hashable], optional): function that computes the key of an observation, only the latest observation for each key will be buffered. This is useful for state-like observations (e.g. a position or window size) where only the latest value matters, e.g. `conflate=lambda event: (type(event), event.source)`. Defaults to None (observations are not conflated).
+            priority (Callable[[Event], int], optional): function that computes the priority class of an observation, observations with a lower value are delivered first (by `iter_observations` and `aiter_observations`). `default_priority` delivers error observations and `KillEvent`s first, see also `priority_by_type`. Defaults to None (observations are delivered in the order that they arrive). This cannot be used with `conflate`.
+            max_age (float, optional): maximum age (in seconds, see `Event.timestamp`) of the observations that are delivered by this component, older observations are dropped when they are consumed. This allows a lagging agent to catch up rather than process stale observations. Defaults to None (no limit).
+            max_age_steps (int, optional): maximum age (in agent cycles, see `on_step`) of the observations that are delivered by this component, e.g. 0 will deliver only the observations that were created during the current cycle. Defaults to None (no limit).
+            kwargs (dict[str, Any]): optional additional arguments.
+
+        Raises:
+            ValueError: if `overflow` is `OverflowPolicy.BLOCK`.
+        """
+        if overflow == OverflowPolicy.BLOCK:
+            raise ValueError(
+                "`OverflowPolicy.BLOCK` is not supported by components, observations are pushed synchronously and cannot wait for space."
+            )
         super().__init__(*args, **kwargs)
         self._id: int = int64_uuid()
         # this will be set by the agent when this component is added to it.
@@ -31,7 +60,14 @@ class Component(ABC):
         # actions to attempt in the current cycle to produce observations
         self._actions: list[Action] = []  # TODO allow async access here?
         # observations that result from taking action
-        self._observations: _Observations = _Observations()
+        self._observations: _Observations = _Observations(
+            capacity=capacity,
+            overflow=overflow,
+            conflate=conflate,
+            priority=priority,
+            max_age=max_age,
+            max_age_steps=max_age_steps,
+        )
 
     def on_add(self, agent: Agent) -> None:
         """Callback for when this `Component` is added to an `Agent`.
@@ -50,6 +86,10 @@ class Component(ABC):
         self._agent = None
         self._observations.cancel()
 
+    def on_step(self) -> None:
+        """Callback for when the `Agent` that this `Component` is attached to begins a new cycle (see `Agent.__sense__`), this is used to determine the age of observations in cycles (see `max_age_steps` in the constructor)."""
+        self._observations.step()
+
     @property
     def id(self):
         """Unique identifier for this [`Component`].
@@ -59,6 +99,33 @@ class Component(ABC):
         """
         return self._id
 
+    @property
+    def dropped_observations(self) -> int:
+        """The number of observations that were dropped by this component because they arrived while at capacity (see `OverflowPolicy`).
+
+        Returns:
+            int: the number of dropped observations.
+        """
+        return self._observations.dropped
+
+    @property
+    def conflated_observations(self) -> int:
+        """The number of observations that were superseded by a later observation with the same key (see `conflate` in the constructor).
+
+        Returns:
+            int: the number of conflated observations.
+        """
+        return self._observations.conflated
+
+    @property
+    def expired_observations(self) -> int:
+        """The number of observations that were dropped by this component because they were too old when they were consumed (see `max_age` in the constructor).
+
+        Returns:
+            int: the number of expired observations.
+        """
+        return self._observations.expired
+
     def iter_observations(self):
         """Iterate over and consumes the observations that are currently buffered in this `Component`.
 
@@ -68,6 +135,29 @@ class Component(ABC):
         for observation in self._observations:
             yield self.__transduce__(observation)
 
+    def prefetch_observations(self, timeout: float | None = 0) -> int:
+        """Prefetch the values of remote (or lazy) observations that are currently buffered in this `Component`, see `lazy`. This makes a single call to `ray.wait` for all pending values, rather than fetching each value as it is accessed.
+
+        Args:
+            timeout (float | None, optional): maximum time (in seconds) to wait for the values to be fetched. Defaults to 0 (start fetching and return immediately), None will wait for all values.
+
+        Returns:
+            int: the number of values that are ready.
+        """
+        return self._observations.prefetch(timeout=timeout)
+
+    def iter_observation_batches(self, max_size: int | None = None):
+        """Iterate over and consumes the observations that are currently buffered in this `Component` in batches. Each batch is transformed at once via `__transduce_batch__`, this is typically more efficient than `iter_observations` when many observations arrive each cycle.
+
+        Args:
+            max_size (int, optional): maximum number of observations in each batch. Defaults to None, in which case all buffered observations are given in a single batch.
+
+        Yields:
+            [Any]: the (transformed) batch of observations, by default a list of observations.
+        """
+        while batch := self._observations.drain(max_size=max_size):
+            yield self.__transduce_batch__(batch)
+
     def iter_actions(self):
         """Iterates (and consumes?TODO) the actions that are currently buffered in this `Component`.
 
@@ -101,6 +191,19 @@ class Component(ABC):
         """
         return observation
 
+    def __transduce_batch__(self, observations: list[Observation]) -> Any:
+        """Transform a batch of incoming observations (see `iter_observation_batches`), for example into a single `numpy` array. By default each observation is transformed individually via `__transduce__`.
+
+        Note that if this component is attached to an `AgentRouted`, the result must be a list of observations so that they can be routed.
+
+        Args:
+            observations (list[Observation]): observations to transform
+
+        Returns:
+            Any: the transformed observations, by default a list of observations.
+        """
+        return [self.__transduce__(observation) for observation in observations]
+
     @abstractmethod
     def __query__(self, state: State) -> None:
         """Query the state of the environment (take an action).
@@ -126,7 +229,8 @@ class Component(ABC):
             events (list[Event]): whoses sources should be set
         """
         for event in events:
-            event.source = (component.id << 64) | component._agent.id
+            # the source is always valid, this avoids validation on assignment
+            event.set_unchecked(source=(component.id << 64) | component._agent.id)
 
     @staticmethod
     def unpack_event_source(event: Event):
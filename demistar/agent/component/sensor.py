@@ -8,6 +8,7 @@ from ...event import Event
 from ...pubsub import Subscriber, Subscribe, Unsubscribe
 
 if TYPE_CHECKING:
+    import ray
     from ..agent import Agent
     from ...environment import State
 
@@ -108,6 +109,14 @@ class Sensor(Component, Subscriber):
         """
         self._observations.push_all([message])
 
+    def __notify_all__(self, messages: list[Event | ray.ObjectRef]) -> None:
+        """Called by a `Publisher` with events that the sensor has subscribed to receive. Events that were broadcast to many subscribers may be given as object refs, these are resolved when the events are consumed.
+
+        Args:
+            messages (list[Event | ray.ObjectRef]): the events that sensor has subscribed to receive.
+        """
+        self._observations.push_all(messages)
+
     def __sense__(self) -> list[Event]:
         """This method can be overridden to create a `Sensor` that does not depend on calls to `attempt` methods. This is useful if the `Sensor` should always sense the same kind of data.
 
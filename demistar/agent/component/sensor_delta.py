@@ -0,0 +1,99 @@
+"""Module defines the `DeltaSensor` class, a sensor that keeps a local mirror of (part of) the state of the environment up to date by observing only the changes to the state. See class documentation for details."""
+
+from __future__ import annotations
+from types import MappingProxyType
+from typing import Any
+from collections.abc import Mapping
+
+from .sensor import Sensor
+from ...event import Event, DeltaSelect, DeltaObservation
+
+__all__ = ("DeltaSensor",)
+
+
+class DeltaSensor(Sensor):
+    """A sensor that takes a `DeltaSelect` action every cycle and applies the resulting `DeltaObservation`s to a local mirror of the state. The environment must support `DeltaSelect` (see `DeltaTracker`).
+
+    The mirror is updated as observations are consumed (via `iter_observations`, `iter_observation_batches` or `aiter_observations`) before they are passed to `__transduce__` (or `__transduce_batch__`), it can be accessed via `mirror`.
+
+    A `DeltaObservation` only applies to the version of the state that it was computed against (see `DeltaObservation.since`). If an observation is missed (e.g. it was dropped because the sensor is at capacity) or arrives out of order, it is not applied and the next `DeltaSelect` requests the full state (`reset=True`), the mirror is stale until the full state is received. Observations that arrive while waiting for the full state are not applied.
+
+    Example:
+    ```
+    class MyAgent(Agent):
+        def __cycle__(self):
+            for _ in self.delta_sensor.iter_observations():
+                pass
+            print(self.delta_sensor.mirror)  # the up-to-date state
+    ```
+    """
+
+    def __init__(self, keys: list[Any] | None = None, **kwargs):
+        """Constructor.
+
+        Args:
+            keys (list[Any], optional): the keys of the state to mirror. Defaults to None, in which case all keys are mirrored.
+            kwargs (dict[str, Any]): optional additional arguments (see `Component`), for example `capacity` and `overflow`.
+        """
+        super().__init__(**kwargs)
+        self._keys = keys
+        self._mirror: dict[Any, Any] = dict()
+        self._version = 0
+        self._registered = False
+        # whether the full state must be requested, and whether it has been requested but not yet received
+        self._reset = False
+        self._resetting = False
+
+    @property
+    def mirror(self) -> Mapping[Any, Any]:
+        """The local mirror of the state (read-only).
+
+        Returns:
+            Mapping[Any, Any]: the mirror.
+        """
+        return MappingProxyType(self._mirror)
+
+    @property
+    def version(self) -> int:
+        """The version of the state that the mirror is up to date with.
+
+        Returns:
+            int: the version.
+        """
+        return self._version
+
+    def __sense__(self) -> list[Event]:
+        """Take a `DeltaSelect` action, the keys are only sent with the first action (the query is remembered by the environment). The full state is requested if the mirror is stale (see class documentation).
+
+        Returns:
+            list[Event]: the sense actions.
+        """
+        keys = None if self._registered else self._keys
+        self._registered = True
+        reset, self._reset = self._reset, False
+        self._resetting = self._resetting or reset
+        return [DeltaSelect(keys=keys, reset=reset)]
+
+    def iter_observations(self):  # noqa: D102
+        for observation in self._observations:
+            yield self.__transduce__(self._apply(observation))
+
+    def iter_observation_batches(self, max_size: int | None = None):  # noqa: D102
+        while batch := self._observations.drain(max_size=max_size):
+            yield self.__transduce_batch__([self._apply(o) for o in batch])
+
+    async def aiter_observations(self):  # noqa: D102
+        async for observation in self._observations:
+            yield self.__transduce__(self._apply(observation))
+
+    def _apply(self, observation: Event) -> Event:
+        if isinstance(observation, DeltaObservation):
+            if observation.full:
+                self._resetting = False
+            elif observation.since != self._version:
+                # a delta was missed or is out of order, the mirror must be reset
+                self._reset = self._reset or not self._resetting
+                return observation
+            observation.apply(self._mirror)
+            self._version = observation.version
+        return observation
@@ -1,9 +1,10 @@
 """Module defines the `IOSensor` which represents a senors that gets its observations from a device. These sensors do not read the environment state, instead they may read a file, grab user input, or perform some other IO READ operation."""
 
 from __future__ import annotations
+from collections.abc import Callable
 from typing import Any, TYPE_CHECKING
 
-from ...event import Event
+from ...event import Coalescer, Event, EventBatch
 from .sensor import Sensor
 
 if TYPE_CHECKING:
@@ -26,20 +27,35 @@ class IOSensor(Sensor):
     TODO implement a wrapper for files and pipes (it would be nice if we could read from file streams/os pipes)
     """
 
-    def __init__(self, device: Any):
+    def __init__(
+        self,
+        device: Any,
+        batch: bool = False,
+        coalesce: bool | Callable[[list[Event]], list[Event]] = False,
+        **kwargs,
+    ):
         """Constructor.
 
         Args:
             device (Any): io device that will provide observations (Event) to the sensor via `get_nowait` or `get`.
+            batch (bool, optional): whether to group the events that are read from the device in each cycle into an `EventBatch` per event type, rather than observing them individually. This is useful for high rate input (e.g. mouse motion) which may then be processed in a vectorized way. Defaults to False.
+            coalesce (bool | Callable[[list[Event]], list[Event]], optional): whether to merge bursts of the events that are read from the device in each cycle (e.g. mouse motion, window moves and key repeats) into consolidated events, see `Coalescer`. A callable may be given in place of the default `Coalescer`, for example a `Coalescer` with custom rules. Coalescing is done before batching. Defaults to False.
+            kwargs (dict[str, Any]): optional additional arguments (see `Component`), for example `capacity` and `overflow` which bound the number of buffered events if the device produces them faster than the agent consumes them.
         """
-        super().__init__()
+        super().__init__(**kwargs)
         # the device must contain this method TODO a more indepth check
         assert hasattr(device, "get_nowait")
         self._device = device
+        self._batch = batch
+        self._coalesce = Coalescer() if coalesce is True else (coalesce or None)
 
     def __query__(self, _: State) -> None:  # noqa
         # we query from the device, not from the state
         observations: list[Event] = self._device.get_nowait()
+        if self._coalesce:
+            observations = self._coalesce(observations)
+        if self._batch:
+            observations = EventBatch.group(observations)
         # preprocess the observations ready to be received by the agent
         self._observations.push_all(self.__transduce__(observations))
 
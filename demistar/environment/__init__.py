@@ -3,11 +3,56 @@
 Important classes:
     - `Environment`: the container and entry point of an agent simulation.
     - `Ambient`: defines the state of the environment and holds references to all agents in the simulation.
+    - `SQLiteAmbient`: an `Ambient` whose state is persisted in a local SQLite database, writes are flushed once per step.
+    - `SharedArrayState`: numeric arrays held in shared memory, agents in other processes view them (without a copy) via a `SharedArrayHandle`.
+    - `ActionCommit`: an optional commit stage for an `Ambient`, update actions are staged, coalesced and applied in a single pass each step.
+    - `OptimisticCommit`: a commit stage that validates `TransactionAction`s against a `VersionedState` and applies non-conflicting actions concurrently.
+    - `EntityStore`: a columnar (struct-of-arrays) store for the entities of an `Ambient`.
+    - `GridIndex`, `KDTreeIndex`: spatial indexes for proximity queries in an `Ambient`.
+    - `DeltaTracker`: answers `DeltaSelect` actions with only the changes to a `VersionedState`.
+    - `ArrowRecorder`: streams actions, observations and published events to Parquet files (requires `pyarrow`).
 """
 
 from .environment import Environment
 from .ambient import Ambient, _Ambient
+from .sqlite import SQLiteAmbient
+from .shared import SharedArrayState, SharedArrayHandle
+from .versioned import VersionedState
+from .delta import DeltaTracker
+from .entity import EntityStore
+from .spatial import SpatialIndex, GridIndex, KDTreeIndex
+from .recorder import ArrowRecorder
+from .commit import (
+    ActionCommit,
+    OptimisticCommit,
+    TransactionAction,
+    MergeRule,
+    LastWriterWins,
+    SumDeltas,
+    RejectConflicts,
+)
 
 State = _Ambient  # TODO temporary, we need to think more about how the environment state is going to be provided to agents
 
-__all__ = ("Environment", "Ambient", "State")
+__all__ = (
+    "Environment",
+    "Ambient",
+    "State",
+    "SQLiteAmbient",
+    "SharedArrayState",
+    "SharedArrayHandle",
+    "VersionedState",
+    "DeltaTracker",
+    "EntityStore",
+    "SpatialIndex",
+    "GridIndex",
+    "KDTreeIndex",
+    "ArrowRecorder",
+    "ActionCommit",
+    "OptimisticCommit",
+    "TransactionAction",
+    "MergeRule",
+    "LastWriterWins",
+    "SumDeltas",
+    "RejectConflicts",
+)
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 from typing import Any, TYPE_CHECKING
+from collections.abc import Hashable
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
+import asyncio
+import inspect
 import ray
 
 from ..utils import int64_uuid, _Future
@@ -12,6 +16,8 @@ from ..pubsub import Subscribe, Unsubscribe
 
 if TYPE_CHECKING:
     from ..agent import Agent
+    from .commit import ActionCommit
+    from .recorder import ArrowRecorder
 
 
 class Ambient(ABC):
@@ -28,14 +34,25 @@ class Ambient(ABC):
     Another important method `__subscribe__` is used to handle actions that are specifically related to `star_ray`s pub-sub mechansim. Not all ambients need implement this.
 
     Agents can be added or removed from the environent via corresponding methods in the `Ambient`.
+
+    `__select__` and `__update__` may also be declared `async`, this is useful if the state is backed by a database, file or other IO device. Actions are then executed concurrently (up to a limit, see `Environment`) rather than one after another. Both must be declared `async` or neither.
+
+    An `Ambient` may optionally be given an `ActionCommit`, in which case update actions are staged (rather than being applied immediately) and are coalesced and applied in a single pass at the end of each step (via `__commit__`). See `ActionCommit` for details.
     """
 
-    def __init__(self, agents: list[Agent], *args, **kwargs):
+    def __init__(
+        self,
+        agents: list[Agent],
+        *args,
+        commit: ActionCommit | None = None,
+        **kwargs,
+    ):
         """Constructor.
 
         Args:
             agents (list[Agent]): a list of agents that will initially be added to this `Ambient`.
             args (list[Any]): optional additional arguments.
+            commit (ActionCommit, optional): commit stage for update actions. Defaults to None, in which case update actions are applied immediately.
             kwargs (dict[str, Any]): optional additional arguments.
         """
         super().__init__(*args, **kwargs)
@@ -43,6 +60,8 @@ class Ambient(ABC):
         agents = [_Agent.new(agent) for agent in agents]
         self._agents = {agent.get_id(): agent for agent in agents}
         self._is_alive = False
+        self._commit = commit
+        self._shared: dict[Hashable, tuple[Any, ray.ObjectRef]] = dict()
 
     def add_agent(self, agent: Agent) -> _Agent:
         """Adds a new agent to this ambient.
@@ -97,6 +116,23 @@ class Ambient(ABC):
         """
         return self._id
 
+    @property
+    def has_commit(self) -> bool:
+        """Whether this `Ambient` has an `ActionCommit`, in which case update actions are staged and applied on `__commit__`.
+
+        Returns:
+            bool: whether this ambient has a commit stage.
+        """
+        return self._commit is not None
+
+    def get_has_commit(self) -> bool:
+        """Getter for `has_commit`, see property for details.
+
+        Returns:
+            bool: whether this ambient has a commit stage.
+        """
+        return self._commit is not None
+
     def get_is_alive(self) -> bool:
         """Getter for `is_alive`, see property for details.
 
@@ -126,9 +162,11 @@ class Ambient(ABC):
         return len(self._agents)
 
     async def __terminate__(self) -> None:
-        """Terminate this `Ambient`. After this call `is_alive` will return False. This call will wait for all agents to be terminated via their `__terminate__` method."""
+        """Terminate this `Ambient`. After this call `is_alive` will return False. This call will wait for all agents to be terminated via their `__terminate__` method. The commit stage (if any) is closed, see `ActionCommit.close`."""
         state = _Ambient.new(self)
         self._is_alive = False
+        if self._commit is not None:
+            self._commit.close()
         agents = list(self.get_agents())
         self._agents.clear()
         # TODO if an agent takes too long, then just cancel it?
@@ -168,6 +206,53 @@ class Ambient(ABC):
         """
         pass
 
+    def __stage__(
+        self, action: Action
+    ) -> ActiveObservation | ErrorActiveObservation | Future | None:
+        """Stage an update action. If this `Ambient` has no `ActionCommit` the action is applied immediately via `__update__`, otherwise it will be applied on the next call to `__commit__`.
+
+        Args:
+            action (Action): the action
+
+        Returns:
+            ActiveObservation | ErrorActiveObservation | Future | None: the resulting observation (or None), or a future that will hold the observation once the action has been committed.
+        """
+        if self._commit is None:
+            return self.__update__(action)
+        return self._commit.stage(action)
+
+    def __commit__(self) -> None:
+        """Apply all staged update actions, this is called once at the end of each step by the `Environment`. It does nothing if this `Ambient` has no `ActionCommit`."""
+        if self._commit is not None:
+            self._commit.commit(self.__update__)
+
+    def share(self, key: Hashable, value: Any) -> Any:
+        """Share a value that will be observed by many (remote) agents, for example a global clock or map. The value is put in the ray object store once and all agents receive the same object ref, rather than the value being serialized once per agent. The ref is cached under `key` for as long as the same value (object) is shared, a new value (e.g. on the next step) replaces it.
+
+        Typically the value is an `Observation` that is returned from `__select__`, the ref is resolved when the observation is consumed by the agent (see `Component.iter_observations`).
+
+        Example:
+        ```
+        def __select__(self, action):
+            if isinstance(action, GetMap):
+                return self.share("map", self.map_observation)
+        ```
+
+        Args:
+            key (Hashable): the key under which to cache the shared value.
+            value (Any): the value to share.
+
+        Returns:
+            Any: an object ref to the value, or the value itself if ray is not initialised.
+        """
+        if not ray.is_initialized():
+            return value
+        shared = self._shared.get(key)
+        if shared is None or shared[0] is not value:
+            shared = (value, ray.put(value))
+            self._shared[key] = shared
+        return shared[1]
+
     def __subscribe__(
         self, action: Subscribe | Unsubscribe
     ) -> ActiveObservation | ErrorActiveObservation:
@@ -185,15 +270,49 @@ class Ambient(ABC):
 
 
 class _Ambient(ABC):
+    # default maximum number of actions that an async ambient will execute concurrently
+    DEFAULT_CONCURRENCY = 16
+
     @staticmethod
-    def new(ambient: Ambient | ray.actor.ActorHandle) -> _Ambient:
+    def new(
+        ambient: Ambient | ray.actor.ActorHandle,
+        concurrency: int | None = None,
+    ) -> _Ambient:
         if isinstance(ambient, ray.actor.ActorHandle):
             return _AmbientRemote(ambient)
         elif isinstance(ambient, Ambient):
-            return _AmbientLocal(ambient)
+            if _Ambient.is_ambient_async(ambient):
+                if ambient._commit is not None:
+                    raise TypeError(
+                        f"Ambient {ambient} declares async methods, an `ActionCommit` is not supported."
+                    )
+                return _AmbientLocalAsync(
+                    ambient, concurrency=concurrency or _Ambient.DEFAULT_CONCURRENCY
+                )
+            elif _Ambient.is_ambient_sync(ambient):
+                return _AmbientLocal(ambient)
+            else:
+                raise TypeError(
+                    f"Invalid method definitions in ambient {ambient}, __select__ and __update__ must be declared both async or both sync."
+                )
         else:
             raise TypeError(type(ambient))
 
+    @staticmethod
+    def is_ambient_async(ambient: Any):
+        """Does the ambient define asynchronous methods? (declared `async`)."""
+        return asyncio.iscoroutinefunction(
+            ambient.__select__
+        ) and asyncio.iscoroutinefunction(ambient.__update__)
+
+    @staticmethod
+    def is_ambient_sync(ambient: Any):
+        """Does the ambient define synchronous methods? (not declared `async`)."""
+        return not (
+            asyncio.iscoroutinefunction(ambient.__select__)
+            or asyncio.iscoroutinefunction(ambient.__update__)
+        )
+
     @property
     @abstractmethod
     def is_alive(self):
@@ -207,6 +326,10 @@ class _Ambient(ABC):
     async def __terminate__(self):
         pass
 
+    @abstractmethod
+    async def __commit__(self):
+        pass
+
     @abstractmethod
     def __subscribe__(self, actions: list[Event]) -> list[Any]:
         pass
@@ -238,11 +361,19 @@ class _AmbientRemote(_Ambient):
         return self._inner.get_is_alive.remote()
 
     async def __initialise__(self):
+        # staged actions result in futures that cannot leave the actor
+        if await self._inner.get_has_commit.remote():
+            raise TypeError(
+                f"Ambient {self._inner} is remote, an `ActionCommit` is not supported."
+            )
         return await self._inner.__initialise__.remote(self)
 
     async def __terminate__(self):
         return await self._inner.__terminate__.remote(self)
 
+    async def __commit__(self):
+        pass  # a remote ambient has no commit stage (see `__initialise__`)
+
     def __subscribe__(self, actions: list[Subscribe | Unsubscribe]) -> list[Any]:
         return [self._inner.__subscribe__.remote(query) for query in actions]
 
@@ -274,11 +405,14 @@ class _AmbientLocal(_Ambient):
     async def __terminate__(self):
         return await self._inner.__terminate__()
 
+    async def __commit__(self):
+        return self._inner.__commit__()
+
     def __subscribe__(self, actions: list[Subscribe | Unsubscribe]) -> list[Any]:
         return [self._inner.__subscribe__(query) for query in actions]
 
     def __update__(self, actions: list[Event]) -> list[Any]:
-        return [self._inner.__update__(query) for query in actions]
+        return [self._inner.__stage__(query) for query in actions]
 
     def __select__(self, actions: list[Event]) -> list[Any]:
         return [self._inner.__select__(query) for query in actions]
@@ -288,3 +422,100 @@ class _AmbientLocal(_Ambient):
 
     def get_agent_count(self) -> int:
         return self._inner.get_agent_count()
+
+
+class _AmbientLocalAsync(_AmbientLocal):
+    def __init__(self, ambient: Ambient, concurrency: int):
+        super().__init__(ambient)
+        self._concurrency = concurrency
+        self._semaphore = None  # created lazily, it must be created in the event loop
+        self._pending: set[asyncio.Task] = set()
+
+    async def __commit__(self):
+        # wait for all pending actions to complete, then commit them (e.g. flush buffered writes)
+        while self._pending:
+            await asyncio.wait(list(self._pending))
+        result = self._inner.__commit__()
+        if inspect.isawaitable(result):
+            await result
+
+    def __subscribe__(self, actions: list[Subscribe | Unsubscribe]) -> list[Any]:
+        if asyncio.iscoroutinefunction(self._inner.__subscribe__):
+            return [
+                self._schedule(self._inner.__subscribe__, query) for query in actions
+            ]
+        return super().__subscribe__(actions)
+
+    def __update__(self, actions: list[Event]) -> list[Any]:
+        return [self._schedule(self._inner.__update__, query) for query in actions]
+
+    def __select__(self, actions: list[Event]) -> list[Any]:
+        return [self._schedule(self._inner.__select__, query) for query in actions]
+
+    def _schedule(self, handler, action: Event) -> asyncio.Task:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def _run():
+            async with self._semaphore:
+                return await handler(action)
+
+        task = asyncio.create_task(_run())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+
+class _AmbientRecorded(_Ambient):
+    # records all actions and the resulting observations, see `ArrowRecorder`
+    def __init__(self, ambient: _Ambient, recorder: ArrowRecorder):
+        super().__init__()
+        self._inner = ambient
+        self._recorder = recorder
+
+    @property
+    def is_alive(self):
+        return self._inner.is_alive
+
+    async def __initialise__(self):
+        return await self._inner.__initialise__()
+
+    async def __terminate__(self):
+        return await self._inner.__terminate__()
+
+    async def __commit__(self):
+        return await self._inner.__commit__()
+
+    def __subscribe__(self, actions: list[Subscribe | Unsubscribe]) -> list[Any]:
+        return self._record(actions, self._inner.__subscribe__(actions))
+
+    def __update__(self, actions: list[Event]) -> list[Any]:
+        return self._record(actions, self._inner.__update__(actions))
+
+    def __select__(self, actions: list[Event]) -> list[Any]:
+        return self._record(actions, self._inner.__select__(actions))
+
+    def get_agents(self) -> list[_Agent]:
+        return self._inner.get_agents()
+
+    def get_agent_count(self) -> int:
+        return self._inner.get_agent_count()
+
+    def _record(self, actions: list[Event], results: list[Any]) -> list[Any]:
+        recorder = self._recorder
+        recorder.record_all(actions)
+        for result in results:
+            if isinstance(result, Event):
+                recorder.record(result)
+            elif isinstance(result, (asyncio.Future, Future)):
+                # staged or async actions, the observation is recorded when it completes
+                result.add_done_callback(self._record_future)
+            elif isinstance(result, ray.ObjectRef):
+                result.future().add_done_callback(self._record_future)
+        return results
+
+    def _record_future(self, future: asyncio.Future | Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            result = future.result()
+            if isinstance(result, Event):
+                self._recorder.record(result)
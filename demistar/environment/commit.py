@@ -0,0 +1,343 @@
+"""Module defines the commit stage of an `Ambient`, see `ActionCommit` class documentation for details.
+
+By default an `Ambient` applies each update action as soon as an `Actuator` takes it, which means that the final state depends on the order in which agents happen to run. If an `Ambient` is given an `ActionCommit`, update actions are instead staged (buffered) during the `__execute__` step of the agents cycle, coalesced using a set of `MergeRule`s and then applied in a single pass at the end of the step (see `Ambient.__commit__`).
+
+The `OptimisticCommit` additionally supports optimistic concurrency control: `TransactionAction`s declare the keys that they read and write in a `VersionedState`, conflicting actions are aborted and the remaining actions are applied concurrently.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from pydantic import Field
+
+from ..event import (
+    Action,
+    ActiveObservation,
+    ErrorActiveObservation,
+    ConflictObservation,
+)
+from ..utils.error import ActionConflict
+from .versioned import VersionedState
+
+__all__ = (
+    "ActionCommit",
+    "OptimisticCommit",
+    "TransactionAction",
+    "MergeRule",
+    "LastWriterWins",
+    "SumDeltas",
+    "RejectConflicts",
+)
+
+
+class MergeRule(ABC):
+    """Base class for merge rules. A merge rule groups staged update actions by `key` and coalesces each group into a single action via `merge`."""
+
+    def __init__(self, key: Callable[[Action], Hashable]):
+        """Constructor.
+
+        Args:
+            key (Callable[[Action], Hashable]): function that computes the key of an action, actions with the same key will be merged.
+        """
+        super().__init__()
+        self._key = key
+
+    def key(self, action: Action) -> Hashable:
+        """Get the merge key of an action.
+
+        Args:
+            action (Action): the staged action.
+
+        Returns:
+            Hashable: the merge key.
+        """
+        return self._key(action)
+
+    @abstractmethod
+    def merge(self, actions: list[Action]) -> Action:
+        """Merge a group of actions that share the same key into a single action.
+
+        Args:
+            actions (list[Action]): the actions to merge, these are always given in a deterministic order (see `ActionCommit.commit`).
+
+        Raises:
+            ActionConflict: if the actions cannot be merged.
+
+        Returns:
+            Action: the merged action.
+        """
+
+
+class LastWriterWins(MergeRule):
+    """Merge rule that keeps only the last action (in commit order) for each key."""
+
+    def merge(self, actions: list[Action]) -> Action:  # noqa: D102
+        return actions[-1]
+
+
+class SumDeltas(MergeRule):
+    """Merge rule that sums a numeric field over all actions for each key. The remaining fields are taken from the last action (in commit order)."""
+
+    def __init__(self, key: Callable[[Action], Hashable], field: str):
+        """Constructor.
+
+        Args:
+            key (Callable[[Action], Hashable]): function that computes the key of an action, actions with the same key will be merged.
+            field (str): the name of the (numeric) field to sum.
+        """
+        super().__init__(key)
+        self._field = field
+
+    def merge(self, actions: list[Action]) -> Action:  # noqa: D102
+        if len(actions) == 1:
+            return actions[0]
+        total = sum(getattr(action, self._field) for action in actions)
+        return actions[-1].model_copy(update={self._field: total})
+
+
+class RejectConflicts(MergeRule):
+    """Merge rule that rejects all actions for a key if they originate from more than one source. Actions from a single source are kept (the last in commit order wins)."""
+
+    def merge(self, actions: list[Action]) -> Action:  # noqa: D102
+        sources = {action.source for action in actions}
+        if len(sources) > 1:
+            raise ActionConflict(
+                f"{len(actions)} actions from {len(sources)} sources conflict on key: {self.key(actions[0])}"
+            )
+        return actions[-1]
+
+
+class ActionCommit:
+    """Stages update actions and applies them in a single pass.
+
+    Actions are staged via `stage`, which returns a `Future` that will hold the resulting observation once the actions have been committed via `commit`. On commit, staged actions are ordered deterministically by their `source` (and the order in which each source staged them), so that the result does not depend on the order in which agents were scheduled. Actions are then grouped by the `MergeRule` registered for their type and coalesced. Actions that have no associated rule are applied individually.
+
+    Example:
+    ```
+    commit = ActionCommit()
+    commit.add(LastWriterWins(key=lambda action: action.name), [SetAction])
+    commit.add(SumDeltas(key=lambda action: action.name, field="delta"), [AddAction])
+    ambient = MyAmbient(agents, commit=commit)
+    ```
+    """
+
+    def __init__(self):
+        """Constructor."""
+        super().__init__()
+        self._rules: dict[type, MergeRule] = dict()
+        self._rule_cache: dict[type, MergeRule | None] = dict()
+        self._staged: list[tuple[Action, Future]] = []
+
+    def add(self, rule: MergeRule, action_types: list[type[Action]]) -> None:
+        """Register a merge rule for the given action types (and their subtypes).
+
+        Args:
+            rule (MergeRule): the rule to use.
+            action_types (list[type[Action]]): the action types that the rule applies to.
+        """
+        for action_type in action_types:
+            self._rules[action_type] = rule
+        self._rule_cache.clear()
+
+    def get_rule(self, action_type: type[Action]) -> MergeRule | None:
+        """Get the merge rule for a given action type, this is resolved via the types method resolution order (the closest parent type with a registered rule is used).
+
+        Args:
+            action_type (type[Action]): the action type.
+
+        Returns:
+            MergeRule | None: the rule, or None if no rule is registered.
+        """
+        try:
+            return self._rule_cache[action_type]
+        except KeyError:
+            rule = next(
+                (self._rules[t] for t in action_type.mro() if t in self._rules), None
+            )
+            self._rule_cache[action_type] = rule
+            return rule
+
+    def __len__(self):  # noqa: D105
+        return len(self._staged)
+
+    def stage(self, action: Action) -> Future:
+        """Stage an update action, it will be applied on the next call to `commit`.
+
+        Args:
+            action (Action): the action to stage.
+
+        Returns:
+            Future: future that will hold the resulting observation (or None).
+        """
+        future = Future()
+        self._staged.append((action, future))
+        return future
+
+    def commit(
+        self, update: Callable[[Action], ActiveObservation | ErrorActiveObservation]
+    ) -> None:
+        """Coalesce and apply all staged actions, the futures returned by `stage` will be resolved.
+
+        Args:
+            update (Callable[[Action], ActiveObservation | ErrorActiveObservation]): function that applies a single action (typically `Ambient.__update__`).
+        """
+        staged, self._staged = self._staged, []
+        for group, futures, rule in self._group(_order(staged)):
+            try:
+                action = group[0] if rule is None else rule.merge(group)
+            except ActionConflict as e:
+                for staged_action, future in zip(group, futures):
+                    future.set_result(
+                        ConflictObservation.from_exception(staged_action, e)
+                    )
+                continue
+            try:
+                result = update(action)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for staged_action, future in zip(group, futures):
+                future.set_result(_retarget(result, staged_action))
+
+    def close(self) -> None:
+        """Release any resources held by this commit stage, this is called when the `Ambient` terminates (see `Ambient.__terminate__`)."""
+        pass
+
+    def _group(self, ordered: list[tuple[Action, Future]]):
+        # group by merge key, groups are in order of their first action
+        groups: dict[Hashable, tuple[list[Action], list[Future], MergeRule]] = dict()
+        for i, (action, future) in enumerate(ordered):
+            rule = self.get_rule(type(action))
+            key = (id(rule), rule.key(action)) if rule else (None, i)
+            group = groups.setdefault(key, ([], [], rule))
+            group[0].append(action)
+            group[1].append(future)
+        return groups.values()
+
+
+class TransactionAction(Action):
+    """Base class for update actions that declare the keys of a `VersionedState` that they read and write, see `OptimisticCommit`.
+
+    Attributes:
+        reads (dict[Any, int]): the keys that were read to decide on this action, and the version of each key at the time it was read (see `VersionedState.snapshot`).
+        writes (list[Any]): the keys that this action will write.
+    """
+
+    reads: dict[Any, int] = Field(default_factory=dict)
+    writes: list[Any] = Field(default_factory=list)
+
+
+class OptimisticCommit(ActionCommit):
+    """An `ActionCommit` that implements optimistic concurrency control for `TransactionAction`s.
+
+    On commit, transactions are validated in a deterministic order (see `ActionCommit`). A transaction is aborted if any key that it read has been written since it was read, or if its read or write set overlaps with that of a transaction that was accepted before it. Aborted transactions do not modify the state, they receive a `ConflictObservation` so that the agent can retry on its next cycle. The accepted transactions touch disjoint sets of keys, and so they are applied concurrently (each holding the locks of the keys it writes, see `VersionedState.lock`).
+
+    If `max_workers` is given, `Ambient.__update__` is called concurrently from several threads. The keys of the `VersionedState` are protected by their locks, but any other state that `__update__` touches is not, it must be thread-safe (e.g. guarded by a lock held by the `Ambient`). The threads are released on `close`, which is called when the `Ambient` terminates.
+
+    Actions that are not `TransactionAction`s are merged and applied as with `ActionCommit`, before any transactions.
+
+    Example:
+    ```
+    state = VersionedState({"x": 0})
+    ambient = MyAmbient(agents, commit=OptimisticCommit(state, max_workers=4))
+    ```
+    """
+
+    def __init__(self, state: VersionedState, max_workers: int | None = None):
+        """Constructor.
+
+        Args:
+            state (VersionedState): the state that transactions read and write.
+            max_workers (int, optional): maximum number of threads used to apply accepted transactions, `Ambient.__update__` must then be thread-safe (see class documentation). Defaults to None, in which case transactions are applied sequentially.
+        """
+        super().__init__()
+        self._state = state
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers) if max_workers else None
+        )
+
+    @property
+    def state(self) -> VersionedState:
+        """The state that transactions read and write.
+
+        Returns:
+            VersionedState: the state.
+        """
+        return self._state
+
+    def commit(
+        self, update: Callable[[Action], ActiveObservation | ErrorActiveObservation]
+    ) -> None:
+        """Validate and apply all staged actions, the futures returned by `stage` will be resolved.
+
+        Args:
+            update (Callable[[Action], ActiveObservation | ErrorActiveObservation]): function that applies a single action (typically `Ambient.__update__`).
+        """
+        staged, self._staged = self._staged, []
+        ordered = _order(staged)
+        self._staged = [x for x in ordered if not isinstance(x[0], TransactionAction)]
+        super().commit(update)
+        accepted = []
+        read, written = set(), set()
+        for action, future in ordered:
+            if not isinstance(action, TransactionAction):
+                continue
+            keys = self._conflicts(action, read, written)
+            if keys:
+                conflict = ActionConflict(f"Action conflicts on keys: {keys}")
+                future.set_result(
+                    ConflictObservation.from_exception(action, conflict, keys)
+                )
+            else:
+                read.update(action.reads.keys())
+                written.update(action.writes)
+                accepted.append((action, future))
+
+        def _apply(action: TransactionAction, future: Future):
+            try:
+                with self._state.lock(action.writes):
+                    future.set_result(update(action))
+            except Exception as e:
+                future.set_exception(e)
+
+        if self._executor is None:
+            for action, future in accepted:
+                _apply(action, future)
+        else:
+            list(self._executor.map(lambda x: _apply(*x), accepted))
+
+    def close(self) -> None:  # noqa: D102
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _conflicts(
+        self, action: TransactionAction, read: set[Any], written: set[Any]
+    ) -> list[Any]:
+        keys = self._state.stale(action.reads)
+        keys.extend(key for key in action.reads if key in written)
+        keys.extend(key for key in action.writes if key in written or key in read)
+        return list(dict.fromkeys(keys))
+
+
+def _order(staged: list[tuple[Action, Future]]) -> list[tuple[Action, Future]]:
+    # order deterministically by source, then by the order that each source staged its actions
+    counts: dict[Any, int] = dict()
+    ordered = []
+    for action, future in staged:
+        index = counts.get(action.source, 0)
+        counts[action.source] = index + 1
+        ordered.append(((action.source or 0, index), action, future))
+    ordered.sort(key=lambda x: x[0])
+    return [(action, future) for _, action, future in ordered]
+
+
+def _retarget(result: Any, action: Action) -> Any:
+    # the observation of a merged action is delivered to each of the staged actions
+    if isinstance(result, ActiveObservation) and result.action_id != action.id:
+        return result.model_copy(update={"action_id": action.id})
+    return result
@@ -0,0 +1,78 @@
+"""Module defines the `DeltaTracker` class which allows an `Ambient` to answer `DeltaSelect` actions, see class documentation for details."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ..event import DeltaSelect, DeltaObservation
+from .versioned import VersionedState
+
+__all__ = ("DeltaTracker",)
+
+
+class DeltaTracker:
+    """Tracks the version of a `VersionedState` that each source (typically a `DeltaSensor`) has observed, so that each `DeltaSelect` is answered with only the changes since the previous one. The size of each observation (and so the cost of serializing it) is proportional to the number of changes rather than to the size of the state.
+
+    Example:
+    ```
+    class MyAmbient(Ambient):
+        def __init__(self, agents):
+            super().__init__(agents)
+            self.state = VersionedState()
+            self.deltas = DeltaTracker(self.state)
+
+        def __select__(self, action):
+            if isinstance(action, DeltaSelect):
+                return self.deltas.select(action)
+            ...
+    ```
+    """
+
+    def __init__(self, state: VersionedState):
+        """Constructor.
+
+        Args:
+            state (VersionedState): the state to track.
+        """
+        super().__init__()
+        self._state = state
+        self._versions: dict[int, int] = dict()  # source -> version
+        self._queries: dict[int, list[Any] | None] = dict()  # source -> keys
+
+    def select(self, action: DeltaSelect) -> DeltaObservation:
+        """Get the changes to the state since the previous `DeltaSelect` from the same source.
+
+        Args:
+            action (DeltaSelect): the action.
+
+        Returns:
+            DeltaObservation: the changes.
+        """
+        source = action.source
+        if action.keys is not None:
+            if self._queries.get(source, None) != action.keys:
+                # the query changed, the source needs the full state for the new keys
+                self._versions.pop(source, None)
+            self._queries[source] = action.keys
+        since = 0 if action.reset else self._versions.get(source, 0)
+        changed, removed, version = self._state.changes(
+            since, keys=self._queries.get(source, None)
+        )
+        self._versions[source] = version
+        return DeltaObservation(
+            action_id=action,
+            changed=changed,
+            removed=[] if since == 0 else removed,
+            since=since,
+            version=version,
+            full=since == 0,
+        )
+
+    def forget(self, source: int) -> None:
+        """Forget the version and query of a source, the next `DeltaSelect` from the source will receive the full state.
+
+        Args:
+            source (int): the source.
+        """
+        self._versions.pop(source, None)
+        self._queries.pop(source, None)
@@ -0,0 +1,257 @@
+"""Module defines the `EntityStore` class, a columnar (struct-of-arrays) store for the entities of an `Ambient`, see class documentation for details."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+import numpy as np
+
+__all__ = ("EntityStore",)
+
+
+class EntityStore:
+    """A columnar store for entities and their components. Each component is held in a single `numpy` array (a column) with one row per entity, rather than as attributes of many small python objects.
+
+    Entities are identified by their row in the store. Rows of destroyed entities are kept in a free list and are reused by new entities, the store grows (doubling its capacity) when it runs out of rows.
+
+    Queries and writes are vectorized, they operate on arrays of entity ids rather than on individual entities. This makes the store well suited for use in the `__select__` and `__update__` methods of an `Ambient`.
+
+    Example:
+    ```
+    store = EntityStore({"position": (np.float32, (2,)), "health": np.int16})
+    ids = store.create_many(100, health=10)
+    store.write(ids[:10], position=np.random.rand(10, 2))
+    # ids of entities with low health
+    weak = store.filter(lambda c: c["health"] < 5)
+    positions = store.gather(weak, "position")["position"]
+    ```
+    """
+
+    def __init__(
+        self,
+        components: Mapping[str, Any] | None = None,
+        capacity: int = 1024,
+    ):
+        """Constructor.
+
+        Args:
+            components (Mapping[str, Any], optional): component name -> dtype, or component name -> (dtype, shape) for components that have a shape (e.g. a position vector). Defaults to None.
+            capacity (int, optional): initial number of rows. Defaults to 1024.
+        """
+        super().__init__()
+        self._capacity = max(1, capacity)
+        self._columns: dict[str, np.ndarray] = dict()
+        self._defaults: dict[str, Any] = dict()
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._free: list[int] = []  # rows that have been freed
+        self._top = 0  # rows >= top have never been used
+        self._count = 0
+        for name, spec in (components or {}).items():
+            if isinstance(spec, tuple):
+                self.add_component(name, *spec)
+            else:
+                self.add_component(name, spec)
+
+    @property
+    def capacity(self) -> int:
+        """The number of rows currently allocated.
+
+        Returns:
+            int: the capacity.
+        """
+        return self._capacity
+
+    @property
+    def components(self) -> list[str]:
+        """The names of the components in this store.
+
+        Returns:
+            list[str]: the component names.
+        """
+        return list(self._columns.keys())
+
+    def __len__(self) -> int:  # noqa: D105
+        return self._count
+
+    def __contains__(self, entity: int) -> bool:  # noqa: D105
+        return 0 <= entity < self._capacity and bool(self._alive[entity])
+
+    def add_component(
+        self, name: str, dtype: Any, shape: tuple[int, ...] = (), default: Any = 0
+    ) -> None:
+        """Add a new component (column) to this store, the component will be set to `default` for all existing entities.
+
+        Args:
+            name (str): the name of the component.
+            dtype (Any): the numpy dtype of the component.
+            shape (tuple[int, ...], optional): the shape of the component for a single entity. Defaults to () (a scalar).
+            default (Any, optional): the default value of the component. Defaults to 0.
+
+        Raises:
+            ValueError: if the component already exists.
+        """
+        if name in self._columns:
+            raise ValueError(f"Component: {name} already exists.")
+        column = np.empty((self._capacity, *shape), dtype=dtype)
+        column[...] = default
+        self._columns[name] = column
+        self._defaults[name] = default
+
+    def column(self, name: str) -> np.ndarray:
+        """Get the column of a component. The column has one row per allocated row in the store (see `capacity`), including rows that are not in use (see `alive`).
+
+        Args:
+            name (str): the name of the component.
+
+        Returns:
+            np.ndarray: the column (this is not a copy).
+        """
+        return self._columns[name]
+
+    def alive(self) -> np.ndarray:
+        """Get a mask of the rows that are in use.
+
+        Returns:
+            np.ndarray: boolean mask with one entry per row.
+        """
+        return self._alive
+
+    def entities(self) -> np.ndarray:
+        """Get the ids of all entities in the store.
+
+        Returns:
+            np.ndarray: the entity ids.
+        """
+        return np.flatnonzero(self._alive)
+
+    def create(self, **values: Any) -> int:
+        """Create a new entity.
+
+        Args:
+            values (dict[str, Any]): initial component values, components that are not given will be set to their default value.
+
+        Returns:
+            int: the id of the new entity.
+        """
+        return int(self.create_many(1, **values)[0])
+
+    def create_many(self, n: int, **values: Any) -> np.ndarray:
+        """Create `n` new entities.
+
+        Args:
+            n (int): the number of entities to create.
+            values (dict[str, Any]): initial component values, these will be broadcast over the new entities. Components that are not given will be set to their default value.
+
+        Returns:
+            np.ndarray: the ids of the new entities.
+        """
+        reused = min(n, len(self._free))
+        ids = [self._free.pop() for _ in range(reused)]
+        fresh = n - reused
+        if self._top + fresh > self._capacity:
+            self._grow(self._top + fresh)
+        ids = np.concatenate(
+            [np.array(ids, dtype=np.intp), np.arange(self._top, self._top + fresh)]
+        )
+        self._top += fresh
+        self._alive[ids] = True
+        self._count += n
+        for name, column in self._columns.items():
+            column[ids] = values.get(name, self._defaults[name])
+        return ids
+
+    def destroy(self, ids: int | Iterable[int]) -> None:
+        """Destroy entities, their rows will be reused by new entities.
+
+        Args:
+            ids (int | Iterable[int]): the ids of the entities to destroy.
+
+        Raises:
+            KeyError: if any of the entities do not exist.
+        """
+        ids = np.unique(np.atleast_1d(np.asarray(ids, dtype=np.intp)))
+        self._check(ids)
+        self._alive[ids] = False
+        self._count -= len(ids)
+        self._free.extend(ids.tolist())
+
+    def gather(self, ids: int | Iterable[int], *names: str) -> dict[str, np.ndarray]:
+        """Get component values for the given entities.
+
+        Args:
+            ids (int | Iterable[int]): the ids of the entities.
+            names (str): the components to get, defaults to all components.
+
+        Returns:
+            dict[str, np.ndarray]: component name -> values (one row per entity, these are copies).
+
+        Raises:
+            KeyError: if any of the entities do not exist.
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        self._check(np.atleast_1d(ids))
+        names = names or self._columns.keys()
+        return {name: self._columns[name][ids] for name in names}
+
+    def write(self, ids: int | Iterable[int], **values: Any) -> None:
+        """Write component values for the given entities, values are broadcast over the entities.
+
+        Args:
+            ids (int | Iterable[int]): the ids of the entities.
+            values (dict[str, Any]): component name -> values.
+
+        Raises:
+            KeyError: if any of the entities do not exist.
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        self._check(np.atleast_1d(ids))
+        for name, value in values.items():
+            self._columns[name][ids] = value
+
+    def filter(
+        self,
+        predicate: Callable[[dict[str, np.ndarray]], np.ndarray],
+        ids: Iterable[int] | None = None,
+    ) -> np.ndarray:
+        """Get the ids of the entities that satisfy a (vectorized) predicate.
+
+        Args:
+            predicate (Callable[[dict[str, np.ndarray]], np.ndarray]): function that takes a mapping of component name -> column and returns a boolean mask, e.g. `lambda c: c["health"] > 0`.
+            ids (Iterable[int], optional): entities to filter, those that do not exist are filtered out. Defaults to None, in which case all entities are filtered.
+
+        Returns:
+            np.ndarray: the ids of the entities that satisfy the predicate.
+        """
+        if ids is None:
+            mask = np.asarray(predicate(self._columns), dtype=bool) & self._alive
+            return np.flatnonzero(mask)
+        ids = np.asarray(ids, dtype=np.intp)
+        ids = ids[self._valid(ids)]
+        mask = np.asarray(predicate(self.gather(ids)), dtype=bool)
+        return ids[mask]
+
+    def _check(self, ids: np.ndarray) -> None:
+        if len(ids) and (
+            ids.min() < 0 or ids.max() >= self._capacity or not self._alive[ids].all()
+        ):
+            raise KeyError(f"Entities do not exist: {ids[~self._valid(ids)]}")
+
+    def _valid(self, ids: np.ndarray) -> np.ndarray:
+        valid = (ids >= 0) & (ids < self._capacity)
+        valid[valid] = self._alive[ids[valid]]
+        return valid
+
+    def _grow(self, required: int) -> None:
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty((capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[: self._capacity] = column
+            grown[self._capacity :] = self._defaults[name]
+            self._columns[name] = grown
+        self._alive = np.concatenate(
+            [self._alive, np.zeros(capacity - self._capacity, dtype=bool)]
+        )
+        self._capacity = capacity
@@ -7,18 +7,25 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 import asyncio
-from .ambient import Ambient, _Ambient
+from .ambient import Ambient, _Ambient, _AmbientRecorded
 from ..utils import _Future, _LOGGER
 
 if TYPE_CHECKING:
     from ..agent import _Agent
+    from .recorder import ArrowRecorder
 
 
 class Environment:
     """The environment is the container in which the simulation runs and is the simulation entry point. It manages the execution of agents, and has a state (the `Ambient`) which agents read and mutate."""
 
     def __init__(
-        self, ambient: Ambient, sync: bool = True, wait: float = 0.05, **kwargs
+        self,
+        ambient: Ambient,
+        sync: bool = True,
+        wait: float = 0.05,
+        concurrency: int | None = None,
+        recorder: ArrowRecorder | None = None,
+        **kwargs,
     ):
         """Constructor.
 
@@ -26,11 +33,16 @@ class Environment:
             ambient (Ambient): the state of the environment.
             sync (bool, optional): whether to run the agents synchronously or not. Under the default schedule, if True this means that each cycle method will be gathered together for all agents - i.e. all agents will `__sense__` then `__cycle__` then `__execute__`. If False, then these methods will execute in not particular order, however there will always be a sync point at the start of each cycle.
             wait (float, optional): time to wait between cycles, this leaves room for other async operations if required. Defaults to 0.05.
+            concurrency (int, optional): maximum number of actions that will be executed concurrently if the `ambient` declares `async` methods. Defaults to None (16).
+            recorder (ArrowRecorder, optional): records every action that agents send to the `ambient` and every resulting observation, it is closed when the simulation ends (see `run`), this completes the recorded files. Defaults to None.
             **kwargs (dict[str,Any], optional): optional additional arguments.
         """
         super().__init__()
         self._wait = wait
-        self._ambient = _Ambient.new(ambient)
+        self._ambient = _Ambient.new(ambient, concurrency=concurrency)
+        self._recorder = recorder
+        if recorder is not None:
+            self._ambient = _AmbientRecorded(self._ambient, recorder)
         self._step = self._step_sync if sync else self._step_async
         self._cycle = 0
 
@@ -70,7 +82,11 @@ class Environment:
             while pending:
                 pending = await _run_wait(pending)
 
-        asyncio.run(_run())
+        try:
+            asyncio.run(_run())
+        finally:
+            if self._recorder is not None:
+                self._recorder.close()
 
     async def __initialise__(self, event_loop: asyncio.AbstractEventLoop):
         """Initialise this environment. Override this for custom initialisation.
@@ -109,15 +125,18 @@ class Environment:
         return self._ambient.is_alive
 
     async def _step_sync(self, agents: list[_Agent]) -> None:
-        """Step all agents with sync points after `__sense__`, `__cycle__`, `__execute__`."""
+        """Step all agents with sync points after `__sense__`, `__cycle__`, `__execute__`. Pending sense actions are completed before `__cycle__`, staged update actions are committed at the end of the step."""
         await _Future.gather([agent.__sense__(self._ambient) for agent in agents])
+        await self._ambient.__commit__()
         await _Future.gather([agent.__cycle__() for agent in agents])
         await _Future.gather([agent.__execute__(self._ambient) for agent in agents])
+        await self._ambient.__commit__()
 
     async def _step_async(self, agents: list[_Agent]) -> None:
-        """Step all agents with a sync point at the end of each cycle."""
+        """Step all agents with a sync point at the end of each cycle. Staged update actions are committed at the end of the step."""
         futures = []
         futures.extend([agent.__sense__(self._ambient) for agent in agents])
         futures.extend([agent.__cycle__() for agent in agents])
         futures.extend([agent.__execute__(self._ambient) for agent in agents])
         await _Future.gather(futures)
+        await self._ambient.__commit__()
@@ -0,0 +1,358 @@
+"""Module defines the `ArrowRecorder` class, which streams the events of a simulation (actions, observations and published events) to columnar Parquet files, see class documentation for details. This module requires the optional dependency `pyarrow`."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import types
+import typing
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from pydantic_core import to_json
+
+from ..event import Event
+from ..event.lazy_event import _eager_type
+from ..event.registry import event_tag
+from ..pubsub import Subscriber
+
+__all__ = ("ArrowRecorder",)
+
+# marks the end of the stream in the write queue
+_CLOSE = object()
+# metadata of columns whose values are held as JSON
+_JSON = {"encoding": "json"}
+# metadata of the columns that hold the `source` of an event, see `Component.set_event_source`
+_SOURCE_COMPONENT = {"encoding": "source_component"}
+_SOURCE_AGENT = {"encoding": "source_agent"}
+_UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class ArrowRecorder(Subscriber):
+    """Records events to Parquet files, one file (and schema) per event type. The schema of each file is derived from the fields of the event type: numeric, boolean and string fields are held as columns of the corresponding type, coordinate pairs (e.g. `MouseMotionEvent.position`) as fixed size lists and all other fields (e.g. `Observation.value`) as JSON strings. The `source` of an event is a 128-bit value (see `Component.set_event_source`), it is held as two uint64 columns `source_component` (the high 64 bits) and `source_agent` (the low 64 bits).
+
+    A recorder is typically given to an `Environment`, in which case every action that agents send to the `Ambient` (via `__select__`, `__update__` and `__subscribe__`) and every observation that results is recorded. Observations that complete later (e.g. staged or async actions) are recorded when they complete. A recorder is also a `Subscriber`, it may be subscribed to a `Publisher` to record published events, e.g. `publisher.subscribe(Event, recorder)`.
+
+    Events are recorded as they are, nothing is fetched or formatted on their behalf: the `value` of a lazy observation (see `lazy`) is recorded only if it has already been fetched (otherwise it is null), and the `traceback_message` of an error observation only if its traceback has already been formatted (otherwise it is the exception type and message). Lazy observations are written to the same file as their eager type.
+
+    Recording is cheap, events are appended to a buffer for their type. Full buffers are converted to Arrow record batches and written by a background thread. At most `max_pending` buffers are waiting to be written at any time, if the writer falls behind then recording blocks until there is room (or the buffer is dropped, see `block`).
+
+    Example:
+    ```
+    with ArrowRecorder("recording") as recorder:
+        Environment(ambient, recorder=recorder).run()
+    table = pyarrow.parquet.read_table(recorder.paths()[MyAction])
+    ```
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        batch_size: int = 8192,
+        max_pending: int = 16,
+        flush_interval: float | None = 1.0,
+        block: bool = True,
+        compression: str = "zstd",
+    ):
+        """Constructor.
+
+        Args:
+            directory (str | Path): directory in which the Parquet files are written, it is created if it does not exist.
+            batch_size (int, optional): number of events of a type that are buffered before they are written as a record batch. Defaults to 8192.
+            max_pending (int, optional): maximum number of record batches that are waiting to be written. Defaults to 16.
+            flush_interval (float | None, optional): time (seconds) after which partially filled buffers are written, if None they are only written when they are full or when `flush` is called. Defaults to 1.0.
+            block (bool, optional): whether recording blocks when `max_pending` batches are waiting to be written, if False the batch is dropped instead (see `dropped`). Defaults to True.
+            compression (str, optional): Parquet compression codec. Defaults to "zstd".
+
+        Raises:
+            ImportError: if `pyarrow` is not installed.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "`ArrowRecorder` requires `pyarrow`, install it with: `pip install pyarrow`"
+            ) from None
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._block = block
+        self._compression = compression
+        self._buffers: dict[type, list[Event]] = dict()
+        self._buffers_lock = threading.Lock()
+        self._write_lock = threading.Lock()  # held by the writer thread while writing
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._writers: dict[type, Any] = dict()  # event type -> `ParquetWriter`
+        self._schemas: dict[type, Any] = dict()  # event type -> `pyarrow.Schema`
+        self._paths: dict[type, Path] = dict()
+        self._recorded = 0
+        self._dropped = 0
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="ArrowRecorder", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def recorded(self) -> int:
+        """The number of events that have been recorded (not all of them may have been written yet).
+
+        Returns:
+            int: the number of recorded events.
+        """
+        return self._recorded
+
+    @property
+    def dropped(self) -> int:
+        """The number of events that were dropped because the writer fell behind (see `block`).
+
+        Returns:
+            int: the number of dropped events.
+        """
+        return self._dropped
+
+    def record(self, event: Event) -> None:
+        """Record an event.
+
+        Args:
+            event (Event): the event.
+
+        Raises:
+            RuntimeError: if this recorder has been closed.
+        """
+        self._check()
+        # lazy observations are recorded with their eager counterparts (see `lazy`)
+        event_type = _recorded_type(type(event))
+        with self._buffers_lock:
+            self._recorded += 1
+            buffer = self._buffers.get(event_type)
+            if buffer is None:
+                buffer = self._buffers[event_type] = []
+            buffer.append(event)
+            if len(buffer) < self._batch_size:
+                return
+            del self._buffers[event_type]
+        self._put(event_type, buffer)
+
+    def record_all(self, events: Iterable[Any]) -> None:
+        """Record events, values that are not events (e.g. None) are ignored.
+
+        Args:
+            events (Iterable[Any]): the events.
+        """
+        for event in events:
+            if isinstance(event, Event):
+                self.record(event)
+
+    def __notify__(self, message: Any) -> None:  # noqa: D105
+        if isinstance(message, Event):
+            self.record(message)
+
+    def flush(self) -> None:
+        """Write all buffered events and wait until they have been written. Note that the Parquet files are only complete (readable) once this recorder is closed (see `close`).
+
+        Raises:
+            RuntimeError: if an error occurred in the writer.
+        """
+        self._check()
+        self._put_buffered()
+        self._queue.join()
+        with self._write_lock:
+            pass  # partially filled buffers may be being written (see `_run`)
+        self._check()
+
+    def close(self) -> None:
+        """Write all buffered events and close the Parquet files, events that are recorded after this call are rejected.
+
+        Raises:
+            RuntimeError: if an error occurred in the writer.
+        """
+        if self._closed:
+            return
+        self._put_buffered()
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("Failed to write recorded events.") from self._error
+
+    def paths(self) -> dict[type[Event], Path]:
+        """Get the paths of the Parquet files that have been written.
+
+        Returns:
+            dict[type[Event], Path]: event type -> path.
+        """
+        return dict(self._paths)
+
+    def __enter__(self) -> ArrowRecorder:  # noqa: D105
+        return self
+
+    def __exit__(self, *_) -> None:  # noqa: D105
+        self.close()
+
+    def _check(self) -> None:
+        if self._closed:
+            raise RuntimeError("Recorder is closed.")
+        if self._error is not None:
+            raise RuntimeError("Failed to write recorded events.") from self._error
+
+    def _put(self, event_type: type, events: list[Event]) -> None:
+        if self._block:
+            self._queue.put((event_type, events))
+            return
+        try:
+            self._queue.put_nowait((event_type, events))
+        except queue.Full:
+            with self._buffers_lock:
+                self._dropped += len(events)
+
+    def _put_buffered(self) -> None:
+        with self._buffers_lock:
+            buffers, self._buffers = self._buffers, dict()
+        for event_type, events in buffers.items():
+            self._put(event_type, events)
+
+    def _run(self) -> None:
+        # the writer thread
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                # partially filled buffers are written directly, the queue may be full
+                with self._write_lock:
+                    with self._buffers_lock:
+                        buffers, self._buffers = self._buffers, dict()
+                    for item in buffers.items():
+                        self._try_write(item)
+                continue
+            try:
+                if item is _CLOSE:
+                    break
+                with self._write_lock:
+                    self._try_write(item)
+            finally:
+                self._queue.task_done()
+        for writer in self._writers.values():
+            try:
+                writer.close()
+            except Exception as e:
+                self._error = self._error or e
+
+    def _try_write(self, item: tuple[type[Event], list[Event]]) -> None:
+        if self._error is not None:
+            return  # the error is raised on the next call to `record`
+        try:
+            self._write(*item)
+        except Exception as e:
+            self._error = e
+
+    def _write(self, event_type: type[Event], events: list[Event]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = self._writers.get(event_type)
+        if writer is None:
+            schema = _schema(event_type)
+            path = self._directory / f"{_name(event_type)}.parquet"
+            # types that are not registered share the tag of their parent type
+            used = {*self._paths.values()}
+            suffix = 1
+            while path in used:
+                suffix += 1
+                path = self._directory / f"{_name(event_type)}-{suffix}.parquet"
+            writer = pq.ParquetWriter(path, schema, compression=self._compression)
+            self._writers[event_type] = writer
+            self._schemas[event_type] = schema
+            self._paths[event_type] = path
+        schema = self._schemas[event_type]
+        columns = {field.name: _column(events, field) for field in schema}
+        writer.write_batch(pa.RecordBatch.from_pydict(columns, schema))
+
+
+_recorded_type = cache(_eager_type)
+
+
+def _name(event_type: type[Event]) -> str:
+    # file name of an event type, the tag distinguishes types with the same name
+    return f"{event_type.__name__}-{event_tag(event_type):08x}"
+
+
+def _schema(event_type: type[Event]):
+    import pyarrow as pa
+
+    fields = []
+    for name, field in event_type.model_fields.items():
+        if name == "source":
+            # the source does not fit in 64 bits, see `Component.set_event_source`
+            fields.append(
+                pa.field("source_component", pa.uint64(), metadata=_SOURCE_COMPONENT)
+            )
+            fields.append(pa.field("source_agent", pa.uint64(), metadata=_SOURCE_AGENT))
+            continue
+        arrow_type = _arrow_type(field.annotation)
+        if arrow_type is None:
+            fields.append(pa.field(name, pa.string(), metadata=_JSON))
+        else:
+            fields.append(pa.field(name, arrow_type))
+    metadata = {
+        "event_type": f"{event_type.__module__}.{event_type.__qualname__}",
+        "event_tag": str(event_tag(event_type)),
+    }
+    return pa.schema(fields, metadata=metadata)
+
+
+def _arrow_type(annotation: Any):
+    # None if values of this type are held as JSON
+    import pyarrow as pa
+
+    scalars = {int: pa.int64(), float: pa.float64(), bool: pa.bool_(), str: pa.string()}
+    if annotation in scalars:
+        return scalars[annotation]
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        # optional fields are nullable, e.g. `source: int | None`
+        args = tuple(arg for arg in args if arg is not type(None))
+        if len(args) == 1:
+            return _arrow_type(args[0])
+        pairs = [_pair_type(arg) for arg in args]
+        if all(pairs):
+            float_pair = any(pair is float for pair in pairs)
+            return pa.list_(pa.float64() if float_pair else pa.int64(), 2)
+    elif _pair_type(annotation):
+        return pa.list_(scalars[_pair_type(annotation)], 2)
+    return None
+
+
+def _pair_type(annotation: Any) -> type | None:
+    args = typing.get_args(annotation)
+    if (
+        typing.get_origin(annotation) is tuple
+        and len(args) == 2
+        and args[0] is args[1]
+        and args[0] in (int, float)
+    ):
+        return args[0]
+    return None
+
+
+def _encoding(field: Any) -> bytes | None:
+    return field.metadata.get(b"encoding") if field.metadata else None
+
+
+def _column(events: list[Event], field: Any) -> list:
+    # values are not fetched or formatted here, e.g. the value of a lazy observation is only recorded if it has been fetched
+    encoding = _encoding(field)
+    if encoding == b"source_component":
+        values = [event.__dict__.get("source") for event in events]
+        return [None if value is None else value >> 64 for value in values]
+    elif encoding == b"source_agent":
+        values = [event.__dict__.get("source") for event in events]
+        return [None if value is None else value & _UINT64_MASK for value in values]
+    values = [event.__dict__.get(field.name) for event in events]
+    if encoding == b"json":
+        return [to_json(value, fallback=repr).decode() for value in values]
+    return values
@@ -0,0 +1,253 @@
+"""Module defines the `SharedArrayState` class, a container for large numeric state (grids, images, etc.) that is held in shared memory so that it can be observed by agents that run in other processes without being copied, see class documentation for details."""
+
+from __future__ import annotations
+
+import atexit
+import sys
+import threading
+import weakref
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from ..utils import int64_uuid
+
+__all__ = ("SharedArrayState", "SharedArrayHandle")
+
+# shared memory blocks that were created in this process (see `SharedArrayState.create`): name -> block
+_CREATED: dict[str, SharedMemory] = dict()
+# shared memory blocks that were created by another process and are attached in this process: name -> block
+_ATTACHED: dict[str, SharedMemory] = dict()
+# number of live views of the attached blocks (see `SharedArrayHandle.open`), a block must not be closed while they are in use: name -> count
+_VIEWS: dict[str, int] = dict()
+# re-entrant, views may be released (see `_release_view`) by garbage collection while the lock is held
+_ATTACHED_LOCK = threading.RLock()
+
+
+class SharedArrayHandle(BaseModel):
+    """A lightweight handle to an array in a `SharedArrayState`. Handles are small and cheap to serialize, they are typically returned as the value of an observation in place of the array itself. The array can then be viewed (without a copy) in any process on the same machine via `open`.
+
+    Attributes:
+        name (str): the name of the shared memory block that holds the array.
+        shape (tuple[int, ...]): the shape of the array.
+        dtype (str): the dtype of the array.
+        version (int): the version of the array at the time that this handle was created, this is increased each time the array is written.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+    version: int = 0
+
+    def open(self) -> np.ndarray:
+        """Get a read-only view of the array. The shared memory block is attached once per process, subsequent calls are cheap.
+
+        Note that the view is of the current contents of the array, which may have been written since this handle was created (see `version`).
+
+        Returns:
+            np.ndarray: read-only view of the array.
+        """
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=_attach(self.name).buf)
+        array.flags.writeable = False
+        with _ATTACHED_LOCK:
+            if self.name in _ATTACHED:
+                _VIEWS[self.name] = _VIEWS.get(self.name, 0) + 1
+                # views that are alive at exit keep the block attached
+                weakref.finalize(array, _release_view, self.name).atexit = False
+        return array
+
+    def close(self) -> None:
+        """Detach the shared memory block from this process, it is attached again by the next call to `open`. The block stays attached while any views of the array (see `open`) are held, it is detached by a later call to `close` or when the process exits. This has no effect in the process that owns the array (see `SharedArrayState.close`)."""
+        _detach(self.name)
+
+
+class SharedArrayState:
+    """A container for named numeric arrays that are held in shared memory (`multiprocessing.shared_memory`). It is intended for use in an `Ambient` whose agents run in worker processes.
+
+    The ambient owns the arrays and writes to them via `write` (or in place via `array` followed by `touch`), each write increases the arrays version. In `__select__`, the ambient returns a `SharedArrayHandle` (see `handle`) rather than the array, and the agents sensor views the array via `SharedArrayHandle.open`. This avoids serializing and copying large arrays on every observation.
+
+    Example:
+    ```
+    state = SharedArrayState()
+    state.create("grid", (1024, 1024), np.uint8)
+    state.write("grid", 1, index=(slice(0, 10), slice(0, 10)))
+    # in __select__
+    return ActiveObservation(action_id=action, value=state.handle("grid"))
+    # in the sensor (possibly in another process)
+    grid = observation.value.open()
+    ```
+
+    Arrays must be released via `close` when they are no longer needed, this will release the shared memory.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        super().__init__()
+        self._blocks: dict[str, SharedMemory] = dict()
+        self._arrays: dict[str, np.ndarray] = dict()
+        self._versions: dict[str, int] = dict()
+
+    def __contains__(self, name: str) -> bool:  # noqa: D105
+        return name in self._arrays
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._arrays)
+
+    def create(
+        self, name: str, shape: tuple[int, ...], dtype: Any, fill: Any = 0
+    ) -> np.ndarray:
+        """Create a new shared array.
+
+        Args:
+            name (str): the name of the array.
+            shape (tuple[int, ...]): the shape of the array.
+            dtype (Any): the numpy dtype of the array.
+            fill (Any, optional): the initial value of the array. Defaults to 0.
+
+        Raises:
+            ValueError: if an array with this name already exists.
+
+        Returns:
+            np.ndarray: writable view of the array.
+        """
+        if name in self._arrays:
+            raise ValueError(f"Array: {name} already exists.")
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        block = SharedMemory(name=f"demistar_{int64_uuid()}", create=True, size=size)
+        with _ATTACHED_LOCK:
+            _CREATED[block.name] = block
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array[...] = fill
+        self._blocks[name] = block
+        self._arrays[name] = array
+        self._versions[name] = 0
+        return array
+
+    def array(self, name: str) -> np.ndarray:
+        """Get a writable view of an array. If the array is modified in place, `touch` should be called to increase its version.
+
+        Args:
+            name (str): the name of the array.
+
+        Returns:
+            np.ndarray: writable view of the array.
+        """
+        return self._arrays[name]
+
+    def version(self, name: str) -> int:
+        """Get the version of an array.
+
+        Args:
+            name (str): the name of the array.
+
+        Returns:
+            int: the version.
+        """
+        return self._versions[name]
+
+    def write(self, name: str, value: Any, index: Any = Ellipsis) -> int:
+        """Write to an array.
+
+        Args:
+            name (str): the name of the array.
+            value (Any): the value to write, this is broadcast over the indexed elements.
+            index (Any, optional): numpy index of the elements to write. Defaults to all elements.
+
+        Returns:
+            int: the new version of the array.
+        """
+        self._arrays[name][index] = value
+        return self.touch(name)
+
+    def touch(self, name: str) -> int:
+        """Increase the version of an array, this should be called after the array has been modified in place.
+
+        Args:
+            name (str): the name of the array.
+
+        Returns:
+            int: the new version of the array.
+        """
+        self._versions[name] += 1
+        return self._versions[name]
+
+    def handle(self, name: str) -> SharedArrayHandle:
+        """Get a handle to an array, see `SharedArrayHandle`.
+
+        Args:
+            name (str): the name of the array.
+
+        Returns:
+            SharedArrayHandle: the handle.
+        """
+        array = self._arrays[name]
+        return SharedArrayHandle(
+            name=self._blocks[name].name,
+            shape=array.shape,
+            dtype=array.dtype.str,
+            version=self._versions[name],
+        )
+
+    def close(self, name: str | None = None) -> None:
+        """Release an array (or all arrays), the shared memory is released once all processes have closed their views.
+
+        Args:
+            name (str, optional): the name of the array. Defaults to None, in which case all arrays are released.
+        """
+        names = list(self._arrays) if name is None else [name]
+        for name in names:
+            block = self._blocks.pop(name)
+            del self._arrays[name]
+            del self._versions[name]
+            with _ATTACHED_LOCK:
+                _CREATED.pop(block.name, None)
+            try:
+                block.close()
+            except BufferError:
+                pass  # views are still held, memory is released when they are collected
+            block.unlink()
+
+    def __enter__(self) -> SharedArrayState:  # noqa: D105
+        return self
+
+    def __exit__(self, *args) -> None:  # noqa: D105
+        self.close()
+
+
+def _attach(name: str) -> SharedMemory:
+    with _ATTACHED_LOCK:
+        block = _CREATED.get(name) or _ATTACHED.get(name)
+        if block is None:
+            if sys.version_info >= (3, 13):
+                block = SharedMemory(name=name, track=False)
+            else:
+                block = SharedMemory(name=name)
+                # the block is owned by the creating process, it must not be unlinked when this process exits
+                resource_tracker.unregister(block._name, "shared_memory")
+            _ATTACHED[name] = block
+        return block
+
+
+def _release_view(name: str) -> None:
+    with _ATTACHED_LOCK:
+        _VIEWS[name] -= 1
+
+
+def _detach(name: str) -> None:
+    with _ATTACHED_LOCK:
+        if name not in _ATTACHED or _VIEWS.get(name):
+            return  # not attached, or views are still held
+        _VIEWS.pop(name, None)
+        _ATTACHED.pop(name).close()
+
+
+@atexit.register
+def _detach_all() -> None:
+    for name in list(_ATTACHED):
+        _detach(name)
@@ -0,0 +1,412 @@
+"""Module defines spatial indexes that can be used by an `Ambient` to answer proximity queries (e.g. "entities within `r` of me") without comparing every pair of entities.
+
+Two implementations are provided:
+    - `GridIndex`: a uniform grid, entities are moved between cells incrementally. Best when entities are spread fairly evenly and queries have a similar radius to the cell size.
+    - `KDTreeIndex`: a k-d tree, it is rebuilt lazily on the first query after entities have moved (once per step in a typical simulation). Best for clustered entities or k-nearest neighbour queries.
+
+Both cache query results until the index is next modified, so that the `__select__` handlers of many agents that issue the same query in a step share a single result (results are read-only arrays, copy them before modifying). Batch versions of each query are also provided (see `query_range_many` and `query_knn_many`).
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Iterable
+
+import numpy as np
+
+__all__ = ("SpatialIndex", "GridIndex", "KDTreeIndex")
+
+
+class SpatialIndex(ABC):
+    """Base class for spatial indexes. Entities are identified by an integer id (e.g. an `EntityStore` entity id) and have a position with a fixed number of dimensions."""
+
+    def __init__(self, dimensions: int = 2, capacity: int = 1024):
+        """Constructor.
+
+        Args:
+            dimensions (int, optional): number of dimensions of entity positions. Defaults to 2.
+            capacity (int, optional): initial number of entities that can be held before the index grows. Defaults to 1024.
+        """
+        super().__init__()
+        self._dimensions = dimensions
+        self._positions = np.zeros((max(1, capacity), dimensions), dtype=np.float64)
+        self._ids = np.full(max(1, capacity), -1, dtype=np.int64)  # slot -> id
+        self._slots: dict[int, int] = dict()  # id -> slot
+        self._free: list[int] = []
+        self._top = 0
+        self._cache: dict[tuple, np.ndarray] = dict()
+
+    @property
+    def dimensions(self) -> int:
+        """The number of dimensions of entity positions.
+
+        Returns:
+            int: number of dimensions.
+        """
+        return self._dimensions
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._slots)
+
+    def __contains__(self, entity: int) -> bool:  # noqa: D105
+        return entity in self._slots
+
+    def position(self, entity: int) -> np.ndarray:
+        """Get the position of an entity.
+
+        Args:
+            entity (int): the entity id.
+
+        Returns:
+            np.ndarray: the position (a copy).
+        """
+        return self._positions[self._slots[entity]].copy()
+
+    def insert(self, entity: int, position: Iterable[float]) -> None:
+        """Insert an entity into the index.
+
+        Args:
+            entity (int): the entity id.
+            position (Iterable[float]): the position of the entity.
+
+        Raises:
+            ValueError: if the entity is already in the index.
+        """
+        if entity in self._slots:
+            raise ValueError(f"Entity: {entity} already exists in the index.")
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._top == len(self._ids):
+                self._grow()
+            slot = self._top
+            self._top += 1
+        self._slots[entity] = slot
+        self._ids[slot] = entity
+        self._positions[slot] = position
+        self._cache.clear()
+        self._on_insert(slot)
+
+    def insert_many(self, entities: Iterable[int], positions: np.ndarray) -> None:
+        """Insert many entities into the index.
+
+        Args:
+            entities (Iterable[int]): the entity ids.
+            positions (np.ndarray): the position of each entity.
+        """
+        for entity, position in zip(entities, np.asarray(positions)):
+            self.insert(int(entity), position)
+
+    def move(self, entity: int, position: Iterable[float]) -> None:
+        """Move an entity to a new position.
+
+        Args:
+            entity (int): the entity id.
+            position (Iterable[float]): the new position of the entity.
+        """
+        slot = self._slots[entity]
+        old = self._positions[slot].copy()
+        self._positions[slot] = position
+        self._cache.clear()
+        self._on_move(slot, old)
+
+    def move_many(self, entities: Iterable[int], positions: np.ndarray) -> None:
+        """Move many entities to new positions.
+
+        Args:
+            entities (Iterable[int]): the entity ids.
+            positions (np.ndarray): the new position of each entity.
+        """
+        for entity, position in zip(entities, np.asarray(positions)):
+            self.move(int(entity), position)
+
+    def remove(self, entity: int) -> None:
+        """Remove an entity from the index.
+
+        Args:
+            entity (int): the entity id.
+        """
+        slot = self._slots.pop(entity)
+        self._on_remove(slot)
+        self._ids[slot] = -1
+        self._free.append(slot)
+        self._cache.clear()
+
+    def query_range(self, center: Iterable[float], radius: float) -> np.ndarray:
+        """Get the entities that are within `radius` of `center`.
+
+        Args:
+            center (Iterable[float]): the center of the query.
+            radius (float): the radius of the query.
+
+        Returns:
+            np.ndarray: the ids of the entities, ordered by distance from the center (read-only, the result is shared by identical queries).
+        """
+        center = np.asarray(center, dtype=np.float64)
+        key = ("range", center.tobytes(), radius)
+        result = self._cache.get(key, None)
+        if result is None:
+            slots = np.asarray(self._range(center, radius), dtype=np.intp)
+            slots = slots[np.argsort(self._distances(center, slots), kind="stable")]
+            result = self._ids[slots]
+            result.flags.writeable = False
+            self._cache[key] = result
+        return result
+
+    def query_knn(self, center: Iterable[float], k: int) -> np.ndarray:
+        """Get the `k` entities that are nearest to `center`.
+
+        Args:
+            center (Iterable[float]): the center of the query.
+            k (int): the number of entities.
+
+        Returns:
+            np.ndarray: the ids of the entities, ordered by distance from the center (read-only, the result is shared by identical queries).
+        """
+        center = np.asarray(center, dtype=np.float64)
+        key = ("knn", center.tobytes(), k)
+        result = self._cache.get(key, None)
+        if result is None:
+            k = min(k, len(self))
+            if k == 0:
+                slots = np.zeros(0, dtype=np.intp)
+            elif k == len(self):
+                slots = np.fromiter(self._slots.values(), dtype=np.intp)
+            else:
+                slots = np.asarray(self._knn(center, k), dtype=np.intp)
+            distances = self._distances(center, slots)
+            slots = slots[np.argsort(distances, kind="stable")][:k]
+            result = self._ids[slots]
+            result.flags.writeable = False
+            self._cache[key] = result
+        return result
+
+    def query_range_many(self, centers: np.ndarray, radius: float) -> list[np.ndarray]:
+        """Batch version of `query_range`.
+
+        Args:
+            centers (np.ndarray): the centers of the queries.
+            radius (float): the radius of the queries.
+
+        Returns:
+            list[np.ndarray]: the result of each query.
+        """
+        return [self.query_range(center, radius) for center in np.asarray(centers)]
+
+    def query_knn_many(self, centers: np.ndarray, k: int) -> list[np.ndarray]:
+        """Batch version of `query_knn`.
+
+        Args:
+            centers (np.ndarray): the centers of the queries.
+            k (int): the number of entities for each query.
+
+        Returns:
+            list[np.ndarray]: the result of each query.
+        """
+        return [self.query_knn(center, k) for center in np.asarray(centers)]
+
+    def _distances(self, center: np.ndarray, slots: np.ndarray) -> np.ndarray:
+        return np.linalg.norm(self._positions[slots] - center, axis=1)
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._ids)
+        self._positions = np.concatenate(
+            [self._positions, np.zeros_like(self._positions)]
+        )[:capacity]
+        self._ids = np.concatenate(
+            [self._ids, np.full(capacity - len(self._ids), -1, dtype=np.int64)]
+        )
+
+    @abstractmethod
+    def _on_insert(self, slot: int) -> None:
+        pass
+
+    @abstractmethod
+    def _on_move(self, slot: int, old: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def _on_remove(self, slot: int) -> None:
+        pass
+
+    @abstractmethod
+    def _range(self, center: np.ndarray, radius: float) -> list[int]:
+        pass
+
+    @abstractmethod
+    def _knn(self, center: np.ndarray, k: int) -> list[int]:
+        # must return at least the k nearest slots (it may return more)
+        pass
+
+
+class GridIndex(SpatialIndex):
+    """A spatial index that places entities into the cells of a uniform grid. Moving an entity is O(1), it only touches the grid if the entity changes cell."""
+
+    def __init__(self, cell_size: float, dimensions: int = 2, capacity: int = 1024):
+        """Constructor.
+
+        Args:
+            cell_size (float): the size of each grid cell, this should be similar to the radius of typical range queries.
+            dimensions (int, optional): number of dimensions of entity positions. Defaults to 2.
+            capacity (int, optional): initial number of entities that can be held before the index grows. Defaults to 1024.
+        """
+        super().__init__(dimensions=dimensions, capacity=capacity)
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, ...], set[int]] = defaultdict(set)
+        self._cell_of: dict[int, tuple[int, ...]] = dict()  # slot -> cell
+
+    def _cell(self, position: np.ndarray) -> tuple[int, ...]:
+        return tuple(np.floor(position / self._cell_size).astype(np.int64).tolist())
+
+    def _on_insert(self, slot: int) -> None:
+        cell = self._cell(self._positions[slot])
+        self._cells[cell].add(slot)
+        self._cell_of[slot] = cell
+
+    def _on_move(self, slot: int, old: np.ndarray) -> None:
+        cell = self._cell(self._positions[slot])
+        if cell != self._cell_of[slot]:
+            self._on_remove(slot)
+            self._cells[cell].add(slot)
+            self._cell_of[slot] = cell
+
+    def _on_remove(self, slot: int) -> None:
+        cell = self._cell_of.pop(slot)
+        cell_slots = self._cells[cell]
+        cell_slots.discard(slot)
+        if not cell_slots:
+            del self._cells[cell]
+
+    def _candidates(self, lower: tuple[int, ...], upper: tuple[int, ...]) -> list[int]:
+        # all slots in the cells between lower and upper (inclusive)
+        volume = math.prod(hi - lo + 1 for lo, hi in zip(lower, upper))
+        if volume > len(self._cells):
+            # cheaper to scan the occupied cells
+            return [
+                slot
+                for cell, slots in self._cells.items()
+                if all(lo <= c <= hi for c, lo, hi in zip(cell, lower, upper))
+                for slot in slots
+            ]
+        ranges = np.stack(
+            np.meshgrid(*[np.arange(lo, hi + 1) for lo, hi in zip(lower, upper)]), -1
+        ).reshape(-1, len(lower))
+        result = []
+        for cell in map(tuple, ranges.tolist()):
+            result.extend(self._cells.get(cell, ()))
+        return result
+
+    def _range(self, center: np.ndarray, radius: float) -> list[int]:
+        lower = self._cell(center - radius)
+        upper = self._cell(center + radius)
+        slots = np.asarray(self._candidates(lower, upper), dtype=np.intp)
+        return slots[self._distances(center, slots) <= radius]
+
+    def _knn(self, center: np.ndarray, k: int) -> list[int]:
+        # search rings of cells around the center until the k-th nearest candidate is closer than the searched extent
+        origin = np.asarray(self._cell(center))
+        ring = 0
+        while True:
+            lower, upper = tuple(origin - ring), tuple(origin + ring)
+            slots = np.asarray(self._candidates(lower, upper), dtype=np.intp)
+            if len(slots) >= k:
+                kth = np.partition(self._distances(center, slots), k - 1)[k - 1]
+                if kth <= ring * self._cell_size:
+                    return slots
+                # one final search that covers the k-th distance
+                return self._range(center, kth)
+            ring += 1
+
+
+class KDTreeIndex(SpatialIndex):
+    """A spatial index that uses a k-d tree. Modifying the index is O(1), the tree is rebuilt (in O(n log n)) on the next query after the index was modified.
+
+    Any modification (including moving a single entity) marks the whole tree as stale, the tree is not updated incrementally. This suits a typical simulation step where entities are moved and then queried, but not one where moves and queries are interleaved (each query after a move pays for a full rebuild), use `GridIndex` in that case.
+    """
+
+    def __init__(self, dimensions: int = 2, capacity: int = 1024, leaf_size: int = 16):
+        """Constructor.
+
+        Args:
+            dimensions (int, optional): number of dimensions of entity positions. Defaults to 2.
+            capacity (int, optional): initial number of entities that can be held before the index grows. Defaults to 1024.
+            leaf_size (int, optional): maximum number of entities in a leaf of the tree. Defaults to 16.
+
+        Raises:
+            ValueError: if `leaf_size` is less than 1.
+        """
+        if leaf_size < 1:
+            raise ValueError(f"Leaf size must be at least 1, received: {leaf_size}")
+        super().__init__(dimensions=dimensions, capacity=capacity)
+        self._leaf_size = leaf_size
+        self._tree = None
+        self._dirty = True
+
+    def _on_insert(self, slot: int) -> None:
+        self._dirty = True
+
+    def _on_move(self, slot: int, old: np.ndarray) -> None:
+        self._dirty = True
+
+    def _on_remove(self, slot: int) -> None:
+        self._dirty = True
+
+    def _build(self):
+        if self._dirty:
+            slots = np.fromiter(self._slots.values(), dtype=np.intp)
+            self._tree = self._build_node(slots)
+            self._dirty = False
+        return self._tree
+
+    def _build_node(self, slots: np.ndarray):
+        if len(slots) <= self._leaf_size:
+            return slots
+        points = self._positions[slots]
+        axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        mid = len(slots) // 2
+        order = np.argpartition(points[:, axis], mid)
+        split = points[order[mid], axis]
+        return (
+            axis,
+            split,
+            self._build_node(slots[order[:mid]]),
+            self._build_node(slots[order[mid:]]),
+        )
+
+    def _range(self, center: np.ndarray, radius: float) -> list[int]:
+        result = []
+        stack = [self._build()]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, np.ndarray):
+                result.extend(node[self._distances(center, node) <= radius])
+                continue
+            axis, split, left, right = node
+            if center[axis] - radius <= split:
+                stack.append(left)
+            if center[axis] + radius >= split:
+                stack.append(right)
+        return result
+
+    def _knn(self, center: np.ndarray, k: int) -> list[int]:
+        heap = []  # max heap of (-distance, slot) holding the k nearest so far
+
+        def _search(node):
+            if isinstance(node, np.ndarray):
+                for slot, distance in zip(node, self._distances(center, node)):
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-distance, slot))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, slot))
+                return
+            axis, split, left, right = node
+            near, far = (left, right) if center[axis] <= split else (right, left)
+            _search(near)
+            if len(heap) < k or abs(center[axis] - split) <= -heap[0][0]:
+                _search(far)
+
+        _search(self._build())
+        return [slot for _, slot in heap]
@@ -0,0 +1,241 @@
+"""Module defines the `SQLiteAmbient` class, an `Ambient` whose state is persisted in a local SQLite database, see class documentation for details."""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TYPE_CHECKING
+
+from .ambient import Ambient
+
+if TYPE_CHECKING:
+    from ..agent import Agent
+
+__all__ = ("SQLiteAmbient",)
+
+
+class _ConnectionPool:
+    """A fixed size pool of SQLite connections. Connections may be used from any thread, but only by one thread at a time."""
+
+    def __init__(self, path: str, size: int):
+        self._path = path
+        # an in memory database is private to its connection, it cannot be pooled
+        size = 1 if path == ":memory:" else max(1, size)
+        self._pool = queue.Queue(maxsize=size)
+        self._connections = [self._connect() for _ in range(size)]
+        for connection in self._connections:
+            self._pool.put_nowait(connection)
+
+    def _connect(self) -> sqlite3.Connection:
+        # transactions are managed explicitly (see `SQLiteAmbient.__commit__`)
+        connection = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put_nowait(connection)
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+
+
+class SQLiteAmbient(Ambient):
+    """Base class for an `Ambient` whose state is held in a local SQLite database. This is useful for long running simulations whose state does not fit comfortably in memory, or that must survive a restart.
+
+    The database is opened in WAL mode via a small pool of connections. Writes made via `write` (or `upsert`) during a step are buffered, they are flushed in a single transaction when the step is committed (see `__commit__`). Consecutive writes that use the same statement are applied together via `executemany`. Reads made via `select` see only committed state, that is, the state at the end of the previous step.
+
+    Implementations of `__select__` and `__update__` should use these helpers rather than accessing the database directly.
+
+    Example:
+    ```
+    class MyAmbient(SQLiteAmbient):
+        def __init__(self, agents):
+            super().__init__(agents, "state.db")
+            self.create_table(
+                "position", {"name": "TEXT PRIMARY KEY", "x": "REAL", "y": "REAL"}
+            )
+            self.create_index("position", ["x", "y"])
+
+        def __select__(self, action):
+            rows = self.select("SELECT name FROM position WHERE x < ?", (action.x,))
+            return ActiveObservation(action_id=action, value=[row[0] for row in rows])
+
+        def __update__(self, action):
+            self.upsert("position", {"name": action.name, "x": action.x, "y": action.y})
+    ```
+    """
+
+    def __init__(
+        self,
+        agents: list[Agent],
+        path: str | Path = ":memory:",
+        *args,
+        pool_size: int = 4,
+        **kwargs,
+    ):
+        """Constructor.
+
+        Args:
+            agents (list[Agent]): a list of agents that will initially be added to this `Ambient`.
+            path (str | Path, optional): path of the database file. Defaults to ":memory:" (the state will not be persisted).
+            args (list[Any]): optional additional arguments.
+            pool_size (int, optional): number of pooled connections. Defaults to 4.
+            kwargs (dict[str, Any]): optional additional arguments.
+        """
+        super().__init__(agents, *args, **kwargs)
+        self._pool = _ConnectionPool(str(path), pool_size)
+        self._writes: list[tuple[str, list[Sequence[Any]]]] = []
+        self._writes_lock = threading.Lock()
+
+    def select(self, sql: str, parameters: Sequence[Any] = ()) -> list[tuple]:
+        """Execute a read-only query against the committed state.
+
+        Args:
+            sql (str): the query.
+            parameters (Sequence[Any], optional): query parameters. Defaults to ().
+
+        Returns:
+            list[tuple]: the resulting rows.
+        """
+        with self._pool.connection() as connection:
+            return connection.execute(sql, parameters).fetchall()
+
+    def select_one(self, sql: str, parameters: Sequence[Any] = ()) -> tuple | None:
+        """Execute a read-only query against the committed state and return the first row.
+
+        Args:
+            sql (str): the query.
+            parameters (Sequence[Any], optional): query parameters. Defaults to ().
+
+        Returns:
+            tuple | None: the first row, or None if there are no rows.
+        """
+        with self._pool.connection() as connection:
+            return connection.execute(sql, parameters).fetchone()
+
+    def select_where(
+        self, table: str, columns: Sequence[str] = ("*",), **where: Any
+    ) -> list[tuple]:
+        """Select rows from a table whose columns are equal to the given values. If an index has been created on the `where` columns (see `create_index`), it will be used by SQLite.
+
+        Args:
+            table (str): the table.
+            columns (Sequence[str], optional): the columns to select. Defaults to all columns.
+            where (dict[str, Any]): column name -> value.
+
+        Returns:
+            list[tuple]: the resulting rows.
+        """
+        sql = f"SELECT {', '.join(columns)} FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(f"{column} = ?" for column in where)
+        return self.select(sql, tuple(where.values()))
+
+    def write(self, sql: str, parameters: Sequence[Any] = ()) -> None:
+        """Buffer a write, it will be applied on the next call to `__commit__`.
+
+        Args:
+            sql (str): the statement.
+            parameters (Sequence[Any], optional): statement parameters. Defaults to ().
+        """
+        with self._writes_lock:
+            if self._writes and self._writes[-1][0] == sql:
+                self._writes[-1][1].append(parameters)
+            else:
+                self._writes.append((sql, [parameters]))
+
+    def write_many(self, sql: str, parameters: Iterable[Sequence[Any]]) -> None:
+        """Buffer a write for each of the given parameters, they will be applied on the next call to `__commit__`.
+
+        Args:
+            sql (str): the statement.
+            parameters (Iterable[Sequence[Any]]): statement parameters.
+        """
+        for params in parameters:
+            self.write(sql, params)
+
+    def upsert(self, table: str, row: dict[str, Any]) -> None:
+        """Buffer an insert (or replace) of a row, it will be applied on the next call to `__commit__`.
+
+        Args:
+            table (str): the table.
+            row (dict[str, Any]): column name -> value.
+        """
+        columns = ", ".join(row.keys())
+        placeholders = ", ".join("?" for _ in row)
+        self.write(
+            f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})",
+            tuple(row.values()),
+        )
+
+    def create_table(self, table: str, columns: dict[str, str]) -> None:
+        """Create a table (if it does not already exist), this is applied immediately.
+
+        Args:
+            table (str): the table.
+            columns (dict[str, str]): column name -> column definition (e.g. "INTEGER PRIMARY KEY").
+        """
+        definitions = ", ".join(f"{name} {spec}" for name, spec in columns.items())
+        self._execute(f"CREATE TABLE IF NOT EXISTS {table} ({definitions})")
+
+    def create_index(
+        self, table: str, columns: Sequence[str], unique: bool = False
+    ) -> None:
+        """Create an index on a table (if it does not already exist), this is applied immediately.
+
+        Args:
+            table (str): the table.
+            columns (Sequence[str]): the indexed columns.
+            unique (bool, optional): whether the index is unique. Defaults to False.
+        """
+        name = f"index_{table}_{'_'.join(columns)}"
+        unique = "UNIQUE " if unique else ""
+        self._execute(
+            f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+
+    def __commit__(self) -> None:
+        """Apply all staged update actions (see `Ambient.__commit__`) and flush all buffered writes in a single transaction. If any write fails, the transaction is rolled back and the error is raised."""
+        super().__commit__()
+        self._flush()
+
+    async def __terminate__(self) -> None:
+        """Terminate this `Ambient`, any staged update actions are applied and buffered writes are flushed before the commit stage is closed (see `Ambient.__terminate__`), the database is then closed."""
+        self.__commit__()
+        await super().__terminate__()
+        # writes made while agents were terminating
+        self._flush()
+        self._pool.close()
+
+    def _flush(self) -> None:
+        with self._writes_lock:
+            writes, self._writes = self._writes, []
+        if not writes:
+            return
+        with self._pool.connection() as connection:
+            connection.execute("BEGIN")
+            try:
+                for sql, parameters in writes:
+                    connection.executemany(sql, parameters)
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _execute(self, sql: str) -> None:
+        with self._pool.connection() as connection:
+            connection.execute(sql)
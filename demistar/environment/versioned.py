@@ -0,0 +1,204 @@
+"""Module defines the `VersionedState` class, a key-value store in which every key has a version. It is used with `OptimisticCommit` to detect conflicting update actions, see class documentation for details."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+__all__ = ("VersionedState",)
+
+
+class VersionedState:
+    """A key-value store in which every key has a version, the version of a key is increased each time the key is written (or deleted).
+
+    Agents that intend to modify the state record the versions of the keys that they read (see `snapshot`), these are then validated when the resulting actions are committed (see `OptimisticCommit`). Versions are also used to find the keys that have changed since a given version (see `changes` and `DeltaTracker`). Writes to disjoint keys may happen concurrently from multiple threads, each key is guarded by one of a fixed number of lock stripes rather than by a single global lock (see `lock`).
+    """
+
+    def __init__(self, values: dict[Hashable, Any] | None = None, stripes: int = 64):
+        """Constructor.
+
+        Args:
+            values (dict[Hashable, Any], optional): initial values. Defaults to None.
+            stripes (int, optional): number of lock stripes. Defaults to 64.
+        """
+        super().__init__()
+        self._values: dict[Hashable, Any] = dict()
+        # keys are ordered by version, this allows changes to be found without a full scan
+        self._versions: OrderedDict[Hashable, int] = OrderedDict()
+        self._clock = 0
+        self._clock_lock = threading.Lock()
+        self._stripes = [threading.RLock() for _ in range(stripes)]
+        for key, value in (values or {}).items():
+            self.write(key, value)
+
+    @property
+    def clock(self) -> int:
+        """The version of the most recent write to this state.
+
+        Returns:
+            int: the version.
+        """
+        return self._clock
+
+    def __contains__(self, key: Hashable) -> bool:  # noqa: D105
+        return key in self._values
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[Hashable]:  # noqa: D105
+        return iter(list(self._values.keys()))
+
+    def __getitem__(self, key: Hashable) -> Any:  # noqa: D105
+        return self._values[key]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get the value of a key.
+
+        Args:
+            key (Hashable): the key.
+            default (Any, optional): value to return if the key does not exist. Defaults to None.
+
+        Returns:
+            Any: the value.
+        """
+        return self._values.get(key, default)
+
+    def version(self, key: Hashable) -> int:
+        """Get the version of a key, keys that do not exist (or have never existed) have version 0.
+
+        Args:
+            key (Hashable): the key.
+
+        Returns:
+            int: the version.
+        """
+        return self._versions.get(key, 0)
+
+    def read(self, key: Hashable) -> tuple[Any, int]:
+        """Read the value and version of a key.
+
+        Args:
+            key (Hashable): the key.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Returns:
+            tuple[Any, int]: the value and version.
+        """
+        with self._stripe(key):
+            return self._values[key], self._versions[key]
+
+    def snapshot(self, keys: Iterable[Hashable]) -> dict[Hashable, tuple[Any, int]]:
+        """Read the values and versions of a collection of keys, keys that do not exist are ignored.
+
+        Args:
+            keys (Iterable[Hashable]): the keys.
+
+        Returns:
+            dict[Hashable, tuple[Any, int]]: the values and versions.
+        """
+        keys = [key for key in keys if key in self._values]
+        with self.lock(keys):
+            return {key: (self._values[key], self._versions[key]) for key in keys}
+
+    def write(self, key: Hashable, value: Any) -> int:
+        """Write the value of a key.
+
+        Args:
+            key (Hashable): the key.
+            value (Any): the value.
+
+        Returns:
+            int: the new version of the key.
+        """
+        with self._stripe(key):
+            self._values[key] = value
+            return self._tick(key)
+
+    def delete(self, key: Hashable) -> int:
+        """Delete a key, its version is retained so that stale reads of the key can still be detected.
+
+        Args:
+            key (Hashable): the key.
+
+        Raises:
+            KeyError: if the key does not exist.
+
+        Returns:
+            int: the new version of the key.
+        """
+        with self._stripe(key):
+            del self._values[key]
+            return self._tick(key)
+
+    def changes(
+        self, since: int, keys: Iterable[Hashable] | None = None
+    ) -> tuple[dict[Hashable, Any], list[Hashable], int]:
+        """Get the keys that have changed since a given version. The cost of this is proportional to the number of changes, not to the size of the state.
+
+        Args:
+            since (int): the version (typically the `clock` at the time of a previous call).
+            keys (Iterable[Hashable], optional): only include changes to these keys. Defaults to None, in which case all keys are included.
+
+        Returns:
+            tuple[dict[Hashable, Any], list[Hashable], int]: the keys that were written (and their current values), the keys that were deleted and the current `clock`.
+        """
+        keys = None if keys is None else set(keys)
+        changed, removed = dict(), []
+        with self._clock_lock:
+            clock = self._clock
+            for key in reversed(self._versions):
+                if self._versions[key] <= since:
+                    break
+                if keys is not None and key not in keys:
+                    continue
+                if key in self._values:
+                    changed[key] = self._values[key]
+                else:
+                    removed.append(key)
+        return changed, removed, clock
+
+    def stale(self, reads: dict[Hashable, int]) -> list[Hashable]:
+        """Get the keys whose versions have changed since they were read.
+
+        Args:
+            reads (dict[Hashable, int]): the keys and the versions at which they were read.
+
+        Returns:
+            list[Hashable]: the stale keys (empty if the reads are valid).
+        """
+        return [key for key, version in reads.items() if self.version(key) != version]
+
+    @contextmanager
+    def lock(self, keys: Iterable[Hashable]):
+        """Context manager that acquires the locks that guard the given keys. Locks are always acquired in the same order, so this will not deadlock with another call to `lock`.
+
+        Args:
+            keys (Iterable[Hashable]): the keys to lock.
+        """
+        stripes = sorted({self._stripe_index(key) for key in keys})
+        for i in stripes:
+            self._stripes[i].acquire()
+        try:
+            yield self
+        finally:
+            for i in reversed(stripes):
+                self._stripes[i].release()
+
+    def _stripe_index(self, key: Hashable) -> int:
+        return hash(key) % len(self._stripes)
+
+    def _stripe(self, key: Hashable) -> threading.RLock:
+        return self._stripes[self._stripe_index(key)]
+
+    def _tick(self, key: Hashable) -> int:
+        with self._clock_lock:
+            self._clock += 1
+            self._versions[key] = self._clock
+            self._versions.move_to_end(key)
+            return self._clock
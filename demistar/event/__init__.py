@@ -12,6 +12,7 @@ from .user_event import (
     WindowCloseEvent,
     WindowOpenEvent,
     ScreenSizeEvent,
+    Coalescer,
 )
 from .action_event import Action
 from .observation_event import (
@@ -19,8 +20,13 @@ from .observation_event import (
     ActiveObservation,
     ErrorActiveObservation,
     ErrorObservation,
+    ConflictObservation,
     wrap_observation,
 )
+from .delta_event import DeltaSelect, DeltaObservation
+from .batch_event import EventBatch
+from .lazy_event import lazy, lazy_observation, is_lazy
+from .registry import event_tag, event_type, event_types
 
 __all__ = (
     "Event",
@@ -29,6 +35,10 @@ __all__ = (
     "ActiveObservation",
     "ErrorActiveObservation",
     "ErrorObservation",
+    "ConflictObservation",
+    "DeltaSelect",
+    "DeltaObservation",
+    "EventBatch",
     # user input events
     "KeyEvent",
     "JoyStickEvent",
@@ -40,6 +50,13 @@ __all__ = (
     "WindowCloseEvent",
     "WindowOpenEvent",
     "ScreenSizeEvent",
+    "Coalescer",
     # other
     "wrap_observation",
+    "lazy",
+    "lazy_observation",
+    "is_lazy",
+    "event_tag",
+    "event_type",
+    "event_types",
 )
@@ -0,0 +1,195 @@
+"""Module defines the `EventBatch` class, a columnar (struct-of-arrays) container for many events of the same type, see class documentation for details."""
+
+from __future__ import annotations
+
+import types
+import typing
+from collections.abc import Iterable, Iterator, Sequence
+from functools import cache
+from typing import Any
+
+import numpy as np
+from pydantic import Field
+
+from .event import Event
+
+__all__ = ("EventBatch",)
+
+# the kinds of column, see `_kinds`
+_SCALAR, _PAIR, _OBJECT = "scalar", "pair", "object"
+
+
+class EventBatch(Event):
+    """A batch of events of the same type that is held as columns, one `numpy` array per field (e.g. `timestamp`, `position`, `status`). This is typically used for high rate input events (see `IOSensor`), a single batch is observed in place of many individual events, and may be processed in a vectorized way via `column`.
+
+    Numeric and string fields are held as arrays of the corresponding type, coordinate pairs (e.g. `MouseMotionEvent.position`) are held as arrays with shape (n, 2), other fields are held as object arrays. Individual events are materialized lazily when they are accessed (see `__getitem__`).
+
+    Example:
+    ```
+    batch = EventBatch.from_events(events)  # events are `MouseMotionEvent`s
+    dx, dy = batch.column("relative").sum(axis=0)
+    last = batch[-1]  # the last `MouseMotionEvent`
+    ```
+
+    Attributes:
+        event_type (type[Event]): the type of the events in this batch.
+        columns (dict[str, Any]): field name -> column (`numpy.ndarray`).
+    """
+
+    event_type: type[Event]
+    columns: dict[str, Any] = Field(default_factory=dict)
+
+    @classmethod
+    def from_events(
+        cls, events: Sequence[Event], event_type: type[Event] | None = None
+    ) -> EventBatch:
+        """Create a batch from a sequence of events, the events must all be of the same type.
+
+        Args:
+            events (Sequence[Event]): the events.
+            event_type (type[Event], optional): the type of the events. Defaults to None, in which case it is the type of the first event (an empty batch must be given the type).
+
+        Raises:
+            ValueError: if the events are not all of the same type, or if the type cannot be determined.
+
+        Returns:
+            EventBatch: the batch.
+        """
+        if event_type is None:
+            if not events:
+                raise ValueError("The type of an empty batch must be given.")
+            event_type = type(events[0])
+        if any(type(event) is not event_type for event in events):
+            raise ValueError(f"Events in a batch must all be of type: {event_type}")
+        dicts = [event.__dict__ for event in events]
+        columns = {
+            name: _column([d[name] for d in dicts], kind)
+            for name, kind in _kinds(event_type).items()
+        }
+        return cls.unchecked(event_type=event_type, columns=columns)
+
+    @classmethod
+    def group(cls, events: Iterable[Event]) -> list[EventBatch]:
+        """Group events by type into batches, the batches are ordered by the first occurrence of their type and events keep their order within each batch.
+
+        Args:
+            events (Iterable[Event]): the events.
+
+        Returns:
+            list[EventBatch]: one batch per event type.
+        """
+        groups: dict[type, list[Event]] = dict()
+        for event in events:
+            groups.setdefault(type(event), []).append(event)
+        return [
+            cls.from_events(group, event_type) for event_type, group in groups.items()
+        ]
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a column of this batch.
+
+        Args:
+            name (str): the name of the field.
+
+        Returns:
+            np.ndarray: the column.
+        """
+        return self.columns[name]
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.columns["id"]) if "id" in self.columns else 0
+
+    def __getitem__(self, index: int | slice) -> Event | EventBatch:
+        """Materialize an event in this batch, or get a batch that holds a slice of this batch.
+
+        Args:
+            index (int | slice): index of the event (or slice).
+
+        Returns:
+            Event | EventBatch: the event (or batch).
+        """
+        if isinstance(index, slice):
+            columns = {name: column[index] for name, column in self.columns.items()}
+            return EventBatch.unchecked(event_type=self.event_type, columns=columns)
+        kinds = _kinds(self.event_type)
+        fields = {
+            name: _value(column[index], kinds[name])
+            for name, column in self.columns.items()
+        }
+        return self.event_type.unchecked(**fields)
+
+    def __iter__(self) -> Iterator[Event]:  # noqa: D105
+        # events are materialized one at a time
+        return (self[i] for i in range(len(self)))
+
+    def to_events(self) -> list[Event]:
+        """Materialize all of the events in this batch.
+
+        Returns:
+            list[Event]: the events.
+        """
+        return list(self)
+
+    def __eq__(self, other: Any) -> bool:  # noqa: D105
+        if not isinstance(other, EventBatch):
+            return NotImplemented
+        return (
+            self.id == other.id
+            and self.event_type is other.event_type
+            and self.columns.keys() == other.columns.keys()
+            and all(
+                np.array_equal(column, other.columns[name])
+                for name, column in self.columns.items()
+            )
+        )
+
+    def __repr_args__(self):  # noqa: D105
+        yield "event_type", self.event_type.__name__
+        yield "size", len(self)
+
+
+@cache
+def _kinds(event_type: type[Event]) -> dict[str, str]:
+    # field name -> the kind of its column
+    return {
+        name: _kind(field.annotation) for name, field in event_type.model_fields.items()
+    }
+
+
+def _kind(annotation: Any) -> str:
+    if annotation in (int, float, bool, str):
+        return _SCALAR
+    args = typing.get_args(annotation)
+    union = typing.get_origin(annotation) in (typing.Union, types.UnionType)
+    if _is_pair(annotation) or (union and args and all(map(_is_pair, args))):
+        return _PAIR
+    return _OBJECT
+
+
+def _is_pair(annotation: Any) -> bool:
+    args = typing.get_args(annotation)
+    return (
+        typing.get_origin(annotation) is tuple
+        and len(args) == 2
+        and args[0] is args[1]
+        and args[0] in (int, float)
+    )
+
+
+def _column(values: list, kind: str) -> np.ndarray:
+    if kind != _OBJECT:
+        column = np.asarray(values)
+        # e.g. integers that do not fit in 64 bits
+        if column.dtype != object and (kind == _SCALAR or column.ndim == 2):
+            return column
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def _value(value: Any, kind: str) -> Any:
+    if kind == _PAIR and isinstance(value, np.ndarray):
+        return tuple(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -0,0 +1,398 @@
+"""Module defines a compact binary codec for events, see `encode` and `decode` for details. It is intended for high rate events (e.g. user input events) that cross process boundaries or are recorded, where pickling pydantic models is slow and bulky."""
+
+import pickle
+import struct
+import types
+import typing
+from collections.abc import Iterable
+from functools import cache
+from typing import Any
+
+from . import registry
+from .event import (
+    Event,
+    _new,
+    _set_dict,
+    _set_fields_set,
+    _set_extra,
+    _set_private,
+)
+
+__all__ = (
+    "encode",
+    "decode",
+    "encode_batch",
+    "decode_batch",
+    "register_ray_serializer",
+)
+
+# tag of a record that holds a pickled event (the fallback for events that cannot be encoded), event type tags are never 0
+_PICKLE_TAG = 0
+_TAG = struct.Struct("<I")  # see `event_tag`
+_LENGTH = struct.Struct("<I")
+_NONE_LENGTH = 0xFFFFFFFF
+_PAIR_FLOAT = struct.Struct("<Bdd")
+_PAIR_INT = struct.Struct("<Bqq")
+
+# fixed width field types and their struct format
+_FIXED = {int: "q", float: "d", bool: "?"}
+
+
+def encode(event: Event) -> bytes:
+    """Encode an event as bytes. The format is derived from the events schema: a type tag followed by its fixed width fields (`int`, `float`, `bool`) packed together and then its variable width fields (strings, coordinate pairs, etc.). Fields that have no binary representation are pickled individually, events that cannot be encoded (e.g. an `int` field that does not fit in 64 bits) are pickled as a whole.
+
+    Args:
+        event (Event): the event.
+
+    Returns:
+        bytes: the encoded event.
+    """
+    return _encode(event)
+
+
+def decode(data: bytes) -> Event:
+    """Decode an event that was encoded by `encode`. The events type must be defined (imported) in this process. Decoded events are not validated (see `Event.unchecked`).
+
+    Args:
+        data (bytes): the encoded event.
+
+    Returns:
+        Event: the event.
+    """
+    return _decode(memoryview(data), 0)[0]
+
+
+def encode_batch(events: Iterable[Event]) -> bytes:
+    """Encode a batch of events as bytes. Events are grouped by type and each field is encoded as a column, fixed width fields (and coordinate pairs) are packed in a single call per column. This is considerably faster and more compact than encoding the events individually (see `encode`). The order of the events is preserved.
+
+    Args:
+        events (Iterable[Event]): the events.
+
+    Returns:
+        bytes: the encoded events.
+    """
+    events = list(events)
+    groups: dict[type, list[Event]] = dict()
+    for event in events:
+        groups.setdefault(type(event), []).append(event)
+    parts = [_LENGTH.pack(len(events)), _LENGTH.pack(len(groups))]
+    if len(groups) > 1:
+        index = {event_type: i for i, event_type in enumerate(groups)}
+        order = [index[type(event)] for event in events]
+        parts.append(struct.pack(f"<{len(order)}H", *order))
+    for event_type, group in groups.items():
+        plan = _plan(event_type)
+        if plan is None:
+            parts.append(_TAG.pack(_PICKLE_TAG) + _encode_pickle(group))
+        else:
+            parts.append(plan.encode_columns(group))
+    return b"".join(parts)
+
+
+def decode_batch(data: bytes) -> list[Event]:
+    """Decode a batch of events that was encoded by `encode_batch`.
+
+    Args:
+        data (bytes): the encoded events.
+
+    Returns:
+        list[Event]: the events.
+    """
+    buffer = memoryview(data)
+    (n,) = _LENGTH.unpack_from(buffer, 0)
+    (n_groups,) = _LENGTH.unpack_from(buffer, _LENGTH.size)
+    offset = 2 * _LENGTH.size
+    order = None
+    if n_groups > 1:
+        order = struct.unpack_from(f"<{n}H", buffer, offset)
+        offset += 2 * n
+    groups = []
+    for _ in range(n_groups):
+        (tag,) = _TAG.unpack_from(buffer, offset)
+        offset += _TAG.size
+        if tag == _PICKLE_TAG:
+            group, offset = _decode_pickle(buffer, offset)
+        else:
+            group, offset = _plan_by_tag(tag).decode_columns(buffer, offset)
+        groups.append(group)
+    if order is None:
+        return groups[0] if groups else []
+    iterators = [iter(group) for group in groups]
+    return [next(iterators[i]) for i in order]
+
+
+def register_ray_serializer(*event_types: type[Event]) -> None:
+    """Register `encode` and `decode` as the ray serializer for the given event types, events of these types that are passed to or returned from remote calls (e.g. observations of a remote agent) will then use the binary format rather than pickle. This must be called in each process that sends events (the deserializer is shipped with the data). Note that ray serializers apply to the exact type, not to subclasses.
+
+    Args:
+        event_types (type[Event]): the event types. Defaults to the user input events (see `demistar.event.user_event`).
+    """
+    import ray.util
+
+    if not event_types:
+        from . import user_event
+
+        event_types = [getattr(user_event, name) for name in user_event.__all__]
+        event_types = [t for t in event_types if issubclass(t, Event)]
+    for event_type in event_types:
+        ray.util.register_serializer(event_type, serializer=encode, deserializer=decode)
+
+
+class _Plan:
+    """The binary layout of an event type, this is derived from its schema."""
+
+    def __init__(self, event_type: type[Event]):
+        self.type = event_type
+        self.tag = registry.event_tag(event_type)
+        fixed, formats, self.variable = [], [_TAG.format], []
+        for name, field in event_type.model_fields.items():
+            annotation = field.annotation
+            if annotation in _FIXED:
+                fixed.append(name)
+                formats.append(_FIXED[annotation])
+            else:
+                self.variable.append((name, *_variable_codec(annotation)))
+        self.fixed = tuple(fixed)
+        self.struct = struct.Struct("".join(formats))
+        # the column layout of a batch (see `encode_batch`)
+        self.columns = [
+            (name, _FIXED.get(field.annotation) or _column_kind(field.annotation))
+            for name, field in event_type.model_fields.items()
+        ]
+        self.private = bool(event_type.__private_attributes__)
+        # error observations format their traceback lazily (see `ErrorObservation.from_exception`)
+        self.traceback = "_traceback" in event_type.__private_attributes__
+
+    def encode(self, event: Event) -> bytes:
+        if self.traceback:
+            event.formatted_traceback()
+        values = event.__dict__
+        parts = [self.struct.pack(self.tag, *[values[name] for name in self.fixed])]
+        for name, encoder, _ in self.variable:
+            parts.append(encoder(values[name]))
+        return b"".join(parts)
+
+    def decode(self, buffer: memoryview, offset: int) -> tuple[Event, int]:
+        values = self.struct.unpack_from(buffer, offset)
+        fields = dict(zip(self.fixed, values[1:]))
+        offset += self.struct.size
+        for name, _, decoder in self.variable:
+            fields[name], offset = decoder(buffer, offset)
+        if self.private:
+            return self.type.unchecked(**fields), offset
+        return self._construct(fields), offset
+
+    def encode_columns(self, events: list[Event]) -> bytes:
+        if self.traceback:
+            for event in events:
+                event.formatted_traceback()
+        dicts = [event.__dict__ for event in events]
+        parts = [_TAG.pack(self.tag), _LENGTH.pack(len(events))]
+        for name, kind in self.columns:
+            parts.append(_encode_column([d[name] for d in dicts], kind))
+        return b"".join(parts)
+
+    def decode_columns(self, buffer: memoryview, offset: int) -> tuple[list, int]:
+        (n,) = _LENGTH.unpack_from(buffer, offset)
+        offset += _LENGTH.size
+        columns = []
+        for _ in self.columns:
+            column, offset = _decode_column(buffer, offset, n)
+            columns.append(column)
+        names = [name for name, _ in self.columns]
+        if self.private:
+            events = [
+                self.type.unchecked(**dict(zip(names, row))) for row in zip(*columns)
+            ]
+            return events, offset
+        construct = self._construct
+        return [construct(dict(zip(names, row))) for row in zip(*columns)], offset
+
+    def _construct(self, values: dict[str, Any]) -> Event:
+        # all fields are given and there are no private attributes, see `Event.unchecked`
+        event = _new(self.type)
+        _set_dict(event, "__dict__", values)
+        _set_fields_set(event, set(values))
+        _set_extra(event, None)
+        _set_private(event, None)
+        return event
+
+
+@cache
+def _plan(event_type: type[Event]) -> _Plan | None:
+    # lazy observations (see `lazy`) do not hold their value, they are pickled as a whole
+    if "_value_ref" in event_type.__private_attributes__:
+        return None
+    return _Plan(event_type)
+
+
+def _plan_by_tag(tag: int) -> _Plan:
+    try:
+        return _plan(registry.event_type(tag))
+    except KeyError:
+        raise ValueError(f"Unknown event type tag: {tag}") from None
+
+
+def _encode(event: Event) -> bytes:
+    plan = _plan(type(event))
+    if plan is not None:
+        try:
+            return plan.encode(event)
+        except (struct.error, OverflowError, TypeError, KeyError):
+            pass  # e.g. an integer that does not fit in 64 bits
+    data = pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+    return _TAG.pack(_PICKLE_TAG) + _LENGTH.pack(len(data)) + data
+
+
+def _decode(buffer: memoryview, offset: int) -> tuple[Event, int]:
+    (tag,) = _TAG.unpack_from(buffer, offset)
+    if tag == _PICKLE_TAG:
+        value, offset = _decode_pickle(buffer, offset + _TAG.size)
+        return value, offset
+    return _plan_by_tag(tag).decode(buffer, offset)
+
+
+# variable width field codecs, decoders return the value and the offset of the next field
+
+
+def _variable_codec(annotation: Any) -> tuple:
+    args = set(typing.get_args(annotation))
+    union = typing.get_origin(annotation) in (typing.Union, types.UnionType)
+    if annotation is str or (union and args == {str, type(None)}):
+        return _encode_str, _decode_str
+    if union and args == {int, type(None)}:
+        return _encode_int, _decode_int
+    if _is_pair(annotation) or (union and all(_is_pair(arg) for arg in args)):
+        return _encode_pair, _decode_pair
+    return _encode_pickle, _decode_pickle
+
+
+def _is_pair(annotation: Any) -> bool:
+    args = typing.get_args(annotation)
+    return (
+        typing.get_origin(annotation) is tuple
+        and len(args) == 2
+        and args[0] is args[1]
+        and args[0] in (int, float)
+    )
+
+
+def _encode_str(value: str | None) -> bytes:
+    if value is None:
+        return _LENGTH.pack(_NONE_LENGTH)
+    data = value.encode()
+    return _LENGTH.pack(len(data)) + data
+
+
+def _decode_str(buffer: memoryview, offset: int) -> tuple[str | None, int]:
+    (n,) = _LENGTH.unpack_from(buffer, offset)
+    offset += _LENGTH.size
+    if n == _NONE_LENGTH:
+        return None, offset
+    return str(buffer[offset : offset + n], "utf-8"), offset + n
+
+
+def _encode_int(value: int | None) -> bytes:
+    # arbitrary precision (e.g. `source` which combines a component id and an agent id)
+    if value is None:
+        return b"\xff"
+    n = (value.bit_length() + 8) // 8
+    return bytes((n,)) + value.to_bytes(n, "little", signed=True)
+
+
+def _decode_int(buffer: memoryview, offset: int) -> tuple[int | None, int]:
+    n = buffer[offset]
+    offset += 1
+    if n == 0xFF:
+        return None, offset
+    return int.from_bytes(
+        buffer[offset : offset + n], "little", signed=True
+    ), offset + n
+
+
+def _encode_pair(value: tuple) -> bytes:
+    if type(value[0]) is int and type(value[1]) is int:
+        return _PAIR_INT.pack(1, *value)
+    return _PAIR_FLOAT.pack(0, *value)
+
+
+def _decode_pair(buffer: memoryview, offset: int) -> tuple[tuple, int]:
+    flag, x, y = (_PAIR_INT if buffer[offset] else _PAIR_FLOAT).unpack_from(
+        buffer, offset
+    )
+    return (x, y), offset + _PAIR_FLOAT.size
+
+
+def _encode_pickle(value: Any) -> bytes:
+    if value is None:
+        return _LENGTH.pack(_NONE_LENGTH)
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return _LENGTH.pack(len(data)) + data
+
+
+def _decode_pickle(buffer: memoryview, offset: int) -> tuple[Any, int]:
+    (n,) = _LENGTH.unpack_from(buffer, offset)
+    offset += _LENGTH.size
+    if n == _NONE_LENGTH:
+        return None, offset
+    return pickle.loads(buffer[offset : offset + n]), offset + n
+
+
+# column codecs (see `encode_batch`), each column starts with its mode
+_PACKED, _PICKLED, _PAIRS = b"F", b"X", b"P"
+_INT_FORMATS = (("b", 1 << 7), ("h", 1 << 15), ("i", 1 << 31), ("q", 1 << 63))
+
+
+def _column_kind(annotation: Any) -> str | None:
+    # fixed width kinds are struct formats, "pair" is a coordinate pair, None is pickled
+    args = typing.get_args(annotation)
+    union = typing.get_origin(annotation) in (typing.Union, types.UnionType)
+    if _is_pair(annotation) or (union and all(_is_pair(arg) for arg in args)):
+        return "pair"
+    return None
+
+
+def _int_format(values: list[int]) -> str:
+    # the narrowest integer format that holds all of the values
+    lo, hi = min(values, default=0), max(values, default=0)
+    for fmt, limit in _INT_FORMATS:
+        if -limit <= lo and hi < limit:
+            return fmt
+    raise OverflowError("integer does not fit in 64 bits")
+
+
+def _encode_column(column: list, kind: str | None) -> bytes:
+    # a column is its mode (packed, pairs or pickled) followed by its struct format and values
+    n = len(column)
+    try:
+        if kind == "pair":
+            values = [v for pair in column for v in pair]
+            if all(type(v) is int for v in values):
+                fmt = _int_format(values)
+            else:
+                fmt = "d"
+            return _PAIRS + fmt.encode() + struct.pack(f"<{2 * n}{fmt}", *values)
+        elif kind is not None:
+            fmt = _int_format(column) if kind == "q" else kind
+            return _PACKED + fmt.encode() + struct.pack(f"<{n}{fmt}", *column)
+    except (struct.error, TypeError, ValueError, OverflowError):
+        pass  # e.g. an integer that does not fit in 64 bits
+    data = pickle.dumps(column, protocol=pickle.HIGHEST_PROTOCOL)
+    return _PICKLED + _LENGTH.pack(len(data)) + data
+
+
+def _decode_column(buffer: memoryview, offset: int, n: int) -> tuple[list, int]:
+    mode = buffer[offset : offset + 1]
+    offset += 1
+    if mode == _PICKLED:
+        (size,) = _LENGTH.unpack_from(buffer, offset)
+        offset += _LENGTH.size
+        return pickle.loads(buffer[offset : offset + size]), offset + size
+    fmt = chr(buffer[offset])
+    offset += 1
+    if mode == _PACKED:
+        layout = struct.Struct(f"<{n}{fmt}")
+        return list(layout.unpack_from(buffer, offset)), offset + layout.size
+    layout = struct.Struct(f"<{2 * n}{fmt}")
+    values = layout.unpack_from(buffer, offset)
+    return list(zip(values[::2], values[1::2])), offset + layout.size
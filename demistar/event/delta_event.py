@@ -0,0 +1,55 @@
+"""Module defines events that are used to observe only the changes to the state of the environment, see `DeltaSelect` and `DeltaObservation`."""
+
+from typing import Any
+from pydantic import Field
+
+from .action_event import Action
+from .observation_event import ActiveObservation
+
+__all__ = ("DeltaSelect", "DeltaObservation")
+
+
+class DeltaSelect(Action):
+    """Action that selects the changes to the state of the environment since the last `DeltaSelect` taken by the same source (typically a `DeltaSensor`).
+
+    Attributes:
+        keys (list[Any] | None): the keys of interest. The keys are remembered by the environment (the query is persistent) and need only be given when they change. Defaults to None (use the previous keys, or all keys if none were ever given).
+        reset (bool): whether to select the full state rather than the changes (e.g. if the local mirror of the state was lost). Defaults to False.
+    """
+
+    keys: list[Any] | None = Field(default=None)
+    reset: bool = Field(default=False)
+
+
+class DeltaObservation(ActiveObservation):
+    """Observation that contains the changes to the state of the environment since the previous `DeltaObservation` that was received by the same source.
+
+    Attributes:
+        changed (dict[Any, Any]): keys that were written and their new values.
+        removed (list[Any]): keys that were deleted.
+        since (int): the version of the state that the changes are relative to, the local mirror must be up to date with this version for the changes to apply (0 if this observation contains the full state).
+        version (int): the version of the state that this observation brings the local mirror up to.
+        full (bool): whether this observation contains the full state, in which case the local mirror should be cleared before it is applied.
+    """
+
+    changed: dict[Any, Any] = Field(default_factory=dict)
+    removed: list[Any] = Field(default_factory=list)
+    since: int = Field(default=0)
+    version: int = Field(default=0)
+    full: bool = Field(default=False)
+
+    def apply(self, mirror: dict[Any, Any]) -> dict[Any, Any]:
+        """Apply the changes in this observation to a local mirror of the state.
+
+        Args:
+            mirror (dict[Any, Any]): the local mirror, it is modified in place.
+
+        Returns:
+            dict[Any, Any]: the updated mirror.
+        """
+        if self.full:
+            mirror.clear()
+        for key in self.removed:
+            mirror.pop(key, None)
+        mirror.update(self.changed)
+        return mirror
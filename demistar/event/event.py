@@ -1,12 +1,28 @@
 """Module defining the `Event` class."""
 
 import time
+from enum import Enum
+from functools import cache, partial
+from typing import Any, ClassVar
+
 from pydantic import BaseModel, Field
+from pydantic_core import PydanticUndefined
+
 from ..utils import int64_uuid
+from .registry import _register
 
 EVENT_TIMESTAMP_FUNC = time.time
 EVENT_UUID_FUNC = int64_uuid
 
+# these bypass `BaseModel.__init__` and `BaseModel.__setattr__` (and so validation)
+_new = object.__new__
+_set_dict = object.__setattr__
+_set_fields_set = BaseModel.__pydantic_fields_set__.__set__
+_set_extra = BaseModel.__pydantic_extra__.__set__
+_set_private = BaseModel.__pydantic_private__.__set__
+# default values of these types may be shared between events
+_IMMUTABLE = (type(None), bool, int, float, str, bytes, tuple, frozenset, Enum)
+
 
 class Event(BaseModel):
     """An event class with a unique identifier, timestamp and source.
@@ -19,7 +35,88 @@ class Event(BaseModel):
 
     id: int = Field(default_factory=EVENT_UUID_FUNC)
     timestamp: float = Field(default_factory=EVENT_TIMESTAMP_FUNC)
-    source: int | None = Field(default_factory=lambda: None)
+    source: int | None = None
+
+    # the type tag of this event type (see `demistar.event.registry`)
+    __event_tag__: ClassVar[int] = 0
 
     class Config:  # noqa: D106
         validate_assignment = True
+
+    def __init_subclass__(
+        cls, tag: int | None = None, register: bool = True, **kwargs: Any
+    ):
+        """Registers the new event type, it is given a stable integer tag (see `event_tag`).
+
+        Args:
+            tag (int, optional): the tag of the event type. Defaults to None, in which case the tag is a hash of the fully qualified name of the type.
+            register (bool, optional): whether to register the event type, types that are not registered share the tag of their parent type. Defaults to True.
+            kwargs (dict[str, Any]): optional additional arguments.
+
+        Raises:
+            TypeError: if the tag is already used by a different event type.
+        """
+        super().__init_subclass__(**kwargs)
+        if register:
+            _register(cls, tag)
+
+    @classmethod
+    def unchecked(cls, **fields: Any) -> "Event":
+        """Create an event without validation, this is a fast path for trusted internal code (e.g. creating observations in an `Ambient`) where the field values are known to be valid. Fields that are not given take their default values, no type conversion is done (e.g. `action_id` must be given as an `int`, not as an `Event`).
+
+        This is not faster than normal (validated) construction for small events, validation is done natively by pydantic and the cost of both is dominated by the default factories (`id` and `timestamp`). It is only worthwhile for events whose field values are large and would be traversed by validation (e.g. a long `list[int]`), where it is many times faster, see `test/benchmark/bench_event.py`.
+
+        Args:
+            fields (dict[str, Any]): field values, these must be valid for this event type.
+
+        Returns:
+            Event: the event (an instance of this type).
+        """
+        defaults, factories, private = _unchecked_defaults(cls)
+        values = defaults.copy()
+        for name, factory in factories:
+            if name not in fields:
+                values[name] = factory()
+        values.update(fields)
+        event = _new(cls)
+        _set_dict(event, "__dict__", values)
+        _set_fields_set(event, set(fields))
+        _set_extra(event, None)
+        if private is not None:
+            private = {name: attr.get_default() for name, attr in private}
+            private = {k: v for k, v in private.items() if v is not PydanticUndefined}
+        _set_private(event, private)
+        return event
+
+    def set_unchecked(self, **fields: Any) -> None:
+        """Set field values without validation (see `validate_assignment`), this is a fast path for trusted internal code where the field values are known to be valid, e.g. setting the `source` of an action (see `Component.set_event_source`).
+
+        Args:
+            fields (dict[str, Any]): field values, these must be valid for this event type.
+        """
+        self.__dict__.update(fields)
+        self.__pydantic_fields_set__.update(fields)
+
+
+_register(Event)
+
+
+@cache
+def _unchecked_defaults(
+    cls: type[Event],
+) -> tuple[dict[str, Any], tuple[tuple[str, Any], ...], tuple | None]:
+    # static defaults, default factories and private attribute defaults of an event type (see `Event.unchecked`)
+    defaults, factories = dict(), []
+    for name, field in cls.model_fields.items():
+        if field.default_factory is not None:
+            factories.append((name, field.default_factory))
+        elif field.default is PydanticUndefined:
+            continue  # required field
+        elif isinstance(field.default, _IMMUTABLE):
+            defaults[name] = field.default
+        else:  # mutable defaults are copied for each event
+            factories.append(
+                (name, partial(field.get_default, call_default_factory=True))
+            )
+    private = tuple(cls.__private_attributes__.items()) or None
+    return defaults, tuple(factories), private
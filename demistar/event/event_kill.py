@@ -6,7 +6,6 @@ from .event import Event
 from ..utils import int64_uuid
 
 
-# TODO untested
 class KillEvent(Event):
     """Event that will kill an agent given its `id` (trigger a call to __terminate__). It is up to the environment to manage the permissions of this event.
 
@@ -16,9 +15,11 @@ class KillEvent(Event):
 
     kill: int = Field(default_factory=lambda: KillEvent._DEFAULT_UUID)
 
-    @model_validator("kill", mode="after")
+    @model_validator(mode="after")
     def _validate_kill(self):
-        if self.kill == KillEvent._DEFAULT_UUID:
-            self.kill = self.source
+        if self.kill == KillEvent._DEFAULT_UUID and self.source is not None:
+            # set directly, assignment would trigger validation again
+            self.__dict__["kill"] = self.source
+        return self
 
     _DEFAULT_UUID: ClassVar[int] = int64_uuid()
@@ -0,0 +1,147 @@
+"""Module defines lazy observations, observations whose `value` is held in the ray object store and is only fetched when it is accessed, see `lazy` and `lazy_observation` for details."""
+
+from functools import cache, wraps
+from typing import Any
+
+import ray
+from pydantic import PrivateAttr
+
+from .event import Event
+from .observation_event import Observation, ActiveObservation, wrap_observation
+
+__all__ = ("lazy", "lazy_observation", "is_lazy", "value_ref")
+
+
+class _LazyObservation:
+    """Mixin for lazy observations, the `value` field is removed from the instance and is fetched from the object store (once) when it is first accessed."""
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "value":
+            value = _fetch(self.__pydantic_private__["_value_ref"])
+            self.__dict__["value"] = value
+            return value
+        return super().__getattr__(name)
+
+    def __reduce__(self):
+        # the lazy type is created dynamically, instances are rebuilt from the original type
+        fields = {k: v for k, v in self.__dict__.items() if k != "value"}
+        return _rebuild, (_eager_type(type(self)), fields, self._value_ref)
+
+    def model_dump(self, *args, **kwargs) -> dict[str, Any]:  # noqa: D102
+        self.value  # noqa: B018 (fetch the value)
+        return super().model_dump(*args, **kwargs)
+
+    def model_dump_json(self, *args, **kwargs) -> str:  # noqa: D102
+        self.value  # noqa: B018 (fetch the value)
+        return super().model_dump_json(*args, **kwargs)
+
+    def __eq__(self, other: Any) -> bool:  # noqa: D105
+        # lazy observations are equal to their eager counterparts
+        if not isinstance(other, Observation):
+            return NotImplemented
+        if _eager_type(type(self)) is not _eager_type(type(other)):
+            return False
+        fields = type(self).model_fields
+        return all(getattr(self, k) == getattr(other, k) for k in fields)
+
+
+def lazy(observation: Observation) -> Observation:
+    """Make an observation lazy. The observations `value` is put in the ray object store, the returned observation carries its type and metadata (`id`, `source`, `action_id`, etc.) but not its value. The value is fetched when it is first accessed, observations that are never accessed (e.g. they are discarded based on their type) are never fetched.
+
+    A lazy observation is an instance of the original observation type, and will be routed in the same way.
+
+    Args:
+        observation (Observation): the observation.
+
+    Returns:
+        Observation: the lazy observation, or `observation` if ray is not initialised or the observation is already lazy.
+    """
+    if not ray.is_initialized() or isinstance(observation, _LazyObservation):
+        return observation
+    return _rebuild(
+        type(observation),
+        {k: v for k, v in observation.__dict__.items() if k != "value"},
+        ray.put(observation.value),
+    )
+
+
+def lazy_observation(fun):
+    """Decorator that will wrap the return value in a lazy observation (see `lazy`), this is typically used on `Ambient.__select__` when observations contain large values. Return values that are not observations are wrapped in an `ActiveObservation` (or `ErrorActiveObservation` if there was an exception) as with `wrap_observation`. Assumes that `action` is the first argument of the given function.
+
+    Args:
+        fun: function to decorate.
+    """
+    fun = wrap_observation(fun)
+
+    @wraps(fun)
+    def _wrap(self, action: Event, *args, **kwargs) -> ActiveObservation:
+        result = fun(self, action, *args, **kwargs)
+        if isinstance(result, Observation) and result.value is not None:
+            return lazy(result)
+        return result
+
+    return _wrap
+
+
+def is_lazy(observation: Any) -> bool:
+    """Is the given observation lazy and its value not yet fetched?
+
+    Args:
+        observation (Any): the observation.
+
+    Returns:
+        bool: whether the observations value is yet to be fetched.
+    """
+    return (
+        isinstance(observation, _LazyObservation)
+        and "value" not in observation.__dict__
+    )
+
+
+def value_ref(observation: Any) -> ray.ObjectRef | None:
+    """Get the object ref of a lazy observations value if it is yet to be fetched, this is used to prefetch values (see `_Observations.prefetch`).
+
+    Args:
+        observation (Any): the observation.
+
+    Returns:
+        ray.ObjectRef | None: the ref, or None if the observation is not lazy or has already been fetched.
+    """
+    if is_lazy(observation):
+        return observation._value_ref
+    return None
+
+
+@cache
+def _lazy_type(cls: type[Observation]) -> type[Observation]:
+    # the lazy type has the same name and tag as the original so that it is routed in the same way (see `TypeRouter`)
+    return type(cls)(
+        cls.__name__,
+        (_LazyObservation, cls),
+        {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__doc__": cls.__doc__,
+            "_value_ref": PrivateAttr(None),
+        },
+        register=False,
+    )
+
+
+def _eager_type(cls: type[Observation]) -> type[Observation]:
+    return next(t for t in cls.__mro__ if not issubclass(t, _LazyObservation))
+
+
+def _rebuild(
+    cls: type[Observation], fields: dict[str, Any], ref: ray.ObjectRef
+) -> Observation:
+    observation = _lazy_type(cls).model_construct(**fields)
+    observation.__dict__.pop("value", None)
+    observation._value_ref = ref
+    return observation
+
+
+def _fetch(ref: ray.ObjectRef) -> Any:
+    while isinstance(ref, ray.ObjectRef):
+        ref = ray.get(ref)
+    return ref
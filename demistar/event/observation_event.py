@@ -5,14 +5,14 @@ import traceback
 from functools import lru_cache
 from functools import wraps
 from typing import Any
-from pydantic import field_validator, Field
+from pydantic import field_serializer, field_validator, Field, PrivateAttr
 from .event import Event
 
 
 class Observation(Event):
     """Base class for an observation. Contains `value` (any type) which holds the observed data."""
 
-    value: Any = Field(default_factory=lambda: None)
+    value: Any = None
 
 
 class ActiveObservation(Observation):
@@ -30,17 +30,20 @@ class ActiveObservation(Observation):
             raise ValueError(f"Invalid action_id {value}")
 
     @staticmethod
-    def new(action: Event, values: Any) -> "ActiveObservation":
+    def new(action: Event | int, values: Any) -> "ActiveObservation":
         """Factory method.
 
         Args:
-            action (Event): action that lead to this observation.
+            action (Event | int): action that lead to this observation (or its `id`).
             values (Any): values that are part of this observation.
 
         Returns:
             ActiveObservation: the observation.
+
+        Raises:
+            ValueError: if `action` is neither an event nor an int.
         """
-        return ActiveObservation(action_id=action, values=values)
+        return ActiveObservation(action_id=action, value=values)
 
 
 class ErrorObservation(Observation):
@@ -60,10 +63,30 @@ class ErrorObservation(Observation):
     exception_type: str  # fully qualified name of the exception type
     # list of arguments that came with the exception (these are retrieved via exception.__dict__)
     exception_args: dict[str, Any]  # TODO Any must be serializable...
-    traceback_message: str  # traceback message of the exception
+    traceback_message: (
+        str  # traceback message of the exception (see `formatted_traceback`)
+    )
+
+    # the captured traceback of the exception, it is released once formatted (see `formatted_traceback`)
+    _traceback: traceback.TracebackException | None = PrivateAttr(None)
+
+    def formatted_traceback(self) -> str:
+        """Get the formatted traceback of the exception. The captured traceback is formatted when this is first called and the result is kept in `traceback_message`, until then `traceback_message` holds just the exception type and message (see `from_exception`).
+
+        Returns:
+            str: the formatted traceback
+        """
+        if self._traceback is not None:
+            self.__dict__["traceback_message"] = "".join(self._traceback.format())
+            self._traceback = None
+        return self.traceback_message
+
+    @field_serializer("traceback_message")
+    def _serialize_traceback_message(self, _: str) -> str:
+        return self.formatted_traceback()
 
     def __str__(self):  # noqa: D105
-        return f"ErrorResponse(\nsource={self.source},\n{self.traceback_message}\n)"
+        return f"ErrorResponse(\nsource={self.source},\n{self.formatted_traceback()}\n)"
 
     def exception(self):
         """Creates an exception that may be re-raised, the exception contains information about the original error.
@@ -71,7 +94,9 @@ class ErrorObservation(Observation):
         Returns:
             _ObservationError: the exception to re-raise (or process)
         """
-        return _ObservationError(f"\n{self.exception_type}:\n{self.traceback_message}")
+        return _ObservationError(
+            f"\n{self.exception_type}:\n{self.formatted_traceback()}"
+        )
 
     def resolve_exception_type(self) -> type:
         """Attempt to resolve the actual type of the exception that caused this error observation.
@@ -88,51 +113,71 @@ class ErrorObservation(Observation):
         else:
             return etype
 
-    def from_exception(exception: Exception) -> "ErrorObservation":
-        """Factory method that will build an instance from an `Exception`.
+    def from_exception(
+        exception: Exception, traceback: bool = True
+    ) -> "ErrorObservation":
+        """Factory method that will build an instance from an `Exception`. The traceback is captured without reading any source files and is only formatted when it is first required (see `formatted_traceback`, e.g. via `exception()`, or when the observation is serialized), error observations that are never inspected are cheap to create.
 
         Args:
             exception (Exception): the exception
+            traceback (bool, optional): whether to capture the traceback, if False `traceback_message` is just the exception type and message. This is useful for expected errors (see `wrap_observation`). Defaults to True.
+
         Returns:
             ErrorActiveObservation: the error observation
         """
-        exception_type = get_fully_qualified_name(exception)
-        traceback_message = "".join(
-            traceback.format_exception(
-                type(exception), value=exception, tb=exception.__traceback__
-            )
-        )
-        return ErrorObservation(
-            exception_type=exception_type,
-            exception_args=exception.__dict__,  # TODO deepcopy?
-            traceback_message=traceback_message,
-        )
+        return _from_exception(ErrorObservation, exception, traceback)
 
 
 class ErrorActiveObservation(ErrorObservation, ActiveObservation):
     """An observation that contains an error and was the result of an action."""
 
-    def from_exception(action: Event, exception: Exception) -> "ErrorActiveObservation":
-        """Factory for `ErrorActiveObservation` that will build an instance from an `Exception`.
+    def from_exception(
+        action: Event, exception: Exception, traceback: bool = True
+    ) -> "ErrorActiveObservation":
+        """Factory for `ErrorActiveObservation` that will build an instance from an `Exception`, see `ErrorObservation.from_exception` for details.
 
         Args:
             action (Event): the action that led to the exception
             exception (Exception): the exception
+            traceback (bool, optional): whether to capture the traceback, if False `traceback_message` is just the exception type and message. Defaults to True.
 
         Returns:
             ErrorActiveObservation: the error observation
         """
-        exception_type = get_fully_qualified_name(exception)
-        traceback_message = "".join(
-            traceback.format_exception(
-                type(exception), value=exception, tb=exception.__traceback__
-            )
+        action_id = action.id if isinstance(action, Event) else action
+        return _from_exception(
+            ErrorActiveObservation, exception, traceback, action_id=action_id
         )
-        return ErrorActiveObservation(
+
+
+class ConflictObservation(ErrorActiveObservation):
+    """An observation indicating that an action was aborted because it conflicted with other actions (see `ActionCommit`). The action did not modify the state of the environment and may be retried, typically on the next cycle.
+
+    Conflicts are expected in normal operation and so no traceback is recorded.
+    """
+
+    keys: list[Any] = Field(default_factory=list)
+
+    def from_exception(
+        action: Event, exception: Exception, keys: list[Any] = ()
+    ) -> "ConflictObservation":
+        """Factory for `ConflictObservation` that will build an instance from an `Exception`.
+
+        Args:
+            action (Event): the action that was aborted.
+            exception (Exception): the exception that describes the conflict.
+            keys (list[Any], optional): the keys on which the conflict occurred. Defaults to ().
+
+        Returns:
+            ConflictObservation: the conflict observation
+        """
+        exception_type = get_fully_qualified_name(exception)
+        return ConflictObservation(
             action_id=action,
             exception_type=exception_type,
-            exception_args=exception.__dict__,  # TODO deepcopy?
-            traceback_message=traceback_message,
+            exception_args=exception.__dict__,
+            traceback_message=f"{exception_type}: {exception}",
+            keys=list(keys),
         )
 
 
@@ -140,12 +185,43 @@ class _ObservationError(Exception):
     """Wrapper exception class that will contain information about an exception that occured during observation computation."""
 
 
-def wrap_observation(fun):
+def _from_exception(
+    cls: type[ErrorObservation],
+    exception: Exception,
+    capture: bool,
+    **fields: Any,
+) -> ErrorObservation:
+    exception_type = get_fully_qualified_name(exception)
+    fields["exception_type"] = exception_type
+    fields["exception_args"] = dict(exception.__dict__)
+    fields["traceback_message"] = f"{exception_type}: {exception}"
+    observation = cls(**fields)
+    if capture:
+        observation._traceback = traceback.TracebackException(
+            type(exception), exception, exception.__traceback__, lookup_lines=False
+        )
+    return observation
+
+
+def wrap_observation(
+    fun=None, *, expected: type[Exception] | tuple[type[Exception], ...] = ()
+):
     """Decorator that will wrap the return value in an ActiveObservation or ErrorActiveObservation if there was an exception. Assumes that `action` is the first argument of the given function.
 
+    Errors that are expected in normal operation (e.g. an agent attempting an invalid move) may be given as `expected`, no traceback is captured for these errors (see `ErrorObservation.from_exception`).
+
+    Example:
+    ```
+    @wrap_observation(expected=InvalidMoveError)
+    def __select__(self, action): ...
+    ```
+
     Args:
         fun: function to decorate.
+        expected (type[Exception] | tuple[type[Exception], ...], optional): exception types for which no traceback is captured. Defaults to ().
     """
+    if fun is None:
+        return lambda fun: wrap_observation(fun, expected=expected)
 
     # TODO check that the first argument is an action!
     @wraps(fun)
@@ -159,7 +235,8 @@ def wrap_observation(fun):
             else:
                 return result
         except Exception as e:
-            return ErrorActiveObservation.from_exception(action, e)
+            traceback = not isinstance(e, expected)
+            return ErrorActiveObservation.from_exception(action, e, traceback)
 
     return _wrap
 
@@ -0,0 +1,80 @@
+"""Module defines the event type registry, every `Event` type is given a stable integer tag when it is defined. Tags are used in place of type names where types must be identified cheaply, e.g. in routing tables (see `TypeRouter`) and in serialized events (see `demistar.event.codec`)."""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .event import Event
+
+__all__ = ("event_tag", "event_type", "event_types")
+
+# tag -> event type, see `_register`
+_TYPES: dict[int, type[Event]] = dict()
+_TYPES_LOCK = threading.Lock()
+_TAG_LIMIT = 1 << 32
+
+
+def event_tag(event_type: type[Event]) -> int:
+    """Get the tag of an event type. Unless it is given explicitly (e.g. `class MyEvent(Event, tag=1234)`) the tag is a 32 bit hash of the fully qualified name of the type, it is the same in every process.
+
+    Args:
+        event_type (type[Event]): the event type.
+
+    Returns:
+        int: the tag.
+    """
+    return event_type.__event_tag__
+
+
+def event_type(tag: int) -> type[Event]:
+    """Get the event type that has the given tag (see `event_tag`). The type must be defined (imported) in this process.
+
+    Args:
+        tag (int): the tag.
+
+    Raises:
+        KeyError: if no event type has this tag.
+
+    Returns:
+        type[Event]: the event type.
+    """
+    try:
+        return _TYPES[tag]
+    except KeyError:
+        raise KeyError(f"No event type has tag: {tag}") from None
+
+
+def event_types() -> dict[int, type[Event]]:
+    """Get all registered event types.
+
+    Returns:
+        dict[int, type[Event]]: tag -> event type.
+    """
+    return dict(_TYPES)
+
+
+def _name(event_type: type) -> str:
+    return f"{event_type.__module__}.{event_type.__qualname__}"
+
+
+def _register(event_type: type[Event], tag: int | None = None) -> int:
+    # called when an event type is defined, see `Event.__init_subclass__`
+    if tag is None:
+        tag = zlib.crc32(_name(event_type).encode()) or 1
+    elif not 0 < tag < _TAG_LIMIT:
+        raise ValueError(
+            f"Event type tag must be in [1, {_TAG_LIMIT}), received: {tag}"
+        )
+    with _TYPES_LOCK:
+        other = _TYPES.get(tag)
+        # a type with the same name replaces the existing type (e.g. if a module is reloaded)
+        if other is not None and _name(other) != _name(event_type):
+            raise TypeError(
+                f"Event type {_name(event_type)} has the same tag ({tag}) as {_name(other)}, give one of them an explicit tag, e.g. `class {event_type.__name__}(Event, tag=...)`."
+            )
+        _TYPES[tag] = event_type
+    event_type.__event_tag__ = tag
+    return tag
@@ -11,6 +11,7 @@ from .windowevent import (
     WindowOpenEvent,
     ScreenSizeEvent,
 )
+from .coalesce import Coalescer  # noqa: F401 (exported by `demistar.event`)
 
 __all__ = (
     "KeyEvent",
@@ -0,0 +1,136 @@
+"""Module defines the `Coalescer` class which merges bursts of user input events (e.g. mouse motion, window moves, key repeats) into consolidated events, see class documentation for details."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+
+from ..event import Event
+from .keyevent import KeyEvent
+from .mouseevent import MouseMotionEvent
+from .windowevent import ScreenSizeEvent, WindowMoveEvent, WindowResizeEvent
+
+__all__ = ("Coalescer",)
+
+# event -> group key (or None if the event should not be coalesced)
+KeyFunc = Callable[[Event], Hashable | None]
+# (earlier event, later event) -> merged event
+MergeFunc = Callable[[Event, Event], Event]
+
+
+def _keep_last(_: Event, event: Event) -> Event:
+    return event
+
+
+def _by_source(event: Event) -> Hashable:
+    return type(event), event.source
+
+
+def _key_hold(event: KeyEvent) -> Hashable | None:
+    # only repeats are coalesced, presses and releases are always kept
+    if event.status == KeyEvent.HOLD:
+        return KeyEvent, event.source, event.keycode
+    return None
+
+
+def _merge_motion(first: MouseMotionEvent, event: MouseMotionEvent) -> Event:
+    (x1, y1), (x2, y2) = first.relative, event.relative
+    return type(event).unchecked(**{**event.__dict__, "relative": (x1 + x2, y1 + y2)})
+
+
+class Coalescer:
+    """Merges bursts of user input events into consolidated events, typically so that an agent sees one event per cycle in place of many (see the `coalesce` option of `IOSensor`). A coalescer is a callable that takes a list of events and returns a (shorter) list of events, it may also be used directly in a sensors `__transduce__`.
+
+    Events are merged according to rules that are given per event type, each rule has a `key` function that gives the group of an event (or None if the event should not be merged), and a `merge` function that merges two events in the same group. By default:
+    - `MouseMotionEvent`s are merged per source, the `relative` motion is summed and the last `position` (and `target`) is kept.
+    - `WindowMoveEvent`s, `WindowResizeEvent`s and `ScreenSizeEvent`s are merged per source, the last `position`/`size` is kept.
+    - `KeyEvent`s with status HOLD (key repeats) are merged per source and key, the last repeat is kept.
+
+    Order is preserved with respect to events that are not merged (e.g. `MouseButtonEvent`s or key presses), such events end all open groups, so that for example a click is always observed after the motion that preceded it and before the motion that followed it. A merged event takes the place of the first event in its group, and the `id` and `timestamp` of the last.
+
+    Example:
+    ```
+    coalescer = Coalescer()
+    coalescer.add_rule(MyEvent, key=lambda event: event.source)
+    events = coalescer(events)
+    ```
+    """
+
+    def __init__(self, default_rules: bool = True):
+        """Constructor.
+
+        Args:
+            default_rules (bool, optional): whether to add the default rules for user input events (see class documentation). Defaults to True.
+        """
+        self._rules: dict[type, tuple[KeyFunc, MergeFunc]] = dict()
+        # event type -> rule, resolved via the mro of the event type
+        self._resolved: dict[type, tuple[KeyFunc, MergeFunc] | None] = dict()
+        if default_rules:
+            self.add_rule(MouseMotionEvent, _by_source, _merge_motion)
+            self.add_rule(WindowMoveEvent, _by_source)
+            self.add_rule(WindowResizeEvent, _by_source)
+            self.add_rule(ScreenSizeEvent, _by_source)
+            self.add_rule(KeyEvent, _key_hold)
+
+    def add_rule(
+        self,
+        event_type: type[Event],
+        key: KeyFunc = _by_source,
+        merge: MergeFunc = _keep_last,
+    ) -> None:
+        """Add (or replace) the rule for an event type, the rule also applies to subtypes of the event type that do not have their own rule.
+
+        Args:
+            event_type (type[Event]): the event type.
+            key (Callable[[Event], Hashable | None], optional): gives the group of an event, events in the same group are merged, events whose key is None are not merged. Defaults to grouping by event type and source.
+            merge (Callable[[Event, Event], Event], optional): merges an event into the (merged) event that precedes it in its group. Defaults to keeping the last event.
+        """
+        self._rules[event_type] = (key, merge)
+        self._resolved.clear()
+
+    def remove_rule(self, event_type: type[Event]) -> None:
+        """Remove the rule for an event type, events of this type will no longer be merged (unless a rule is given for one of its parent types).
+
+        Args:
+            event_type (type[Event]): the event type.
+        """
+        self._rules.pop(event_type, None)
+        self._resolved.clear()
+
+    def __call__(self, events: Iterable[Event]) -> list[Event]:
+        """Coalesce events.
+
+        Args:
+            events (Iterable[Event]): the events, in the order they occurred.
+
+        Returns:
+            list[Event]: the coalesced events, in order.
+        """
+        result: list[Event] = []
+        groups: dict[Hashable, int] = dict()  # group key -> index in result
+        for event in events:
+            rule = self._rule(type(event))
+            key = rule[0](event) if rule else None
+            if key is None:
+                groups.clear()
+                result.append(event)
+            elif key in groups:
+                index = groups[key]
+                result[index] = rule[1](result[index], event)
+            else:
+                groups[key] = len(result)
+                result.append(event)
+        return result
+
+    def _rule(self, event_type: type) -> tuple[KeyFunc, MergeFunc] | None:
+        try:
+            return self._resolved[event_type]
+        except KeyError:
+            rule = next(
+                (self._rules[t] for t in event_type.__mro__ if t in self._rules), None
+            )
+            self._resolved[event_type] = rule
+            return rule
+
+    def __repr__(self) -> str:  # noqa: D105
+        names = ", ".join(t.__name__ for t in self._rules)
+        return f"{type(self).__name__}({names})"
@@ -3,15 +3,42 @@ from abc import ABC, abstractmethod
 from typing import Any
 from ray.actor import ActorHandle
 from copy import deepcopy
+import ray
 
 __all__ = ("Subscriber", "Publisher")
 
 
+class _Broadcast:
+    """A message that is published to (possibly many) subscribers. The message is put in the ray object store at most once, and every remote subscriber receives the same object ref."""
+
+    __slots__ = ("message", "_ref")
+
+    def __init__(self, message: Any):
+        self.message = message
+        self._ref = None
+
+    @property
+    def ref(self) -> ray.ObjectRef:
+        if self._ref is None:
+            self._ref = ray.put(self.message)
+        return self._ref
+
+
 class Subscriber(ABC):
     @abstractmethod
     def __notify__(self, message: Any) -> None:
         pass
 
+    def __notify_all__(self, messages: list[Any]) -> None:
+        for message in messages:
+            # broadcast messages may arrive as object refs, resolve them for subscribers that do not
+            if isinstance(message, ray.ObjectRef):
+                message = ray.get(message)
+            self.__notify__(message)
+
+    def __broadcast__(self, broadcast: _Broadcast) -> None:
+        self.__notify__(broadcast.message)
+
 
 def _SubscriberWrapper(subscriber: Any):
     if isinstance(subscriber, Subscriber):
@@ -53,10 +80,26 @@ class _SubscriberLocal(Subscriber):
 class _SubscriberRemote(Subscriber):
     def __init__(self, actor_handle: ActorHandle):
         self._handle = actor_handle
+        # remote actors that only implement `__notify__` are notified one message at a time
+        self._notify_all = hasattr(actor_handle, "__notify_all__")
 
     def __notify__(self, message: Any) -> None:
         self._handle.__notify__.remote(deepcopy(message))
 
+    def __notify_all__(self, messages: list[Any]) -> None:
+        if self._notify_all:
+            self._handle.__notify_all__.remote(deepcopy(messages))
+        else:
+            for message in messages:
+                self.__notify__(message)
+
+    def __broadcast__(self, broadcast: _Broadcast) -> None:
+        if self._notify_all:
+            # the ref is nested so that ray does not resolve it, it is resolved lazily by the subscriber
+            self._handle.__notify_all__.remote([broadcast.ref])
+        else:
+            self.__notify__(broadcast.message)
+
     def __eq__(self, other):
         if isinstance(other, _SubscriberRemote):
             return self._handle == other._handle
@@ -1,6 +1,6 @@
 from typing import Any
 from functools import partial
-from ._pubsub import Publisher, Subscriber
+from ._pubsub import Publisher, Subscriber, _Broadcast
 from ..utils import _LOGGER, TypeRouter
 
 
@@ -15,7 +15,7 @@ class TypePublisher(Publisher):
         topic: type | list[type],
         subscriber: Subscriber,
     ) -> None:
-        _subscriber = partial(subscriber.__notify__)
+        _subscriber = partial(subscriber.__broadcast__)
         self._router.add(_subscriber, route_types=topic)
         _LOGGER.debug(f"{self} new subscription: {subscriber} to topic: {topic}")
 
@@ -25,4 +25,9 @@ class TypePublisher(Publisher):
         )
 
     def publish(self, message: Any) -> None:
-        self._router(message)
+        subscribers = self._router.routes(type(message))
+        if subscribers:
+            # the message is shared by all subscribers, see `_Broadcast`
+            broadcast = _Broadcast(message)
+            for subscriber in subscribers:
+                subscriber(broadcast)
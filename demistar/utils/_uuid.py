@@ -1,16 +1,200 @@
 """Module implements UUID functionality that is used internally to generate unique ids for various objects (including events, agents and ambients)."""
 
+import os
+import sys
+import threading
 import time
-import random
 import uuid
+from itertools import count
+from typing import Any
+
+# layout of an id (most significant bits first): timestamp | worker id | sequence
+_TIMESTAMP_BITS = 41  # milliseconds since the epoch, this will last until 2093
+_WORKER_BITS = 12
+_SEQUENCE_BITS = 11
+_EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+
+_WORKER_LIMIT = 1 << _WORKER_BITS
+_SEQUENCE_LIMIT = 1 << _SEQUENCE_BITS
+# worker ids are partitioned, assigned ids (environment variable or ray) never collide with process ids
+_ASSIGNED_WORKER_LIMIT = _WORKER_LIMIT >> 1
+
+WORKER_ID_ENV = "DEMISTAR_WORKER_ID"
+
+# the current block of ids: (base, sequence counter), the base holds the timestamp and worker id
+_block: tuple[int, count] | None = None
+_block_lock = threading.Lock()
+_last_ms = 0
+# (worker id, how it was assigned: "env", the ray job id or None if it is the process id)
+_worker: tuple[int, str | None] | None = None
+# the object that ties a worker id leased from ray to this process (see `_WorkerIdAllocator`)
+_lease = None
+_forked = False
 
 
 def int64_uuid() -> int:
-    timestamp = int(time.time() * 1000)  # Convert current time to milliseconds
-    rand_number = random.getrandbits(32)  # Generate a 32-bit random number
-    unique_id = (timestamp << 32) | rand_number  # Combine timestamp and random number
-    unique_id &= 0xFFFFFFFFFFFFFFFF  # Ensure the result is a 64-bit unsigned integer
-    return unique_id
+    """Generate a unique 64-bit id. Ids are snowflake-style, they combine a timestamp, the id of the worker (process) that generated them and a sequence number.
+
+    Generating an id is typically just an increment of the sequence number, the timestamp is only read when the sequence of the current block of ids is exhausted. Ids that are generated by the same process are strictly increasing.
+
+    Ids are unique as long as no two processes that are running at the same time have the same worker id. The worker id is determined (in order of preference) by:
+    - the `DEMISTAR_WORKER_ID` environment variable, an integer in [0, 2048) that must be unique among running processes.
+    - a cluster wide allocator (a named ray actor), if ray has been initialised in this process. Worker ids are leased, the lease of a process is released when the process exits, so at most 2048 processes that are running at the same time may hold one (a `RuntimeError` is raised after that).
+    - the process id (modulo 2048). This is NOT guaranteed to be unique: processes on different machines, or on the same machine whose ids are equal modulo 2048, will collide. Set `DEMISTAR_WORKER_ID` or initialise ray if ids must be unique across these processes.
+
+    A process whose worker id was not assigned by the environment variable will acquire a new worker id when ray is initialised or shutdown. A forked child process will always acquire a new worker id from its process id.
+
+    Returns:
+        int: the id.
+    """
+    while True:
+        block = _block
+        if block is not None:
+            sequence = next(block[1])
+            if sequence < _SEQUENCE_LIMIT:
+                return block[0] | sequence
+        _next_block(block)
+
+
+def _next_block(block: tuple[int, count] | None) -> None:
+    global _block, _last_ms
+    # this may call into ray, it is resolved before taking the lock
+    worker = _worker_id()
+    with _block_lock:
+        if _block is not block:
+            return  # another thread got here first
+        # the clock may go backwards (or the previous block was exhausted within a millisecond)
+        ms = max(int(time.time() * 1000) - _EPOCH_MS, _last_ms + 1)
+        _last_ms = ms
+        base = (ms << (_WORKER_BITS + _SEQUENCE_BITS)) | (worker << _SEQUENCE_BITS)
+        _block = (base & 0xFFFFFFFFFFFFFFFF, count())
+
+
+def _worker_id() -> int:
+    global _worker
+    # ray may be initialised (or shutdown) after the worker id was assigned
+    # threads may race to assign it, each is given a distinct worker id and the last one is kept
+    if _worker is None or (_worker[1] != "env" and _worker[1] != _ray_job()):
+        _worker = _assign_worker_id()
+    return _worker[0]
+
+
+def _assign_worker_id() -> tuple[int, str | None]:
+    # a forked child shares its environment (and ray connection) with its parent, neither can be used
+    value = os.environ.get(WORKER_ID_ENV)
+    if value is not None and not _forked:
+        worker = int(value)
+        if not 0 <= worker < _ASSIGNED_WORKER_LIMIT:
+            raise ValueError(
+                f"{WORKER_ID_ENV} must be in [0, {_ASSIGNED_WORKER_LIMIT}), received: {value}"
+            )
+        return worker, "env"
+    job = _ray_job()
+    if job is not None:
+        return _ray_worker_id(), job
+    return _pid_worker_id(), None
+
+
+def _ray_job() -> str | None:
+    # ray is not imported here, it is only used if it has already been imported and initialised
+    ray = sys.modules.get("ray")
+    if _forked or ray is None or not ray.is_initialized():
+        return None
+    return ray.get_runtime_context().get_job_id()
+
+
+def _pid_worker_id() -> int:
+    return _ASSIGNED_WORKER_LIMIT + os.getpid() % _ASSIGNED_WORKER_LIMIT
+
+
+def _allocator_class() -> type:
+    # the class is defined here so that it is serialized by value, the allocator must not import this package (importing it generates ids, which would lease from the allocator itself)
+    class _WorkerIdAllocator:
+        """Leases worker ids to ray worker processes, it runs as a detached ray actor (see `_ray_worker_id`).
+
+        A process leases a worker id by passing an object that it owns (see `ray.put`), the lease is held for as long as the process is alive. Ray releases an object when its owner dies, leases whose object has been lost are reclaimed when no worker ids are free.
+        """
+
+        def __init__(self, limit: int = _ASSIGNED_WORKER_LIMIT):
+            self._free = list(range(limit - 1, -1, -1))  # the lowest id is leased first
+            # worker id -> object owned by the lessee
+            self._leases: dict[int, Any] = dict()
+
+        def allocate(self, owner: list) -> int | None:
+            """Lease a worker id.
+
+            Args:
+                owner (list[ray.ObjectRef]): an object owned by the lessee, it is wrapped in a list so that ray does not resolve it.
+
+            Returns:
+                int | None: the worker id, or None if all worker ids are leased by running processes.
+            """
+            if not self._free:
+                self._reclaim()
+            if not self._free:
+                return None
+            worker = self._free.pop()
+            self._leases[worker] = owner[0]
+            return worker
+
+        def _reclaim(self) -> None:
+            import ray
+
+            for worker, owner in list(self._leases.items()):
+                try:
+                    ray.get(owner, timeout=1)
+                except ray.exceptions.GetTimeoutError:
+                    continue  # the owner is alive but slow to respond
+                except ray.exceptions.RayError:
+                    # the object was lost with its owner
+                    del self._leases[worker]
+                    self._free.append(worker)
+            self._free.sort(reverse=True)
+
+    return _WorkerIdAllocator
+
+
+def _ray_worker_id() -> int:
+    global _lease
+    import ray
+
+    allocator = (
+        ray.remote(num_cpus=0)(_allocator_class())
+        .options(
+            name="_WorkerIdAllocator",
+            namespace="demistar",
+            lifetime="detached",
+            get_if_exists=True,
+        )
+        .remote()
+    )
+    # the lease is released when this process (the owner of the object) exits
+    lease = ray.put(None)
+    worker = ray.get(allocator.allocate.remote([lease]))
+    if worker is None:
+        raise RuntimeError(
+            f"All {_ASSIGNED_WORKER_LIMIT} worker ids are leased by running processes in this ray cluster."
+        )
+    _lease = lease
+    return worker
+
+
+def _after_fork() -> None:
+    global _block, _worker, _forked, _block_lock, _lease
+    _block_lock = threading.Lock()
+    _block, _worker, _forked, _lease = None, None, True, None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _unpack(id: int) -> tuple[int, int, int]:
+    # (timestamp in milliseconds since the unix epoch, worker id, sequence number) of an id
+    sequence = id & (_SEQUENCE_LIMIT - 1)
+    worker = (id >> _SEQUENCE_BITS) & (_WORKER_LIMIT - 1)
+    ms = id >> (_WORKER_BITS + _SEQUENCE_BITS)
+    return ms + _EPOCH_MS, worker, sequence
 
 
 def str_uuid4() -> str:
@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..event import Event
 
-__all__ = ("UnknownEventType",)
+__all__ = ("UnknownEventType", "ActionConflict")
 
 
 class DemistarInternalError(Exception):
@@ -25,3 +25,7 @@ class UnknownEventType(TypeError):
         event_type = type(event)
         super().__init__(f"Unknown event type: {event_type}.")
         self.event_type = event_type
+
+
+class ActionConflict(Exception):
+    """Exception raised when an action conflicts with other actions and cannot be applied."""
@@ -24,10 +24,10 @@ class TypeRouter:
         @lru_cache(maxsize=cache_size)
         def _get_funcs(t: type):
             for t in t.mro():
-                funcs = self._router.get(TypeRouter.fully_qualified_name(t), None)
+                funcs = self._router.get(TypeRouter.route_key(t), None)
                 if funcs:
                     return funcs
-            return self._router.get(TypeRouter.fully_qualified_name(typing.Any), [])
+            return self._router.get(TypeRouter.route_key(typing.Any), [])
 
         self._get_funcs = _get_funcs
 
@@ -49,11 +49,21 @@ class TypeRouter:
             raise ValueError(f"Failed to resolve `route_types` for function: {func}.")
 
         for t in route_types:
-            fqn = TypeRouter.fully_qualified_name(t)
-            self._router[fqn].append(func)
+            self._router[TypeRouter.route_key(t)].append(func)
         # cache must be recomputed if we add a new type
         self._get_funcs.cache_clear()
 
+    def routes(self, event_type: type) -> list[Callable]:
+        """Get the functions that instances of the given type will be routed to (see `__call__`).
+
+        Args:
+            event_type (type): the type to route.
+
+        Returns:
+            list[Callable]: the functions (may be empty if no type-compatible functions were found).
+        """
+        return list(self._get_funcs(event_type))
+
     def __call__(self, event: Any, *args, **kwargs) -> list[Any]:
         """Routes the given `event` to type-compatible functions. If there is not exact type match, the called function is resvolved via the instance types method resolution order (mro). The function(s) that are assocaited with the inherited type that is highest in this hierarchy (i.e. the closest parent type) are called.
 
@@ -70,6 +80,19 @@ class TypeRouter:
             result.append(func(event, *args, **kwargs))
         return result
 
+    @staticmethod
+    def route_key(type: type) -> int | str:
+        """Get the key of the given type in the routing table. Event types are keyed by their tag (see `demistar.event.registry`), other types are keyed by their fully qualified name.
+
+        Args:
+            type (type): type to get the key of.
+
+        Returns:
+            int | str: the key.
+        """
+        tag = getattr(type, "__event_tag__", None)
+        return tag if tag is not None else TypeRouter.fully_qualified_name(type)
+
     @staticmethod
     def fully_qualified_name(type: type) -> str:
         """Get the fully qualified type name of the given type.
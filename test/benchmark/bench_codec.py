@@ -0,0 +1,54 @@
+"""Benchmark of the binary event codec (see `demistar.event.codec`), compares the size and encode/decode time of a stream of user input events with pickle.
+
+Run from the repository root with: `PYTHONPATH=. python test/benchmark/bench_codec.py`
+"""
+
+import pickle
+import random
+import timeit
+
+from demistar.event import KeyEvent, MouseMotionEvent
+from demistar.event.codec import encode, decode, encode_batch, decode_batch
+
+
+def _events(n: int) -> list:
+    events = []
+    for i in range(n):
+        if i % 4:
+            x, y = random.randint(0, 1920), random.randint(0, 1080)
+            dx, dy = random.randint(-5, 5), random.randint(-5, 5)
+            events.append(MouseMotionEvent(position=(x, y), relative=(dx, dy)))
+        else:
+            events.append(KeyEvent(key="a", keycode=65, status=i % 3))
+    return events
+
+
+def _bench(name: str, stmt, size: int, n: int, number: int = 10) -> None:
+    seconds = min(timeit.repeat(stmt, number=number, repeat=5)) / number
+    print(f"{name:<32} {seconds / n * 1e6:8.3f} us/event {size / n:8.1f} bytes/event")
+
+
+def main() -> None:  # noqa: D103
+    events = _events(10000)
+    n = len(events)
+    pickled = [pickle.dumps(event) for event in events]
+    encoded = [encode(event) for event in events]
+    batch = encode_batch(events)
+    pickled_batch = pickle.dumps(events)
+
+    size = sum(map(len, pickled))
+    _bench("pickle (each)", lambda: [pickle.dumps(e) for e in events], size, n)
+    _bench("unpickle (each)", lambda: [pickle.loads(p) for p in pickled], size, n)
+    size = len(pickled_batch)
+    _bench("pickle (list)", lambda: pickle.dumps(events), size, n)
+    _bench("unpickle (list)", lambda: pickle.loads(pickled_batch), size, n)
+    size = sum(map(len, encoded))
+    _bench("encode (each)", lambda: [encode(e) for e in events], size, n)
+    _bench("decode (each)", lambda: [decode(e) for e in encoded], size, n)
+    size = len(batch)
+    _bench("encode_batch", lambda: encode_batch(events), size, n)
+    _bench("decode_batch", lambda: decode_batch(batch), size, n)
+
+
+if __name__ == "__main__":
+    main()
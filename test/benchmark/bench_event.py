@@ -0,0 +1,96 @@
+"""Benchmark of event creation and mutation, compares validated events with the fast path (see `Event.unchecked` and `Event.set_unchecked`), and error observations with and without a traceback (see `ErrorObservation.from_exception`).
+
+Run from the repository root with: `PYTHONPATH=. python test/benchmark/bench_event.py`
+"""
+
+import timeit
+
+from demistar.agent import Agent
+from demistar.agent.component import Component, Sensor
+from demistar.event import Event, Action, ActiveObservation, ErrorObservation
+
+
+class _ListEvent(Event):
+    values: list[int]
+
+
+def _error(depth: int) -> Exception:
+    # an exception with a traceback of the given depth
+    def _raise(depth: int):
+        if depth:
+            _raise(depth - 1)
+        raise ValueError("invalid")
+
+    try:
+        _raise(depth)
+    except ValueError as e:
+        return e
+
+
+class _Agent(Agent):
+    def __cycle__(self):
+        pass
+
+
+def _bench(name: str, stmt, number: int = 100000, events: int = 1) -> None:
+    seconds = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{name:<40} {seconds / (number * events) * 1e6:8.3f} us/event")
+
+
+def main() -> None:  # noqa: D103
+    _bench("Event()", lambda: Event())
+    _bench("Event.unchecked()", lambda: Event.unchecked())
+    _bench("Event.model_construct()", lambda: Event.model_construct(), number=10000)
+    _bench(
+        "ActiveObservation(...)",
+        lambda: ActiveObservation(action_id=1, value=1),
+    )
+    _bench(
+        "ActiveObservation.unchecked(...)",
+        lambda: ActiveObservation.unchecked(action_id=1, value=1),
+    )
+    values = list(range(1000))
+    _bench("_ListEvent(values=...)", lambda: _ListEvent(values=values), number=10000)
+    _bench(
+        "_ListEvent.unchecked(values=...)",
+        lambda: _ListEvent.unchecked(values=values),
+        number=10000,
+    )
+    event = Event()
+
+    def _assign():
+        event.source = 1
+
+    _bench("event.source = ...", _assign)
+    _bench("event.set_unchecked(source=...)", lambda: event.set_unchecked(source=1))
+
+    sensor = Sensor()
+    _Agent(sensors=[sensor], actuators=[])
+    actions = [Action() for _ in range(100)]
+    _bench(
+        "Component.set_event_source",
+        lambda: Component.set_event_source(sensor, actions),
+        number=1000,
+        events=len(actions),
+    )
+
+    exception = _error(10)
+    _bench(
+        "ErrorObservation.from_exception",
+        lambda: ErrorObservation.from_exception(exception),
+        number=10000,
+    )
+    _bench(
+        "ErrorObservation.from_exception (format)",
+        lambda: ErrorObservation.from_exception(exception).formatted_traceback(),
+        number=10000,
+    )
+    _bench(
+        "ErrorObservation.from_exception (none)",
+        lambda: ErrorObservation.from_exception(exception, traceback=False),
+        number=10000,
+    )
+
+
+if __name__ == "__main__":
+    main()
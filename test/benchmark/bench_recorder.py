@@ -0,0 +1,49 @@
+"""Benchmark of event recording, compares the cost of recording events with an `ArrowRecorder` to writing them as JSON lines.
+
+Run from the repository root with: `PYTHONPATH=. python test/benchmark/bench_recorder.py`
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from demistar.environment import ArrowRecorder
+from demistar.event import ActiveObservation, MouseMotionEvent
+
+
+def _events(n: int) -> list:
+    events = []
+    for i in range(n // 2):
+        events.append(MouseMotionEvent(position=(i, i), relative=(1, 1)))
+        events.append(ActiveObservation(action_id=i, value=[i, i]))
+    return events
+
+
+def _report(name: str, seconds: float, n: int) -> None:
+    print(f"{name:<40} {seconds / n * 1e6:8.3f} us/event")
+
+
+def main() -> None:  # noqa: D103
+    events = _events(200000)
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = ArrowRecorder(directory)
+        start = time.perf_counter()
+        for event in events:
+            recorder.record(event)
+        _report("ArrowRecorder.record", time.perf_counter() - start, len(events))
+        recorder.close()
+        _report("ArrowRecorder (total)", time.perf_counter() - start, len(events))
+        size = sum(path.stat().st_size for path in recorder.paths().values())
+
+        start = time.perf_counter()
+        path = Path(directory, "events.jsonl")
+        with open(path, "w") as file:
+            for event in events:
+                file.write(event.model_dump_json())
+                file.write("\n")
+        _report("model_dump_json (total)", time.perf_counter() - start, len(events))
+        print(f"parquet: {size / 1e6:.1f} MB, json: {path.stat().st_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Benchmark of id generation, compares `int64_uuid` with the previous implementation (a millisecond timestamp combined with 32 random bits).
+
+Run from the repository root with: `PYTHONPATH=. python test/benchmark/bench_uuid.py`
+"""
+
+import random
+import time
+import timeit
+
+from demistar.utils import int64_uuid
+
+
+def _int64_uuid_random() -> int:
+    timestamp = int(time.time() * 1000)
+    rand_number = random.getrandbits(32)
+    return ((timestamp << 32) | rand_number) & 0xFFFFFFFFFFFFFFFF
+
+
+def _bench(name: str, stmt, number: int = 1000000) -> None:
+    seconds = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{name:<40} {seconds / number * 1e9:8.1f} ns/id")
+
+
+def main() -> None:  # noqa: D103
+    _bench("int64_uuid (random)", _int64_uuid_random)
+    _bench("int64_uuid (snowflake)", int64_uuid)
+
+
+if __name__ == "__main__":
+    main()
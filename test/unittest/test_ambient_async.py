@@ -0,0 +1,106 @@
+"""Unit tests for ambients that declare async `__select__` and `__update__` methods."""
+
+import asyncio
+import unittest
+
+from demistar.environment import Ambient, ActionCommit
+from demistar.environment.ambient import _Ambient, _AmbientLocalAsync
+from demistar.event import Action, ActiveObservation
+from demistar.agent.component._observations import _Observations
+
+
+class SetAction(Action):  # noqa: D101
+    name: str
+    value: int
+
+
+class GetAction(Action):  # noqa: D101
+    name: str
+
+
+class MyAsyncAmbient(Ambient):
+    """Test ambient that simulates an IO-backed key-value store."""
+
+    def __init__(self, latency: float = 0.05, commit: ActionCommit = None):  # noqa: D107
+        super().__init__([], commit=commit)
+        self.state = {}
+        self.latency = latency
+        self.running = 0
+        self.max_running = 0
+
+    async def _io(self):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.latency)
+        self.running -= 1
+
+    async def __select__(self, action):  # noqa: D105
+        await self._io()
+        return ActiveObservation(action_id=action, value=self.state.get(action.name))
+
+    async def __update__(self, action):  # noqa: D105
+        await self._io()
+        self.state[action.name] = action.value
+        return ActiveObservation(action_id=action, value=action.value)
+
+
+class MyMixedAmbient(Ambient):
+    """Test ambient that (incorrectly) mixes async and sync methods."""
+
+    async def __select__(self, action):  # noqa: D105
+        pass
+
+    def __update__(self, action):  # noqa: D105
+        pass
+
+
+class TestAmbientAsync(unittest.TestCase):
+    """Unit tests for async ambients."""
+
+    def test_new(self):
+        """The async facade is used for async ambients, mixed ambients are rejected."""
+        self.assertIsInstance(_Ambient.new(MyAsyncAmbient()), _AmbientLocalAsync)
+        with self.assertRaises(TypeError):
+            _Ambient.new(MyMixedAmbient([]))
+        with self.assertRaises(TypeError):
+            _Ambient.new(MyAsyncAmbient(commit=ActionCommit()))
+
+    def test_concurrent(self):
+        """Actions are executed concurrently up to the concurrency limit."""
+        ambient = MyAsyncAmbient()
+        state = _Ambient.new(ambient, concurrency=4)
+
+        async def _run():
+            futures = state.__update__(
+                [SetAction(name=str(i), value=i) for i in range(8)]
+            )
+            observations = _Observations(futures)
+            # nothing has completed yet, sync iteration stops at pending futures
+            self.assertListEqual(list(observations), [])
+            start = asyncio.get_running_loop().time()
+            await state.__commit__()
+            elapsed = asyncio.get_running_loop().time() - start
+            return [o.value for o in observations], elapsed
+
+        values, elapsed = asyncio.run(_run())
+        self.assertListEqual(values, list(range(8)))
+        self.assertEqual(ambient.max_running, 4)
+        # 8 actions, 4 at a time, is 2 rounds of latency (rather than 8)
+        self.assertLess(elapsed, 4 * ambient.latency)
+
+    def test_async_iteration(self):
+        """Async iteration awaits pending observations."""
+        ambient = MyAsyncAmbient(latency=0.01)
+        ambient.state["x"] = 1
+        state = _Ambient.new(ambient)
+
+        async def _run():
+            observations = _Observations(state.__select__([GetAction(name="x")]))
+            iterator = aiter(observations)
+            return (await anext(iterator)).value
+
+        self.assertEqual(asyncio.run(_run()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Unit tests for the `EventBatch` class."""
+
+import pickle
+import unittest
+
+import numpy as np
+
+from demistar.agent import IOSensor
+from demistar.event import EventBatch, KeyEvent, MouseMotionEvent
+
+
+def _motion(n):
+    return [
+        MouseMotionEvent(position=(float(i), 2.0), relative=(1, -1)) for i in range(n)
+    ]
+
+
+class _Device:
+    def __init__(self, events):
+        self.events = events
+
+    def get_nowait(self):
+        events, self.events = self.events, []
+        return events
+
+
+class TestEventBatch(unittest.TestCase):
+    """Unit tests for the `EventBatch` class."""
+
+    def test_from_events(self):
+        """Events are held as columns and materialized on access."""
+        events = _motion(5)
+        batch = EventBatch.from_events(events)
+        self.assertEqual(len(batch), 5)
+        self.assertIs(batch.event_type, MouseMotionEvent)
+        self.assertEqual(batch.column("position").shape, (5, 2))
+        self.assertListEqual(batch.column("relative").sum(axis=0).tolist(), [5, -5])
+        self.assertEqual(batch[0], events[0])
+        self.assertIs(type(batch[0].relative[0]), int)
+        self.assertListEqual(batch.to_events(), events)
+        self.assertListEqual(batch[1:3].to_events(), events[1:3])
+        self.assertEqual(pickle.loads(pickle.dumps(batch)), batch)
+        with self.assertRaises(ValueError):
+            EventBatch.from_events([*events, KeyEvent(key="a", keycode=1, status=0)])
+
+    def test_object_columns(self):
+        """Values that have no numeric representation are held in object columns."""
+        events = [KeyEvent(key="a", keycode=1, status=0, source=1 << 70)]
+        batch = EventBatch.from_events(events)
+        self.assertEqual(batch.column("source").dtype, np.dtype(object))
+        self.assertEqual(batch[0], events[0])
+
+    def test_group(self):
+        """Events are grouped into one batch per type."""
+        key = KeyEvent(key="a", keycode=1, status=0)
+        batches = EventBatch.group([*_motion(2), key, *_motion(1)])
+        self.assertListEqual([len(b) for b in batches], [3, 1])
+        self.assertEqual(batches[1][0], key)
+        # empty batches are falsy (they are not pushed as observations)
+        self.assertFalse(EventBatch.from_events([], MouseMotionEvent))
+
+    def test_io_sensor(self):
+        """An `IOSensor` may observe a batch per cycle."""
+        sensor = IOSensor(_Device(_motion(10)), batch=True)
+        sensor.__query__(None)
+        batches = list(sensor.iter_observations())
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
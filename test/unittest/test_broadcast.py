@@ -0,0 +1,122 @@
+"""Unit tests for sharing broadcast messages via the ray object store."""
+
+import unittest
+from typing import Any
+
+import ray
+
+from demistar.pubsub import TypePublisher, Subscriber
+from demistar.pubsub._pubsub import _SubscriberRemote
+from demistar.environment import Ambient
+from demistar.event import Observation
+from demistar.agent.component._observations import _Observations
+
+
+class MyHandle:
+    """Stand in for a remote actor handle that records remote calls."""
+
+    def __init__(self):  # noqa: D107
+        self.calls = []
+        handle = self
+
+        class _Method:
+            def remote(self, messages):
+                handle.calls.append(messages)
+
+        self.__notify_all__ = _Method()
+
+
+class MySubscriber(Subscriber):  # noqa: D101
+    def __init__(self):  # noqa: D107
+        self.observations = _Observations()
+
+    def __notify__(self, message: Any) -> None:  # noqa: D105
+        self.observations.push(message)
+
+    def __notify_all__(self, messages: list[Any]) -> None:  # noqa: D105
+        self.observations.push_all(messages)
+
+
+class MyAmbient(Ambient):  # noqa: D101
+    def __select__(self, action):  # noqa: D105
+        pass
+
+    def __update__(self, action):  # noqa: D105
+        pass
+
+
+class TestBroadcast(unittest.TestCase):
+    """Unit tests for broadcast messages."""
+
+    @classmethod
+    def setUpClass(cls):  # noqa
+        ray.init(num_cpus=1, include_dashboard=False, log_to_driver=False)
+
+    @classmethod
+    def tearDownClass(cls):  # noqa
+        ray.shutdown()
+
+    def test_publish_once(self):
+        """All remote subscribers receive the same object ref."""
+        publisher = TypePublisher()
+        handles = [MyHandle() for _ in range(3)]
+        for handle in handles:
+            remote = _SubscriberRemote.__new__(_SubscriberRemote)
+            remote._handle = handle
+            remote._notify_all = True
+            publisher.subscribe(Observation, remote)
+        publisher.publish(Observation(value=1))
+        refs = [handle.calls[0][0] for handle in handles]
+        self.assertIsInstance(refs[0], ray.ObjectRef)
+        self.assertEqual(len(set(refs)), 1)
+        # the recipient resolves the ref when the observation is consumed
+        subscriber = MySubscriber()
+        subscriber.__notify_all__(handles[0].calls[0])
+        self.assertEqual(next(subscriber.observations).value, 1)
+
+    def test_notify_only(self):
+        """Remote actors that only implement `__notify__` receive each message."""
+
+        @ray.remote
+        class NotifyOnly:
+            def __init__(self):
+                self.messages = []
+
+            def __notify__(self, message):
+                self.messages.append(message)
+
+            def get_messages(self):
+                return self.messages
+
+        handle = NotifyOnly.remote()
+        publisher = TypePublisher()
+        publisher.subscribe(Observation, _SubscriberRemote(handle))
+        publisher.publish(Observation(value=1))
+        _SubscriberRemote(handle).__notify_all__([Observation(value=2)])
+        messages = ray.get(handle.get_messages.remote())
+        self.assertEqual([message.value for message in messages], [1, 2])
+
+    def test_resolve_default(self):
+        """The default `__notify_all__` resolves object refs before `__notify__`."""
+        messages = []
+
+        class NotifySubscriber(Subscriber):
+            def __notify__(self, message):
+                messages.append(message)
+
+        NotifySubscriber().__notify_all__([ray.put(Observation(value=1))])
+        self.assertEqual(messages[0].value, 1)
+
+    def test_ambient_share(self):
+        """Shared values are put in the object store once."""
+        ambient = MyAmbient([])
+        observation = Observation(value=[0] * 1000)
+        ref = ambient.share("map", observation)
+        self.assertIs(ambient.share("map", observation), ref)
+        self.assertIsNot(ambient.share("map", Observation(value=1)), ref)
+        observations = _Observations([ref])
+        self.assertEqual(len(next(observations).value), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
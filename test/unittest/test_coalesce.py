@@ -0,0 +1,107 @@
+"""Unit tests for the `Coalescer` class."""
+
+import unittest
+
+from demistar.agent import IOSensor
+from demistar.event import (
+    Coalescer,
+    Event,
+    KeyEvent,
+    MouseButtonEvent,
+    MouseMotionEvent,
+    WindowMoveEvent,
+    WindowResizeEvent,
+)
+
+
+def _motion(x, dx, source=None):
+    return MouseMotionEvent(position=(x, 0), relative=(dx, 1), source=source)
+
+
+def _key(status, key="a"):
+    return KeyEvent(key=key, keycode=ord(key), status=status)
+
+
+class _Device:
+    def __init__(self, events):
+        self.events = events
+
+    def get_nowait(self):
+        events, self.events = self.events, []
+        return events
+
+
+class MyEvent(Event):  # noqa: D101
+    value: int
+
+
+class TestCoalescer(unittest.TestCase):
+    """Unit tests for the `Coalescer` class."""
+
+    def test_mouse_motion(self):
+        """Relative motion is summed and the last position is kept."""
+        events = [_motion(x, 2) for x in range(10)]
+        (event,) = Coalescer()(events)
+        self.assertEqual(event.position, (9, 0))
+        self.assertEqual(event.relative, (20, 10))
+        self.assertEqual(event.id, events[-1].id)
+        # motion from different sources is not merged
+        events = [_motion(0, 1, source=1), _motion(1, 1, source=2), _motion(2, 1, 1)]
+        result = Coalescer()(events)
+        self.assertListEqual([e.relative for e in result], [(2, 2), (1, 1)])
+
+    def test_order(self):
+        """Events that are not merged end all open groups."""
+        click = MouseButtonEvent(button=0, position=(1, 0), status=1)
+        events = [_motion(0, 1), _motion(1, 1), click, _motion(2, 1), _motion(3, 1)]
+        result = Coalescer()(events)
+        self.assertListEqual(
+            [type(e) for e in result],
+            [MouseMotionEvent, MouseButtonEvent, MouseMotionEvent],
+        )
+        self.assertListEqual([e.relative for e in result[::2]], [(2, 2), (2, 2)])
+
+    def test_window(self):
+        """The last window position and size are kept."""
+        events = [
+            WindowMoveEvent(position=(0, 0)),
+            WindowResizeEvent(size=(10, 10)),
+            WindowMoveEvent(position=(5, 5)),
+            WindowResizeEvent(size=(20, 20)),
+        ]
+        self.assertListEqual(Coalescer()(events), events[2:])
+
+    def test_key_repeat(self):
+        """Key repeats are merged, key presses and releases are kept."""
+        hold = KeyEvent.HOLD
+        events = [
+            _key(KeyEvent.DOWN),
+            *[_key(hold) for _ in range(5)],
+            _key(hold, "b"),
+            _key(hold),
+            _key(KeyEvent.UP),
+        ]
+        result = Coalescer()(events)
+        self.assertListEqual(result, [events[0], events[7], events[6], events[8]])
+
+    def test_rules(self):
+        """Rules may be added and removed."""
+        events = [MyEvent(value=i) for i in range(3)]
+        coalescer = Coalescer(default_rules=False)
+        self.assertListEqual(coalescer(events), events)
+        coalescer.add_rule(MyEvent, merge=lambda a, b: MyEvent(value=a.value + b.value))
+        self.assertListEqual([e.value for e in coalescer(events)], [3])
+        coalescer.remove_rule(MyEvent)
+        self.assertListEqual(coalescer(events), events)
+
+    def test_io_sensor(self):
+        """An `IOSensor` may coalesce the events it reads from its device."""
+        events = [_motion(x, 1) for x in range(100)]
+        sensor = IOSensor(_Device(events), coalesce=True)
+        sensor.__query__(None)
+        (event,) = sensor.iter_observations()
+        self.assertEqual(event.relative, (100, 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Unit tests for the binary event codec, see `demistar.event.codec`."""
+
+import unittest
+
+import ray
+
+from demistar.event import (
+    Coalescer,
+    Event,
+    KeyEvent,
+    MouseButtonEvent,
+    MouseMotionEvent,
+    WindowCloseEvent,
+    ActiveObservation,
+)
+from demistar.event.codec import (
+    encode,
+    decode,
+    encode_batch,
+    decode_batch,
+    register_ray_serializer,
+)
+
+
+class MyEvent(Event):  # noqa: D101
+    count: int
+    flag: bool = False
+    name: str | None = None
+
+
+def _events():
+    return [
+        MouseMotionEvent(position=(1.5, 2.0), relative=(1, -2), source=(5 << 64) | 7),
+        MouseButtonEvent(button=0, position=(1, 2), status=1, target=["a", "b"]),
+        KeyEvent(key="é", keycode=65, status=KeyEvent.HOLD),
+        WindowCloseEvent(),
+        ActiveObservation(action_id=1, value={"x": [1, 2]}),
+        MyEvent(count=-3, flag=True),
+        MyEvent(count=1 << 70, name="big"),  # does not fit in 64 bits
+    ]
+
+
+class TestCodec(unittest.TestCase):
+    """Unit tests for the binary event codec."""
+
+    def test_encode_decode(self):
+        """Events are unchanged by encoding and decoding."""
+        for event in _events():
+            decoded = decode(encode(event))
+            self.assertIs(type(decoded), type(event))
+            self.assertEqual(decoded, event)
+        # integer coordinates remain integers
+        decoded = decode(encode(_events()[0]))
+        self.assertIs(type(decoded.relative[0]), int)
+        self.assertIs(type(decoded.position[0]), float)
+
+    def test_encode_decode_batch(self):
+        """Batches of events are unchanged by encoding and decoding, and their order is preserved."""
+        events = _events() * 3
+        self.assertListEqual(decode_batch(encode_batch(events)), events)
+        events = [KeyEvent(key="a", keycode=i, status=0) for i in range(10)]
+        self.assertListEqual(decode_batch(encode_batch(events)), events)
+        self.assertListEqual(decode_batch(encode_batch([])), [])
+
+    def test_compact(self):
+        """Encoded events are smaller than pickled events."""
+        import pickle
+
+        events = [
+            MouseMotionEvent(position=(i, i), relative=(1, 1)) for i in range(100)
+        ]
+        self.assertLess(len(encode(events[0])) * 4, len(pickle.dumps(events[0])))
+        self.assertLess(len(encode_batch(events)) * 2, len(pickle.dumps(events)))
+
+
+class TestCodecRay(unittest.TestCase):
+    """Unit tests for the binary event codec as a ray serializer."""
+
+    @classmethod
+    def setUpClass(cls):  # noqa
+        ray.init(num_cpus=1, include_dashboard=False, log_to_driver=False)
+
+    @classmethod
+    def tearDownClass(cls):  # noqa
+        ray.shutdown()
+
+    def test_ray_serializer(self):
+        """Events are encoded by the codec in the object store."""
+        register_ray_serializer()
+        event = MouseMotionEvent(position=(1.0, 2.0), relative=(1, 2))
+        self.assertEqual(ray.get(ray.put(event)), event)
+        self.assertEqual(
+            ray.get(ray.put([event, KeyEvent(key="a", keycode=1, status=0)]))[0], event
+        )
+        # only event types are registered
+        self.assertIsInstance(ray.get(ray.put(Coalescer())), Coalescer)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+"""Unit tests for the `ActionCommit` class (the commit stage of an `Ambient`)."""
+
+import asyncio
+import unittest
+
+import ray
+
+from demistar.environment import (
+    Ambient,
+    ActionCommit,
+    OptimisticCommit,
+    TransactionAction,
+    VersionedState,
+    LastWriterWins,
+    SumDeltas,
+    RejectConflicts,
+)
+from demistar.environment.ambient import _Ambient
+from demistar.event import (
+    Action,
+    ActiveObservation,
+    ErrorActiveObservation,
+    ConflictObservation,
+)
+from demistar.agent.component._observations import _Observations
+
+
+class SetAction(Action):  # noqa: D101
+    name: str
+    value: int
+
+
+class AddAction(Action):  # noqa: D101
+    name: str
+    delta: int
+
+
+class MyAmbient(Ambient):
+    """Test ambient that holds a dictionary of values."""
+
+    def __init__(self, commit: ActionCommit = None):  # noqa: D107
+        super().__init__([], commit=commit)
+        self.state = {}
+        self.updates = 0
+
+    def __select__(self, action):  # noqa: D105
+        return ActiveObservation(action_id=action, value=dict(self.state))
+
+    def __update__(self, action):  # noqa: D105
+        self.updates += 1
+        if isinstance(action, SetAction):
+            self.state[action.name] = action.value
+        elif isinstance(action, AddAction):
+            self.state[action.name] = self.state.get(action.name, 0) + action.delta
+        return ActiveObservation(action_id=action, value=self.state[action.name])
+
+
+def _new_commit():
+    commit = ActionCommit()
+    commit.add(LastWriterWins(key=lambda action: action.name), [SetAction])
+    commit.add(SumDeltas(key=lambda action: action.name, field="delta"), [AddAction])
+    return commit
+
+
+class TestActionCommit(unittest.TestCase):
+    """Unit tests for `ActionCommit`."""
+
+    def test_no_commit(self):
+        """Without a commit stage, actions are applied immediately."""
+        ambient = MyAmbient()
+        _Ambient.new(ambient).__update__([SetAction(name="a", value=1)])
+        self.assertEqual(ambient.state, {"a": 1})
+
+    def test_coalesce(self):
+        """Actions with the same key are merged into a single update."""
+        ambient = MyAmbient(_new_commit())
+        state = _Ambient.new(ambient)
+        actions = [AddAction(name="x", delta=i, source=i) for i in range(1, 5)]
+        actions.append(SetAction(name="y", value=1, source=1))
+        actions.append(SetAction(name="y", value=2, source=2))
+        futures = state.__update__(actions)
+        self.assertEqual(ambient.state, {})  # nothing is applied until commit
+        ambient.__commit__()
+        self.assertEqual(ambient.state, {"x": 10, "y": 2})
+        self.assertEqual(ambient.updates, 2)
+        # each staged action receives an observation
+        observations = list(_Observations(futures))
+        self.assertEqual([o.action_id for o in observations], [a.id for a in actions])
+
+    def test_uncommitted(self):
+        """Observations of staged actions are not consumed until they are committed."""
+        ambient = MyAmbient(_new_commit())
+        observations = _Observations(
+            _Ambient.new(ambient).__update__([SetAction(name="y", value=1)])
+        )
+        self.assertListEqual(list(observations), [])
+        ambient.__commit__()
+        self.assertEqual([o.value for o in observations], [1])
+
+    def test_order_independent(self):
+        """The result of a commit does not depend on the order actions were staged."""
+        actions = [SetAction(name="y", value=i, source=i) for i in range(1, 5)]
+        results = []
+        for ordered in (actions, list(reversed(actions))):
+            ambient = MyAmbient(_new_commit())
+            _Ambient.new(ambient).__update__(ordered)
+            ambient.__commit__()
+            results.append(ambient.state["y"])
+        self.assertEqual(results, [4, 4])
+
+    def test_conflict(self):
+        """Conflicting actions are rejected with an error observation."""
+        commit = ActionCommit()
+        commit.add(RejectConflicts(key=lambda action: action.name), [SetAction])
+        ambient = MyAmbient(commit)
+        futures = _Ambient.new(ambient).__update__(
+            [
+                SetAction(name="y", value=1, source=1),
+                SetAction(name="y", value=2, source=2),
+            ]
+        )
+        ambient.__commit__()
+        self.assertEqual(ambient.state, {})
+        for observation in _Observations(futures):
+            self.assertIsInstance(observation, ErrorActiveObservation)
+
+
+class TestActionCommitRemote(unittest.TestCase):
+    """Unit tests for `ActionCommit` with a remote ambient."""
+
+    @classmethod
+    def setUpClass(cls):  # noqa
+        ray.init(num_cpus=1, include_dashboard=False, log_to_driver=False)
+
+    @classmethod
+    def tearDownClass(cls):  # noqa
+        ray.shutdown()
+
+    def test_remote(self):
+        """Staged actions are not supported by remote ambients."""
+
+        class _RemoteAmbient(Ambient):
+            def __init__(self, commit=None):
+                super().__init__([], commit=commit)
+
+            def __select__(self, action):
+                pass
+
+            def __update__(self, action):
+                pass
+
+        ambient = _Ambient.new(ray.remote(_RemoteAmbient).remote(ActionCommit()))
+        with self.assertRaises(TypeError):
+            asyncio.run(ambient.__initialise__())
+        # nothing is committed remotely
+        ambient = _Ambient.new(ray.remote(_RemoteAmbient).remote())
+        asyncio.run(ambient.__commit__())
+
+
+class IncrementAction(TransactionAction):  # noqa: D101
+    pass
+
+
+class VersionedAmbient(Ambient):
+    """Test ambient that holds a `VersionedState`."""
+
+    def __init__(self, state: VersionedState):  # noqa: D107
+        super().__init__([], commit=OptimisticCommit(state, max_workers=2))
+        self.state = state
+
+    def __select__(self, action):  # noqa: D105
+        return ActiveObservation(action_id=action, value=self.state.snapshot(["x"]))
+
+    def __update__(self, action):  # noqa: D105
+        for key in action.writes:
+            self.state.write(key, self.state.get(key, 0) + 1)
+        return ActiveObservation(action_id=action)
+
+
+class TestOptimisticCommit(unittest.TestCase):
+    """Unit tests for `OptimisticCommit`."""
+
+    def test_disjoint(self):
+        """Transactions on disjoint keys are all applied."""
+        state = VersionedState({"x": 0, "y": 0})
+        ambient = VersionedAmbient(state)
+        reads = {key: version for key, (_, version) in state.snapshot("xy").items()}
+        actions = [
+            IncrementAction(reads={"x": reads["x"]}, writes=["x"], source=1),
+            IncrementAction(reads={"y": reads["y"]}, writes=["y"], source=2),
+        ]
+        futures = _Ambient.new(ambient).__update__(actions)
+        ambient.__commit__()
+        self.assertEqual((state["x"], state["y"]), (1, 1))
+        for observation in _Observations(futures):
+            self.assertNotIsInstance(observation, ErrorActiveObservation)
+
+    def test_conflict(self):
+        """Only the first of two transactions that read and write the same key is applied, stale reads are aborted."""
+        state = VersionedState({"x": 0})
+        ambient = VersionedAmbient(state)
+        _, version = state.read("x")
+        actions = [
+            IncrementAction(reads={"x": version}, writes=["x"], source=2),
+            IncrementAction(reads={"x": version}, writes=["x"], source=1),
+        ]
+        futures = _Ambient.new(ambient).__update__(actions)
+        ambient.__commit__()
+        self.assertEqual(state["x"], 1)
+        observations = list(_Observations(futures))
+        self.assertNotIsInstance(observations[1], ErrorActiveObservation)
+        self.assertIsInstance(observations[0], ConflictObservation)
+        self.assertEqual(observations[0].keys, ["x"])
+        # retry with the stale version
+        futures = _Ambient.new(ambient).__update__([actions[0]])
+        ambient.__commit__()
+        self.assertIsInstance(futures[0].result(), ConflictObservation)
+        self.assertEqual(state["x"], 1)
+
+    def test_close(self):
+        """The worker threads are released when the ambient terminates."""
+        ambient = VersionedAmbient(VersionedState({"x": 0}))
+        asyncio.run(ambient.__terminate__())
+        with self.assertRaises(RuntimeError):
+            ambient._commit._executor.submit(print)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,12 @@ import copy
 import unittest
 from typing import Any
 from demistar.agent import Actuator, Sensor, attempt
-from demistar.event import Event
+from demistar.agent.agent_routed import AgentRouted, observe
+from demistar.event import Event, MouseMotionEvent
 from unittest.mock import MagicMock
 
+import numpy as np
+
 from demistar.pubsub import Subscribe
 
 
@@ -29,6 +32,34 @@ class MySensor(Sensor):
         return action
 
 
+class MyBatchSensor(Sensor):
+    """Test sensor that converts mouse motion to an array."""
+
+    def __transduce_batch__(self, observations):  # noqa: D105
+        return np.array([o.position for o in observations])
+
+
+class MyRoutedAgent(AgentRouted):
+    """Test agent with an observe method that receives batches."""
+
+    def __init__(self, sensors):  # noqa: D107
+        super().__init__(sensors, [])
+        self.batches = []
+        self.events = []
+
+    @observe
+    def on_motion(self, observations: list[MouseMotionEvent]):  # noqa: D102
+        self.batches.append(observations)
+
+    @observe
+    def on_event(self, observation: Event):  # noqa: D102
+        self.events.append(observation)
+
+
+def _motions(n):
+    return [MouseMotionEvent(position=(i, i), relative=(1, 1)) for i in range(n)]
+
+
 class TestComponents(unittest.TestCase):
     """Unit tests for sensors and actuators."""
 
@@ -83,6 +114,25 @@ class TestComponents(unittest.TestCase):
         observations = list(actuator.iter_observations())
         self.assertListEqual(observations, [action1, action2])
 
+    def test_observation_batches(self):
+        """Test `iter_observation_batches` with `__transduce_batch__`."""
+        sensor = MyBatchSensor()
+        sensor.on_add(MagicMock())
+        sensor._observations.push_all(_motions(10))
+        batches = list(sensor.iter_observation_batches(max_size=6))
+        self.assertListEqual([b.shape for b in batches], [(6, 2), (4, 2)])
+        self.assertEqual(list(sensor.iter_observation_batches()), [])
+
+    def test_routed_batches(self):
+        """Test that `AgentRouted` delivers batches to observe methods that accept lists."""
+        sensor = Sensor()
+        agent = MyRoutedAgent([sensor])
+        motions = _motions(5)
+        sensor._observations.push_all([*motions, Event()])
+        agent.__observe__()
+        self.assertListEqual(agent.batches, [motions])
+        self.assertEqual(len(agent.events), 6)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,125 @@
+"""Unit tests for delta observations (`DeltaTracker` and `DeltaSensor`)."""
+
+import unittest
+
+from demistar.agent import Agent, DeltaSensor
+from demistar.agent.agent_routed import AgentRouted, observe
+from demistar.environment import Ambient, VersionedState, DeltaTracker
+from demistar.environment.ambient import _Ambient
+from demistar.event import DeltaSelect, DeltaObservation
+
+
+class MyAgent(Agent):  # noqa: D101
+    def __cycle__(self):  # noqa: D105
+        pass
+
+
+class MyRoutedAgent(AgentRouted):  # noqa: D101
+    def __init__(self, sensors):  # noqa: D107
+        super().__init__(sensors, [])
+        self.observations = []
+
+    @observe
+    def on_delta(self, observation: DeltaObservation):  # noqa: D102
+        self.observations.append(observation)
+
+
+class MyAmbient(Ambient):
+    """Test ambient that answers `DeltaSelect` actions."""
+
+    def __init__(self, agents):  # noqa: D107
+        super().__init__(agents)
+        self.state = VersionedState({"a": 1, "b": 2, "c": 3})
+        self.deltas = DeltaTracker(self.state)
+
+    def __select__(self, action):  # noqa: D105
+        assert isinstance(action, DeltaSelect)
+        return self.deltas.select(action)
+
+    def __update__(self, action):  # noqa: D105
+        pass
+
+
+class TestDelta(unittest.TestCase):
+    """Unit tests for delta observations."""
+
+    def _sense(self, sensor, state):
+        sensor.__query__(state)
+        return list(sensor.iter_observations())
+
+    def test_delta(self):
+        """Only changes are observed after the first observation."""
+        sensor = DeltaSensor()
+        agent = MyAgent([sensor], [])
+        ambient = MyAmbient([agent])
+        state = _Ambient.new(ambient)
+        (observation,) = self._sense(sensor, state)
+        self.assertTrue(observation.full)
+        self.assertDictEqual(dict(sensor.mirror), {"a": 1, "b": 2, "c": 3})
+        (observation,) = self._sense(sensor, state)
+        self.assertDictEqual(observation.changed, {})
+        ambient.state.write("a", 10)
+        ambient.state.delete("b")
+        (observation,) = self._sense(sensor, state)
+        self.assertFalse(observation.full)
+        self.assertDictEqual(observation.changed, {"a": 10})
+        self.assertListEqual(observation.removed, ["b"])
+        self.assertDictEqual(dict(sensor.mirror), {"a": 10, "c": 3})
+        self.assertEqual(sensor.version, ambient.state.clock)
+
+    def test_delta_keys(self):
+        """A persistent query only observes changes to its keys."""
+        sensor = DeltaSensor(keys=["a"])
+        agent = MyAgent([sensor], [])
+        ambient = MyAmbient([agent])
+        state = _Ambient.new(ambient)
+        self._sense(sensor, state)
+        self.assertDictEqual(dict(sensor.mirror), {"a": 1})
+        ambient.state.write("c", 10)
+        (observation,) = self._sense(sensor, state)
+        self.assertDictEqual(observation.changed, {})
+        self.assertDictEqual(dict(sensor.mirror), {"a": 1})
+
+    def test_delta_gap(self):
+        """A missed delta is not applied and the full state is requested."""
+        sensor = DeltaSensor(capacity=1)
+        agent = MyAgent([sensor], [])
+        ambient = MyAmbient([agent])
+        state = _Ambient.new(ambient)
+        self._sense(sensor, state)
+        ambient.state.write("a", 10)
+        sensor.__query__(state)
+        ambient.state.write("b", 20)
+        sensor.__query__(state)  # the previous delta is dropped
+        (observation,) = list(sensor.iter_observations())
+        self.assertNotEqual(observation.since, sensor.version)
+        self.assertDictEqual(dict(sensor.mirror), {"a": 1, "b": 2, "c": 3})
+        # the next query requests the full state
+        (observation,) = self._sense(sensor, state)
+        self.assertTrue(observation.full)
+        self.assertDictEqual(dict(sensor.mirror), {"a": 10, "b": 20, "c": 3})
+        self.assertEqual(sensor.version, ambient.state.clock)
+        ambient.state.write("c", 30)
+        (observation,) = self._sense(sensor, state)
+        self.assertFalse(observation.full)
+        self.assertDictEqual(dict(sensor.mirror), {"a": 10, "b": 20, "c": 30})
+
+    def test_delta_routed(self):
+        """The mirror is updated when observations are routed by an `AgentRouted`."""
+        sensor = DeltaSensor()
+        agent = MyRoutedAgent([sensor])
+        ambient = MyAmbient([agent])
+        state = _Ambient.new(ambient)
+        sensor.__query__(state)
+        agent.__observe__()
+        self.assertEqual(len(agent.observations), 1)
+        self.assertDictEqual(dict(sensor.mirror), {"a": 1, "b": 2, "c": 3})
+        ambient.state.write("a", 10)
+        sensor.__query__(state)
+        agent.__observe__()
+        self.assertDictEqual(dict(sensor.mirror), {"a": 10, "b": 2, "c": 3})
+        self.assertEqual(sensor.version, ambient.state.clock)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Unit tests for the `EntityStore` class."""
+
+import unittest
+
+import numpy as np
+
+from demistar.environment import EntityStore
+
+
+class TestEntityStore(unittest.TestCase):
+    """Unit tests for `EntityStore`."""
+
+    def setUp(self):  # noqa
+        self.store = EntityStore(
+            {"position": (np.float32, (2,)), "health": np.int16}, capacity=2
+        )
+
+    def test_create_and_grow(self):
+        """Entities are created with default values and the store grows as required."""
+        ids = self.store.create_many(5, health=10)
+        self.assertEqual(len(self.store), 5)
+        self.assertGreaterEqual(self.store.capacity, 5)
+        self.assertListEqual(ids.tolist(), [0, 1, 2, 3, 4])
+        values = self.store.gather(ids)
+        self.assertTrue((values["health"] == 10).all())
+        self.assertEqual(values["position"].shape, (5, 2))
+
+    def test_free_list(self):
+        """Rows of destroyed entities are reused."""
+        ids = self.store.create_many(3)
+        self.store.destroy(ids[1])
+        self.assertNotIn(int(ids[1]), self.store)
+        self.assertListEqual(self.store.entities().tolist(), [0, 2])
+        self.assertEqual(self.store.create(health=1), ids[1])
+        with self.assertRaises(KeyError):
+            self.store.destroy(100)
+
+    def test_filter_and_write(self):
+        """Vectorized filter and bulk writes."""
+        ids = self.store.create_many(4)
+        self.store.write(ids, health=np.array([1, 5, 10, 2]))
+        self.store.destroy(ids[3])
+        weak = self.store.filter(lambda c: c["health"] < 5)
+        self.assertListEqual(weak.tolist(), [0])
+        self.store.write(weak, position=[1.0, 2.0])
+        self.assertListEqual(self.store.column("position")[0].tolist(), [1.0, 2.0])
+        subset = self.store.filter(lambda c: c["health"] > 1, ids=ids[:2])
+        self.assertListEqual(subset.tolist(), [1])
+        # destroyed entities are filtered out and cannot be gathered
+        subset = self.store.filter(lambda c: c["health"] > 1, ids=ids)
+        self.assertListEqual(subset.tolist(), [1, 2])
+        with self.assertRaises(KeyError):
+            self.store.gather(ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Unit tests for error observations, see `ErrorObservation` and `wrap_observation`."""
+
+import pickle
+import unittest
+
+from pydantic import BaseModel
+
+from demistar.event import (
+    Action,
+    ActiveObservation,
+    ErrorActiveObservation,
+    ErrorObservation,
+    wrap_observation,
+)
+from demistar.event.codec import decode, decode_batch, encode, encode_batch
+
+
+class _InvalidMove(Exception):
+    pass
+
+
+def _raise(exception):
+    raise exception
+
+
+def _error(exception, **kwargs):
+    try:
+        _raise(exception)
+    except Exception as e:
+        return ErrorObservation.from_exception(e, **kwargs)
+
+
+class _Holder(BaseModel):
+    observations: list[ErrorObservation]
+
+
+class _Ambient:
+    @wrap_observation(expected=_InvalidMove)
+    def __select__(self, action, exception=None):
+        if exception is not None:
+            raise exception
+        return 1
+
+
+class TestErrorObservation(unittest.TestCase):
+    """Unit tests for error observations."""
+
+    def test_lazy_traceback(self):
+        """The traceback is formatted when it is first required."""
+        error = _error(ValueError("bad value"))
+        self.assertIsNotNone(error._traceback)
+        self.assertEqual(error.traceback_message, "ValueError: bad value")
+        self.assertEqual(error.exception_type, "ValueError")
+        message = error.formatted_traceback()
+        self.assertIn("_raise", message)
+        self.assertIn("ValueError: bad value", message)
+        self.assertIs(error.formatted_traceback(), message)
+        self.assertIs(error.traceback_message, message)
+        self.assertIsNone(error._traceback)
+        self.assertIn("ValueError: bad value", str(error.exception()))
+
+    def test_no_traceback(self):
+        """No traceback is captured when it is not required."""
+        error = _error(ValueError("bad value"), traceback=False)
+        self.assertEqual(error.formatted_traceback(), "ValueError: bad value")
+
+    def test_serialize(self):
+        """The traceback survives serialization."""
+        for serialize in (
+            lambda e: pickle.loads(pickle.dumps(e)),
+            lambda e: decode(encode(e)),
+            lambda e: decode_batch(encode_batch([e]))[0],
+            lambda e: ErrorObservation.model_validate_json(e.model_dump_json()),
+        ):
+            error = _error(ValueError("bad value"))
+            result = serialize(error)
+            self.assertIn("_raise", result.formatted_traceback())
+            self.assertEqual(result.formatted_traceback(), error.formatted_traceback())
+            self.assertEqual(result, error)
+
+    def test_fields(self):
+        """The traceback is formatted when the observation is dumped as part of another model."""
+        error = _error(ValueError("bad value"))
+        self.assertIn("traceback_message", error.model_fields_set)
+        self.assertIn("_raise", error.model_dump()["traceback_message"])
+        for error in (_error(ValueError("bad value")), _error(KeyError("x"))):
+            holder = _Holder(observations=[error])
+            self.assertIn(
+                "_raise", holder.model_dump()["observations"][0]["traceback_message"]
+            )
+            result = _Holder.model_validate_json(
+                holder.model_dump_json(exclude_unset=True)
+            )
+            self.assertEqual(
+                result.observations[0].traceback_message, error.traceback_message
+            )
+
+    def test_wrap_observation(self):
+        """Expected errors are wrapped without a traceback."""
+        ambient, action = _Ambient(), Action()
+        observation = ambient.__select__(action)
+        self.assertIsInstance(observation, ActiveObservation)
+        self.assertEqual(observation.value, 1)
+        error = ambient.__select__(action, _InvalidMove("occupied"))
+        self.assertIsInstance(error, ErrorActiveObservation)
+        self.assertEqual(error.action_id, action.id)
+        self.assertTrue(error.traceback_message.endswith("_InvalidMove: occupied"))
+        self.assertIsNone(error._traceback)
+        error = ambient.__select__(action, KeyError("x"))
+        self.assertIsNotNone(error._traceback)
+        self.assertIn("__select__", error.formatted_traceback())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Unit tests for the `Event` fast path, see `Event.unchecked` and `Event.set_unchecked`."""
+
+import pickle
+import unittest
+
+from pydantic import PrivateAttr
+
+from demistar.event import Event, Action, ActiveObservation, wrap_observation
+
+
+class MyEvent(Event):  # noqa: D101
+    values: list[int] = []
+    _cache: int = PrivateAttr(1)
+
+
+class TestEventUnchecked(unittest.TestCase):
+    """Unit tests for the `Event` fast path."""
+
+    def test_unchecked(self):
+        """Test that unchecked events are equivalent to validated events."""
+        event = ActiveObservation.unchecked(action_id=1, value=2)
+        self.assertIsInstance(event, ActiveObservation)
+        self.assertEqual(
+            event,
+            ActiveObservation(
+                action_id=1, value=2, id=event.id, timestamp=event.timestamp
+            ),
+        )
+        self.assertIsNone(event.source)
+        self.assertEqual(event.model_fields_set, {"action_id", "value"})
+        self.assertEqual(pickle.loads(pickle.dumps(event)), event)
+        self.assertEqual(
+            ActiveObservation.model_validate_json(event.model_dump_json()), event
+        )
+        # default factories are called for each event
+        self.assertNotEqual(event.id, ActiveObservation.unchecked(action_id=1).id)
+
+    def test_unchecked_defaults(self):
+        """Test that mutable defaults and private attributes are not shared."""
+        event1, event2 = MyEvent.unchecked(), MyEvent.unchecked()
+        self.assertEqual(event1.values, [])
+        self.assertIsNot(event1.values, event2.values)
+        self.assertEqual(event1._cache, 1)
+        event1._cache = 2
+        self.assertEqual(event2._cache, 1)
+
+    def test_set_unchecked(self):
+        """Test that fields may be set without validation."""
+        action = Action()
+        action.set_unchecked(source=1 << 64)
+        self.assertEqual(action.source, 1 << 64)
+        self.assertIn("source", action.model_fields_set)
+        # assignment is still validated
+        with self.assertRaises(ValueError):
+            action.source = "a"
+
+    def test_wrap_observation(self):
+        """Test that `wrap_observation` wraps results as observations."""
+
+        class MyAmbient:  # noqa: D106
+            @wrap_observation
+            def __select__(self, action):  # noqa: D105
+                return 1
+
+        action = Action()
+        observation = MyAmbient().__select__(action)
+        self.assertIsInstance(observation, ActiveObservation)
+        self.assertEqual(observation.action_id, action.id)
+        self.assertEqual(observation.value, 1)
+
+    def test_new_action_id(self):
+        """Test that `ActiveObservation.new` converts the action to its id."""
+        action = Action()
+        for value in (action, action.id):
+            observation = ActiveObservation.new(value, values=1)
+            self.assertIs(type(observation.action_id), int)
+            self.assertEqual(observation.action_id, action.id)
+        with self.assertRaises(ValueError):
+            ActiveObservation.new(str(action.id), values=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Unit tests for lazy observations, observations whose value is fetched from the ray object store on access."""
+
+import pickle
+import unittest
+
+import ray
+
+from demistar.event import (
+    Action,
+    ActiveObservation,
+    lazy,
+    lazy_observation,
+    is_lazy,
+)
+from demistar.agent.component._observations import _Observations
+from demistar.utils import TypeRouter
+
+
+class MyObservation(ActiveObservation):  # noqa: D101
+    pass
+
+
+class TestLazyObservation(unittest.TestCase):
+    """Unit tests for lazy observations."""
+
+    @classmethod
+    def setUpClass(cls):  # noqa
+        ray.init(num_cpus=1, include_dashboard=False, log_to_driver=False)
+
+    @classmethod
+    def tearDownClass(cls):  # noqa
+        ray.shutdown()
+
+    def test_lazy(self):
+        """Metadata is available eagerly, the value is fetched on access."""
+        observation = MyObservation(action_id=1, value=list(range(1000)))
+        # the original must be kept alive, the ref is not counted by pickle (it is by ray)
+        original = lazy(observation)
+        result = pickle.loads(pickle.dumps(original))
+        self.assertIsInstance(result, MyObservation)
+        self.assertEqual(result.id, observation.id)
+        self.assertEqual(result.action_id, 1)
+        self.assertTrue(is_lazy(result))
+        self.assertEqual(result.value, observation.value)
+        self.assertFalse(is_lazy(result))
+        self.assertEqual(result, observation)
+        self.assertEqual(result.model_dump(), observation.model_dump())
+
+    def test_routing(self):
+        """Lazy observations are routed as their original type."""
+        router = TypeRouter()
+        calls = []
+        router.add(calls.append, route_types=[MyObservation])
+        router(lazy(MyObservation(action_id=1, value=1)))
+        self.assertEqual(len(calls), 1)
+
+    def test_decorator_and_prefetch(self):
+        """The decorator makes select results lazy, values can be prefetched in a batch."""
+
+        class MyAmbient:
+            @lazy_observation
+            def __select__(self, action):
+                return MyObservation(action_id=action, value=action.id)
+
+        actions = [Action() for _ in range(4)]
+        observations = _Observations([MyAmbient().__select__(a) for a in actions])
+        self.assertEqual(observations.prefetch(timeout=None), 4)
+        values = [o.value for o in observations]
+        self.assertListEqual(values, [a.id for a in actions])
+
+
+if __name__ == "__main__":
+    unittest.main()
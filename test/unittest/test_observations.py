@@ -2,10 +2,21 @@
 
 import unittest
 import asyncio
-from unittest.mock import MagicMock
+import time
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
 
-from demistar.agent.component._observations import _Observations
-from demistar.event import Event
+import ray
+
+from demistar.agent.component._observations import (
+    _Observations,
+    _ObservationsAsyncIter,
+    OverflowPolicy,
+    default_priority,
+)
+from demistar.agent import Sensor
+from demistar.event import Event, KeyEvent, MouseMotionEvent, ErrorObservation
+from demistar.event.event_kill import KillEvent
 
 
 class TestObservations(unittest.TestCase):
@@ -55,6 +66,203 @@ class TestObservations(unittest.TestCase):
         # iterating will always consume the observations!
         self.assertTrue(obs.is_empty())
 
+    def test_iter_batched_refs(self):
+        """Pending object refs are resolved with a single call to `ray.get`."""
+        refs = [MagicMock(spec=ray.ObjectRef) for _ in range(10)]
+        values = {ref: MagicMock(spec=Event) for ref in refs}
+        obs = _Observations([self.event1, *refs])
+        with patch(
+            "demistar.agent.component._observations.ray.get",
+            side_effect=lambda refs: [values[ref] for ref in refs],
+        ) as get:
+            result = list(obs)
+        get.assert_called_once()
+        self.assertListEqual(result, [self.event1, *values.values()])
+
+    def test_overflow(self):
+        """Test the overflow policies of the _Observations class."""
+        events = [Event(source=i) for i in range(5)]
+        obs = _Observations(events, capacity=3, overflow=OverflowPolicy.DROP_OLDEST)
+        self.assertListEqual([e.source for e in obs], [2, 3, 4])
+        self.assertEqual(obs.dropped, 2)
+        obs = _Observations(events, capacity=3, overflow=OverflowPolicy.DROP_NEWEST)
+        self.assertListEqual([e.source for e in obs], [0, 1, 2])
+        self.assertEqual(obs.dropped, 2)
+        obs = _Observations(events[:3], capacity=3, overflow=OverflowPolicy.BLOCK)
+        with self.assertRaises(asyncio.QueueFull):
+            obs.push(events[3])
+        # a batch is pushed entirely or not at all
+        obs = _Observations(events[:2], capacity=3, overflow=OverflowPolicy.BLOCK)
+        with self.assertRaises(asyncio.QueueFull):
+            obs.push_all(events[2:4])
+        self.assertListEqual([e.source for e in obs], [0, 1])
+
+    def test_overflow_conflate(self):
+        """Test the conflate overflow policy of the _Observations class."""
+        key = KeyEvent(key="a", keycode=0, status=0)
+        motions = [MouseMotionEvent(position=(i, i), relative=(1, 1)) for i in range(3)]
+        obs = _Observations(capacity=2, overflow=OverflowPolicy.CONFLATE)
+        obs.push_all([motions[0], key, motions[1], motions[2]])
+        self.assertListEqual(list(obs), [key, motions[2]])
+        self.assertEqual(obs.dropped, 2)
+
+    def test_overflow_conflate_refs(self):
+        """Test that unresolved remote observations are not conflated by type."""
+        futures = [Future() for _ in range(3)]
+        obs = _Observations(capacity=2, overflow=OverflowPolicy.CONFLATE)
+        obs.push_all(futures)
+        # the oldest is dropped, rather than one that happens to share the type `Future`
+        self.assertListEqual(list(obs._queue._queue), futures[1:])
+
+    def test_block_component(self):
+        """Test that components do not support the block overflow policy."""
+        with self.assertRaises(ValueError):
+            Sensor(capacity=1, overflow=OverflowPolicy.BLOCK)
+
+    def test_cancel_at_capacity(self):
+        """Test that async iteration can be cancelled while at capacity."""
+        obs = _Observations([self.event1], capacity=1, overflow=OverflowPolicy.BLOCK)
+
+        async def main():
+            iterator = aiter(obs)
+            obs.cancel()
+            items = []
+            while True:
+                try:
+                    items.append(await anext(iterator))
+                except StopAsyncIteration:
+                    return items
+
+        self.assertListEqual(asyncio.run(main()), [self.event1])
+
+    def test_conflate(self):
+        """Test that only the latest observation for each key is kept."""
+        obs = _Observations(conflate=lambda event: (type(event), event.source))
+        events = [
+            MouseMotionEvent(position=(i, i), relative=(1, 1), source=i % 2)
+            for i in range(100)
+        ]
+        obs.push_all(events)
+        self.assertEqual(len(obs), 2)
+        self.assertEqual(obs.conflated, 98)
+        self.assertListEqual(list(obs), events[-2:])
+        # capacity is not exceeded by superseding observations
+        obs = _Observations(capacity=2, conflate=type)
+        key = KeyEvent(key="a", keycode=0, status=0)
+        obs.push_all([key, *events])
+        self.assertListEqual(list(obs), [key, events[-1]])
+        self.assertEqual(obs.dropped, 0)
+        # observations without a key are not conflated
+        obs = _Observations(
+            conflate=lambda e: e.source if isinstance(e, MouseMotionEvent) else None
+        )
+        keys = [KeyEvent(key="a", keycode=0, status=0) for _ in range(3)]
+        obs.push_all([*keys, *events])
+        self.assertListEqual(list(obs), [*keys, *events[-2:]])
+
+    def test_priority(self):
+        """Test that urgent observations are delivered first."""
+        error = ErrorObservation.from_exception(ValueError())
+        kill = KillEvent(kill=1)
+        events = [Event(source=i) for i in range(3)]
+        obs = _Observations(priority=default_priority)
+        obs.push_all([events[0], error, events[1], kill, events[2]])
+        self.assertListEqual(list(obs), [error, kill, *events])
+        # with overflow, the oldest of the lowest priority is dropped
+        obs = _Observations(capacity=2, priority=default_priority)
+        obs.push_all([events[0], error, events[1]])
+        self.assertListEqual(list(obs), [error, events[1]])
+
+    def test_priority_async(self):
+        """Test that urgent observations are delivered first asynchronously."""
+        error = ErrorObservation.from_exception(ValueError())
+        obs = _Observations(priority=default_priority)
+        obs.push_all([self.event1, error])
+
+        async def main():
+            iterator = aiter(obs)
+            return [await anext(iterator), await anext(iterator)]
+
+        self.assertListEqual(asyncio.run(main()), [error, self.event1])
+
+    def test_priority_internal(self):
+        """Test that the priority function is only given events."""
+        events = [Event(source=i) for i in range(3)]
+        future = Future()
+        obs = _Observations(priority=lambda event: -event.source)
+        obs.push_all([events[0], future, events[1], events[2]])
+        # unresolved observations are delivered after all events
+        self.assertListEqual(list(obs), events[::-1])
+        future.set_result(events[0])
+        self.assertListEqual(list(obs), events[:1])
+        obs.push_all(events)
+
+        async def main():
+            iterator = aiter(obs)
+            obs.cancel()
+            with self.assertRaises(StopAsyncIteration):
+                await anext(iterator)
+
+        # cancellation ends async iteration before buffered observations
+        asyncio.run(main())
+        self.assertEqual(len(obs), 3)
+
+    def test_max_age(self):
+        """Test that observations that are too old are dropped when consumed."""
+        now = time.time()
+        old, new = Event(timestamp=now - 10), Event(timestamp=now)
+        obs = _Observations(max_age=5)
+        obs.push_all([old, new, old])
+        self.assertListEqual(list(obs), [new])
+        self.assertEqual(obs.expired, 2)
+        obs.push_all([old, new])
+        self.assertListEqual(obs.drain(), [new])
+        self.assertEqual(obs.expired, 3)
+
+    def test_max_age_steps(self):
+        """Test that observations that are too many steps old are dropped when consumed."""
+        obs = _Observations(max_age_steps=1)
+        obs.step()
+        events = [Event()]
+        time.sleep(0.01)
+        obs.step()
+        events.append(Event())
+        time.sleep(0.01)
+        obs.step()
+        events.append(Event())
+        obs.push_all(events)
+        # only events from the current and previous step are kept
+        self.assertListEqual(list(obs), events[1:])
+        self.assertEqual(obs.expired, 1)
+
+    def test_max_age_async(self):
+        """Test that observations that are too old are dropped asynchronously."""
+        now = time.time()
+        old, new = Event(timestamp=now - 10), Event(timestamp=now)
+        obs = _Observations(max_age=5)
+        obs.push_all([old, new])
+
+        async def main():
+            return await anext(aiter(obs))
+
+        self.assertEqual(asyncio.run(main()), new)
+        self.assertEqual(obs.expired, 1)
+
+    def test_overflow_block_async(self):
+        """Test that `apush` waits for space with the block overflow policy."""
+        obs = _Observations(capacity=1, overflow=OverflowPolicy.BLOCK)
+
+        async def main():
+            await obs.apush(self.event1)
+            push = asyncio.create_task(obs.apush(self.event2))
+            await asyncio.sleep(0.01)
+            self.assertFalse(push.done())
+            self.assertEqual(obs.pop(), self.event1)
+            await push
+            return obs.pop()
+
+        self.assertEqual(asyncio.run(main()), self.event2)
+
     def test_async_iteration(self):
         """Test the async iteration of the _Observations class."""
         obs = _Observations()
@@ -97,5 +305,84 @@ class TestObservations(unittest.TestCase):
         asyncio.run(main())
 
 
+class TestObservationsRemote(unittest.TestCase):
+    """Unit test for `_Observations` class with remote observations."""
+
+    @classmethod
+    def setUpClass(cls):  # noqa
+        ray.init(num_cpus=1, include_dashboard=False, log_to_driver=False)
+
+    @classmethod
+    def tearDownClass(cls):  # noqa
+        ray.shutdown()
+
+    def test_async_iteration_refs(self):
+        """Object refs are awaited without blocking the event loop."""
+
+        @ray.remote
+        def _remote(i):
+            return Event(source=i)
+
+        refs = [_remote.remote(i) for i in range(20)]
+        obs = _Observations(refs)
+
+        async def _ticker(ticks):
+            # runs while observations are being consumed
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def main():
+            ticks = []
+            ticker = asyncio.create_task(_ticker(ticks))
+            iterator = aiter(obs)
+            result = [(await anext(iterator)).source for _ in range(20)]
+            ticker.cancel()
+            obs.cancel()
+            return result, len(ticks)
+
+        result, ticks = asyncio.run(main())
+        self.assertListEqual(result, list(range(20)))
+        self.assertGreater(ticks, 0)
+
+    def test_resolve_refs_conflate(self):
+        """Refs that are conflated once resolved are accounted for by the queue."""
+        obs = _Observations(
+            [ray.put(Event(source=1)) for _ in range(3)], conflate=lambda e: e.source
+        )
+        self.assertEqual(obs._queue.resolve_refs(), 3)
+        self.assertEqual(len(obs), 1)
+        next(obs)
+        obs._queue.task_done()
+
+        async def main():
+            await asyncio.wait_for(obs._queue.join(), timeout=1)
+
+        asyncio.run(main())
+
+    def test_prefetch_dropped_refs(self):
+        """Prefetched refs that are dropped on overflow do not stall prefetching."""
+        obs = _Observations(
+            [ray.put(Event(source=i)) for i in range(2)],
+            capacity=2,
+            overflow=OverflowPolicy.DROP_OLDEST,
+        )
+        iterator = _ObservationsAsyncIter(obs, prefetch=2)
+
+        async def main():
+            iterator._fetch_ahead()
+            # the prefetched refs are dropped in favour of new refs
+            refs = [ray.put(Event(source=i)) for i in range(2, 4)]
+            obs.push_all(refs)
+            iterator._fetch_ahead()
+            fetching = set(iterator._fetching)
+            result = [(await iterator.__anext__()).source for _ in range(2)]
+            return refs, fetching, result
+
+        refs, fetching, result = asyncio.run(main())
+        self.assertSetEqual(fetching, set(refs))
+        self.assertListEqual(result, [2, 3])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,163 @@
+"""Unit tests for the `ArrowRecorder` class."""
+
+import asyncio
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import pyarrow.parquet as pq
+
+from demistar.agent import Component
+from demistar.environment import Ambient, ActionCommit, ArrowRecorder, Environment
+from demistar.environment.ambient import _Ambient, _AmbientRecorded
+from demistar.environment.commit import LastWriterWins
+from demistar.event import (
+    Action,
+    ActiveObservation,
+    ErrorObservation,
+    MouseMotionEvent,
+)
+from demistar.event.lazy_event import _rebuild, is_lazy
+from demistar.pubsub import TypePublisher
+from demistar.utils import int64_uuid
+
+
+class SetAction(Action):  # noqa: D101
+    name: str
+    value: int
+
+
+class MyAmbient(Ambient):
+    """Test ambient that holds a dictionary of values."""
+
+    def __init__(self, commit: ActionCommit = None):  # noqa: D107
+        super().__init__([], commit=commit)
+        self.state = {}
+
+    def __select__(self, action):  # noqa: D105
+        return ActiveObservation(action_id=action, value=dict(self.state))
+
+    def __update__(self, action):  # noqa: D105
+        self.state[action.name] = action.value
+        return ActiveObservation(action_id=action, value=action.value)
+
+
+class _StepAmbient(MyAmbient):
+    # the simulation ends after a single step
+    def get_is_alive(self):
+        return False
+
+
+class TestArrowRecorder(unittest.TestCase):
+    """Unit tests for `ArrowRecorder`."""
+
+    def setUp(self):  # noqa: D102
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):  # noqa: D102
+        self.directory.cleanup()
+
+    def test_record(self):
+        """Events are written to one file per type, with a schema derived from the type."""
+        events = [
+            MouseMotionEvent(position=(i, 0.5), relative=(1, 1)) for i in range(10)
+        ]
+        with ArrowRecorder(self.directory.name, batch_size=4) as recorder:
+            recorder.record_all([*events, None])
+            recorder.record(SetAction(name="a", value=1))
+            recorder.flush()
+            self.assertEqual(len(recorder.paths()), 2)
+        table = pq.read_table(recorder.paths()[MouseMotionEvent])
+        self.assertEqual(recorder.recorded, 11)
+        self.assertEqual(len(recorder.paths()), 2)
+        self.assertEqual(table.num_rows, 10)
+        self.assertEqual(str(table.schema.field("id").type), "int64")
+        self.assertEqual(str(table.schema.field("source_agent").type), "uint64")
+        self.assertEqual(table.column("position").to_pylist()[3], [3.0, 0.5])
+        self.assertListEqual(table.column("id").to_pylist(), [e.id for e in events])
+        self.assertEqual(
+            table.schema.metadata[b"event_tag"], b"%d" % events[0].__event_tag__
+        )
+
+    def test_source(self):
+        """The source of an action taken by a component is recorded as two columns."""
+        component = SimpleNamespace(id=int64_uuid(), _agent=SimpleNamespace(id=1))
+        actions = [SetAction(name="a", value=1), SetAction(name="b", value=2)]
+        Component.set_event_source(component, actions[:1])
+        self.assertGreater(actions[0].source, 1 << 64)
+        with ArrowRecorder(self.directory.name) as recorder:
+            recorder.record_all(actions)
+        table = pq.read_table(recorder.paths()[SetAction])
+        self.assertListEqual(
+            table.column("source_component").to_pylist(), [component.id, None]
+        )
+        self.assertListEqual(table.column("source_agent").to_pylist(), [1, None])
+
+    def test_json(self):
+        """Fields without a columnar representation are written as JSON."""
+        error = ErrorObservation.from_exception(ValueError("bad value"), False)
+        observation = ActiveObservation(action_id=1, value={"a": [1, 2]})
+        with ArrowRecorder(self.directory.name) as recorder:
+            recorder.record_all([error, observation])
+        table = pq.read_table(recorder.paths()[ActiveObservation])
+        self.assertListEqual(table.column("value").to_pylist(), ['{"a":[1,2]}'])
+        table = pq.read_table(recorder.paths()[ErrorObservation])
+        self.assertIn("bad value", table.column("traceback_message")[0].as_py())
+
+    def test_lazy(self):
+        """Lazy observations are recorded with their eager type, their values are not fetched."""
+        observation = ActiveObservation(action_id=1, value=1)
+        lazy = _rebuild(ActiveObservation, {"action_id": 2}, None)
+        with ArrowRecorder(self.directory.name) as recorder:
+            recorder.record_all([observation, lazy])
+        self.assertEqual(len(recorder.paths()), 1)
+        table = pq.read_table(recorder.paths()[ActiveObservation])
+        self.assertListEqual(table.column("action_id").to_pylist(), [1, 2])
+        self.assertListEqual(table.column("value").to_pylist(), ["1", "null"])
+        self.assertTrue(is_lazy(lazy))
+
+    def test_closed(self):
+        """Events may not be recorded after the recorder is closed."""
+        recorder = ArrowRecorder(self.directory.name)
+        recorder.close()
+        with self.assertRaises(RuntimeError):
+            recorder.record(SetAction(name="a", value=1))
+
+    def test_publisher(self):
+        """Published events are recorded when the recorder is subscribed."""
+        publisher = TypePublisher()
+        with ArrowRecorder(self.directory.name) as recorder:
+            publisher.subscribe(SetAction, recorder)
+            publisher.publish(SetAction(name="a", value=1))
+        self.assertEqual(recorder.recorded, 1)
+
+    def test_ambient(self):
+        """Actions sent to the ambient and the resulting observations are recorded."""
+        commit = ActionCommit()
+        commit.add(LastWriterWins(key=lambda action: action.name), [SetAction])
+        ambient = MyAmbient(commit)
+        with ArrowRecorder(self.directory.name) as recorder:
+            state = _AmbientRecorded(_Ambient.new(ambient), recorder)
+            state.__select__([Action()])
+            state.__update__([SetAction(name="a", value=i) for i in range(3)])
+            self.assertEqual(recorder.recorded, 5)
+            asyncio.run(state.__commit__())  # staged observations are recorded
+        table = pq.read_table(recorder.paths()[ActiveObservation])
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(recorder.recorded, 8)
+
+    def test_environment(self):
+        """The recorder is closed when the simulation ends."""
+        recorder = ArrowRecorder(self.directory.name, flush_interval=None)
+        environment = Environment(_StepAmbient(), recorder=recorder)
+        self.assertIsInstance(environment._ambient, _AmbientRecorded)
+        environment._ambient.__update__([SetAction(name="a", value=1)])
+        self.assertEqual(len(recorder.paths()), 0)
+        environment.run()
+        self.assertEqual(pq.read_table(recorder.paths()[SetAction]).num_rows, 1)
+        with self.assertRaises(RuntimeError):
+            recorder.record(SetAction(name="a", value=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
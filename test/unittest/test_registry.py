@@ -0,0 +1,66 @@
+"""Unit tests for the event type registry, see `demistar.event.registry`."""
+
+import unittest
+import zlib
+
+from demistar.event import (
+    Event,
+    KeyEvent,
+    ActiveObservation,
+    event_tag,
+    event_type,
+    event_types,
+)
+from demistar.event.lazy_event import _lazy_type
+from demistar.utils import TypeRouter
+
+
+class MyEvent(Event, tag=12345):  # noqa: D101
+    pass
+
+
+class TestRegistry(unittest.TestCase):
+    """Unit tests for the event type registry."""
+
+    def test_tag(self):
+        """Event types are given a stable tag when they are defined."""
+        name = "demistar.event.user_event.keyevent.KeyEvent"
+        self.assertEqual(event_tag(KeyEvent), zlib.crc32(name.encode()))
+        self.assertIs(event_type(event_tag(KeyEvent)), KeyEvent)
+        self.assertIs(event_type(event_tag(Event)), Event)
+        self.assertIn(event_tag(ActiveObservation), event_types())
+        with self.assertRaises(KeyError):
+            event_type(0)
+
+    def test_explicit_tag(self):
+        """Event types may be given an explicit tag."""
+        self.assertEqual(event_tag(MyEvent), 12345)
+        self.assertIs(event_type(12345), MyEvent)
+        with self.assertRaises(ValueError):
+
+            class _InvalidEvent(Event, tag=0):
+                pass
+
+    def test_collision(self):
+        """Event types with different names cannot have the same tag."""
+        with self.assertRaises(TypeError):
+
+            class _OtherEvent(Event, tag=12345):
+                pass
+
+        self.assertIs(event_type(12345), MyEvent)
+
+    def test_unregistered(self):
+        """Types that are not registered (e.g. lazy observations) share the tag of their parent."""
+        lazy_type = _lazy_type(ActiveObservation)
+        self.assertEqual(event_tag(lazy_type), event_tag(ActiveObservation))
+        self.assertIs(event_type(event_tag(ActiveObservation)), ActiveObservation)
+
+    def test_route_key(self):
+        """Event types are routed by their tag."""
+        self.assertEqual(TypeRouter.route_key(KeyEvent), event_tag(KeyEvent))
+        self.assertEqual(TypeRouter.route_key(int), "builtins.int")
+
+
+if __name__ == "__main__":
+    unittest.main()
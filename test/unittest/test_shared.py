@@ -0,0 +1,77 @@
+"""Unit tests for the `SharedArrayState` class."""
+
+import multiprocessing
+import pickle
+import unittest
+
+import numpy as np
+
+from demistar.environment import SharedArrayState
+from demistar.environment import shared
+
+
+def _sum(handle):
+    return int(handle.open().sum())
+
+
+def _sum_and_close(handle):
+    view = handle.open()
+    total = int(view.sum())
+    handle.close()  # the view is still held
+    attached = handle.name in shared._ATTACHED
+    del view
+    handle.close()
+    return total, attached, handle.name in shared._ATTACHED
+
+
+class TestSharedArrayState(unittest.TestCase):
+    """Unit tests for `SharedArrayState`."""
+
+    def setUp(self):  # noqa
+        self.state = SharedArrayState()
+        self.state.create("grid", (64, 64), np.int32)
+
+    def tearDown(self):  # noqa
+        self.state.close()
+
+    def test_write_and_version(self):
+        """Writes are visible through handles and increase the version."""
+        handle = self.state.handle("grid")
+        self.assertEqual(handle.version, 0)
+        self.state.write("grid", 1, index=(slice(0, 2), slice(None)))
+        self.assertEqual(self.state.handle("grid").version, 1)
+        view = handle.open()
+        self.assertEqual(view.sum(), 128)
+        with self.assertRaises(ValueError):
+            view[0, 0] = 2  # views are read-only
+
+    def test_handle_is_small(self):
+        """Handles serialize to a few bytes regardless of the size of the array."""
+        handle = self.state.handle("grid")
+        self.assertLess(len(pickle.dumps(handle)), 512)
+        self.assertEqual(pickle.loads(pickle.dumps(handle)), handle)
+
+    def test_other_process(self):
+        """Arrays can be viewed from another process."""
+        self.state.write("grid", 2)
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(1) as pool:
+            total = pool.apply(_sum, (self.state.handle("grid"),))
+        self.assertEqual(total, 2 * 64 * 64)
+
+    def test_close_handle(self):
+        """Closing a handle detaches the block once no views are held."""
+        handle = self.state.handle("grid")
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(1) as pool:
+            total, held, attached = pool.apply(_sum_and_close, (handle,))
+        self.assertEqual(total, 0)
+        self.assertTrue(held)
+        self.assertFalse(attached)
+        # the owner is not affected
+        handle.close()
+        self.assertEqual(handle.open().sum(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Unit tests for spatial indexes (`GridIndex` and `KDTreeIndex`)."""
+
+import unittest
+
+import numpy as np
+
+from demistar.environment import GridIndex, KDTreeIndex
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Unit tests for spatial indexes, results are compared against brute force."""
+
+    def setUp(self):  # noqa
+        rng = np.random.default_rng(0)
+        self.positions = rng.uniform(-10, 10, size=(500, 2))
+        self.centers = rng.uniform(-12, 12, size=(20, 2))
+
+    def _indexes(self):
+        return [GridIndex(cell_size=1.5, capacity=8), KDTreeIndex(leaf_size=4)]
+
+    def _brute_range(self, center, radius):
+        distances = np.linalg.norm(self.positions - center, axis=1)
+        return set(np.flatnonzero(distances <= radius).tolist())
+
+    def _brute_knn(self, center, k):
+        distances = np.linalg.norm(self.positions - center, axis=1)
+        return np.sort(distances)[:k]
+
+    def test_queries(self):
+        """Range and k-NN queries match brute force."""
+        for index in self._indexes():
+            index.insert_many(range(len(self.positions)), self.positions)
+            for center, result in zip(
+                self.centers, index.query_range_many(self.centers, 2.5)
+            ):
+                self.assertSetEqual(
+                    set(result.tolist()), self._brute_range(center, 2.5)
+                )
+            for center, result in zip(
+                self.centers, index.query_knn_many(self.centers, 7)
+            ):
+                distances = np.linalg.norm(self.positions[result] - center, axis=1)
+                np.testing.assert_allclose(distances, self._brute_knn(center, 7))
+
+    def test_move_and_remove(self):
+        """Queries reflect moved and removed entities."""
+        for index in self._indexes():
+            positions = self.positions.copy()
+            index.insert_many(range(len(positions)), positions)
+            before = index.query_range([0, 0], 3)  # cached until the index changes
+            self.assertIs(before, index.query_range([0, 0], 3))
+            with self.assertRaises(ValueError):
+                before[0] = -1  # the shared result is read-only
+            positions[:50] += 4.0
+            index.move_many(range(50), positions[:50])
+            index.remove(60)
+            self.assertEqual(len(index), len(positions) - 1)
+            distances = np.linalg.norm(positions, axis=1)
+            expected = set(np.flatnonzero(distances <= 3).tolist()) - {60}
+            self.assertSetEqual(set(index.query_range([0, 0], 3).tolist()), expected)
+
+    def test_leaf_size(self):
+        """The leaf size of a k-d tree must be at least 1."""
+        with self.assertRaises(ValueError):
+            KDTreeIndex(leaf_size=0)
+        index = KDTreeIndex(leaf_size=1)
+        index.insert_many(range(len(self.positions)), self.positions)
+        self.assertEqual(len(index.query_knn([0, 0], 3)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
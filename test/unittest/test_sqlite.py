@@ -0,0 +1,123 @@
+"""Unit tests for the `SQLiteAmbient` class."""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from demistar.environment import ActionCommit, SQLiteAmbient
+from demistar.environment.ambient import _Ambient
+from demistar.event import Action, ActiveObservation
+
+
+class SetAction(Action):  # noqa: D101
+    name: str
+    value: int
+
+
+class GetAction(Action):  # noqa: D101
+    name: str
+
+
+class MyAmbient(SQLiteAmbient):
+    """Test ambient that holds a table of values."""
+
+    def __init__(self, path, commit=None):  # noqa: D107
+        super().__init__([], path, commit=commit)
+        self.create_table("data", {"name": "TEXT PRIMARY KEY", "value": "INTEGER"})
+        self.create_index("data", ["value"])
+
+    def __select__(self, action):  # noqa: D105
+        row = self.select_one("SELECT value FROM data WHERE name = ?", (action.name,))
+        return ActiveObservation(action_id=action, value=row and row[0])
+
+    def __update__(self, action):  # noqa: D105
+        self.upsert("data", {"name": action.name, "value": action.value})
+
+
+class MyAsyncAmbient(MyAmbient):
+    """Test ambient whose handlers are async."""
+
+    async def __select__(self, action):  # noqa: D105
+        return super().__select__(action)
+
+    async def __update__(self, action):  # noqa: D105
+        return super().__update__(action)
+
+
+class ClosingCommit(ActionCommit):
+    """Test commit stage that cannot commit once it is closed."""
+
+    def __init__(self):  # noqa: D107
+        super().__init__()
+        self.closed = False
+
+    def commit(self, update):  # noqa: D102
+        if self.closed:
+            raise RuntimeError("commit after close")
+        super().commit(update)
+
+    def close(self):  # noqa: D102
+        self.closed = True
+
+
+class TestSQLiteAmbient(unittest.TestCase):
+    """Unit tests for `SQLiteAmbient`."""
+
+    def setUp(self):  # noqa
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name, "state.db")
+
+    def tearDown(self):  # noqa
+        self.directory.cleanup()
+
+    def test_buffered_writes(self):
+        """Writes are only visible after commit."""
+        ambient = MyAmbient(self.path)
+        state = _Ambient.new(ambient)
+        state.__update__([SetAction(name=str(i), value=i) for i in range(100)])
+        self.assertIsNone(ambient.__select__(GetAction(name="1")).value)
+        ambient.__commit__()
+        self.assertEqual(ambient.__select__(GetAction(name="1")).value, 1)
+        self.assertEqual(len(ambient.select_where("data", ("name",), value=5)), 1)
+
+    def test_async(self):
+        """Writes made by async handlers are flushed when the step is committed."""
+        ambient = MyAsyncAmbient(self.path)
+        state = _Ambient.new(ambient)
+
+        async def main():
+            state.__update__([SetAction(name="a", value=1)])
+            await state.__commit__()
+            return await state.__select__([GetAction(name="a")])[0]
+
+        self.assertEqual(asyncio.run(main()).value, 1)
+
+    def test_rollback(self):
+        """A failed write rolls back the whole step."""
+        ambient = MyAmbient(self.path)
+        ambient.__update__(SetAction(name="a", value=1))
+        ambient.write("INSERT INTO missing VALUES (?)", (1,))
+        with self.assertRaises(Exception):
+            ambient.__commit__()
+        self.assertListEqual(ambient.select("SELECT * FROM data"), [])
+
+    def test_persistent(self):
+        """State survives closing and re-opening the database."""
+        ambient = MyAmbient(self.path)
+        ambient.__update__(SetAction(name="a", value=1))
+        asyncio.run(ambient.__terminate__())
+        ambient = MyAmbient(self.path)
+        self.assertEqual(ambient.__select__(GetAction(name="a")).value, 1)
+
+    def test_terminate_staged(self):
+        """Staged update actions are applied before the commit stage is closed."""
+        ambient = MyAmbient(self.path, commit=ClosingCommit())
+        _Ambient.new(ambient).__update__([SetAction(name="a", value=1)])
+        asyncio.run(ambient.__terminate__())
+        ambient = MyAmbient(self.path)
+        self.assertEqual(ambient.__select__(GetAction(name="a")).value, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Unit tests for `int64_uuid`, see `demistar.utils._uuid`."""
+
+import multiprocessing
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import ray
+
+from demistar.utils import int64_uuid
+from demistar.utils import _uuid
+
+
+def _generate(n):
+    return [int64_uuid() for _ in range(n)]
+
+
+class TestInt64Uuid(unittest.TestCase):
+    """Unit tests for `int64_uuid`."""
+
+    def test_increasing(self):
+        """Ids generated by a process are unique and strictly increasing, across many blocks."""
+        ids = _generate(10 * _uuid._SEQUENCE_LIMIT)
+        self.assertListEqual(ids, sorted(set(ids)))
+        self.assertTrue(all(0 <= i < 1 << 64 for i in ids))
+
+    def test_unique_threads(self):
+        """Ids generated concurrently by many threads are unique."""
+        results = []
+
+        def run():
+            results.append(_generate(20000))
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for ids in results:
+            self.assertListEqual(ids, sorted(ids))
+        ids = [i for ids in results for i in ids]
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_unique_processes(self):
+        """Ids generated concurrently by many processes are unique."""
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(4) as pool:
+            results = pool.map(_generate, [20000] * 4)
+        ids = [i for ids in results for i in ids] + _generate(20000)
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_fork(self):
+        """A forked process acquires a new worker id."""
+        int64_uuid()
+        context = multiprocessing.get_context("fork")
+        with context.Pool(1) as pool:
+            ids = pool.apply(_generate, (10,))
+        parent = _uuid._unpack(int64_uuid())[1]
+        self.assertTrue(all(_uuid._unpack(i)[1] != parent for i in ids))
+
+    def test_worker_id_env(self):
+        """The worker id may be given by an environment variable."""
+        with patch.dict("os.environ", {_uuid.WORKER_ID_ENV: "5"}):
+            self.assertEqual(_uuid._assign_worker_id(), (5, "env"))
+        with patch.dict("os.environ", {_uuid.WORKER_ID_ENV: "4096"}):
+            with self.assertRaises(ValueError):
+                _uuid._assign_worker_id()
+
+
+class TestInt64UuidRay(unittest.TestCase):
+    """Unit tests for `int64_uuid` with ray workers."""
+
+    @classmethod
+    def setUpClass(cls):  # noqa
+        ray.init(num_cpus=2, include_dashboard=False, log_to_driver=False)
+
+    @classmethod
+    def tearDownClass(cls):  # noqa
+        ray.shutdown()
+
+    def test_unique_ray_workers(self):
+        """Ray workers are assigned distinct worker ids by the allocator."""
+
+        # defined here so that it is serialized by value (the test module is not importable by workers)
+        @ray.remote
+        def generate(n):
+            from demistar.utils import int64_uuid
+
+            return [int64_uuid() for _ in range(n)]
+
+        results = ray.get([generate.remote(20000) for _ in range(4)])
+        ids = [i for ids in results for i in ids] + _generate(20000)
+        self.assertEqual(len(set(ids)), len(ids))
+        # the driver acquires its worker id from the allocator on its next block
+        _generate(_uuid._SEQUENCE_LIMIT)
+        self.assertLess(_uuid._unpack(int64_uuid())[1], _uuid._ASSIGNED_WORKER_LIMIT)
+
+    def test_worker_ids_released(self):
+        """Worker ids are released when the process that leased them exits."""
+        allocator = ray.remote(_uuid._allocator_class()).remote(limit=1)
+
+        @ray.remote
+        class Lessee:
+            def lease(self, allocator):
+                self._owner = ray.put(None)
+                return ray.get(allocator.allocate.remote([self._owner]))
+
+        lessee = Lessee.remote()
+        self.assertEqual(ray.get(lessee.lease.remote(allocator)), 0)
+        owner = ray.put(None)
+        self.assertIsNone(ray.get(allocator.allocate.remote([owner])))
+        ray.kill(lessee)
+        time.sleep(1)
+        self.assertEqual(ray.get(allocator.allocate.remote([owner])), 0)
+
+    def test_worker_ids_exhausted(self):
+        """The allocator does not reuse worker ids once they have all been allocated."""
+        with patch.object(ray, "get", return_value=None):
+            with self.assertRaises(RuntimeError):
+                _uuid._ray_worker_id()
+
+
+if __name__ == "__main__":
+    unittest.main()